@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+CGNX SDK -> import time benchmark.
+
+Measures `import cloudgenix` in fresh interpreters, separating the SDK's own cost from `requests`, and the
+cost of first access to the lazily loaded API method classes.
+
+Usage: `python benchmarks/import_time.py [runs]`
+
+**Author:** CloudGenix
+
+**Copyright:** (c) 2017-2021 CloudGenix, Inc
+
+**License:** MIT
+"""
+__author__ = "CloudGenix Developer Support <developers@cloudgenix.com>"
+__email__ = "developers@cloudgenix.com"
+__copyright__ = "Copyright (c) 2017-2021 CloudGenix, Inc"
+__license__ = """
+    MIT License
+
+    Copyright (c) 2017-2021 CloudGenix, Inc
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import os
+import subprocess
+import sys
+
+# Run from repo root (or with the SDK installed).
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE_SCRIPT = """
+import time
+start = time.perf_counter()
+import requests
+requests_done = time.perf_counter()
+import cloudgenix
+sdk_done = time.perf_counter()
+sdk = cloudgenix.API(update_check=False)
+constructed = time.perf_counter()
+sdk.get, sdk.post
+first_access = time.perf_counter()
+print(requests_done - start, sdk_done - requests_done, constructed - sdk_done, first_access - constructed)
+"""
+
+LABELS = ("import requests", "import cloudgenix (SDK only)", "API() construction", "first sdk.get/sdk.post access")
+
+
+def measure(runs):
+    """
+    Run the measure script in `runs` fresh interpreters.
+
+    **Returns:** List of per-run tuples of seconds, in `LABELS` order.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    results = []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", MEASURE_SCRIPT], env=env)
+        results.append(tuple(float(value) for value in output.split()))
+    return results
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2.0
+
+
+if __name__ == "__main__":
+    run_count = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    timings = measure(run_count)
+    print("Python {0}, {1} runs (median / min, ms)".format(sys.version.split()[0], run_count))
+    for index, label in enumerate(LABELS):
+        column = [run[index] * 1000 for run in timings]
+        print("  {0:<32} {1:8.2f} / {2:8.2f}".format(label, median(column), min(column)))
@@ -51,22 +51,23 @@ from __future__ import unicode_literals
 import logging
 import os
 import json
+import time
 from time import sleep
 import re
 import atexit
+import functools
+import hashlib
+import importlib
 import sys
+import threading
 
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages import urllib3
 from requests.cookies import cookielib
 
-from .get_api import Get
-from .post_api import Post
-from .patch_api import Patch
-from .put_api import Put
-from .delete_api import Delete
-from .interactive import Interactive
+from .lookup import LookupIndex
+from .records import Record, record_class
 
 # CA Certificate bundle
 from tempfile import NamedTemporaryFile as temp_ca_bundle
@@ -92,11 +93,197 @@ else:
     text_type = unicode
     binary_type = str
 
-# Enable WebSockets for Python 3.6+
+# API method classes are imported on first use (see `cloudgenix.API._subclass_container`), to keep import time low.
+# name: (module, class)
+_SUBCLASS_MODULES = {
+    'get': ('get_api', 'Get'),
+    'post': ('post_api', 'Post'),
+    'put': ('put_api', 'Put'),
+    'patch': ('patch_api', 'Patch'),
+    'delete': ('delete_api', 'Delete'),
+    'interactive': ('interactive', 'Interactive'),
+    'monitor': ('monitor', 'Monitor'),
+    'inventory': ('inventory', 'Inventory'),
+}
+
+# Enable WebSockets for Python 3.6+. `ssl` and `websockets` are also imported on first use.
 if PYTHON36_FEATURES:
-    import ssl
-    import websockets
-    from .ws_api import WebSockets
+    _SUBCLASS_MODULES['ws'] = ('ws_api', 'WebSockets')
+
+# previously eagerly imported module-level names, still available as `cloudgenix.<name>`.
+_LAZY_ATTRIBUTES = {
+    'Get': ('.get_api', 'Get'),
+    'Post': ('.post_api', 'Post'),
+    'Put': ('.put_api', 'Put'),
+    'Patch': ('.patch_api', 'Patch'),
+    'Delete': ('.delete_api', 'Delete'),
+    'Interactive': ('.interactive', 'Interactive'),
+    'Monitor': ('.monitor', 'Monitor'),
+    'JSONItemStream': ('.monitor', 'JSONItemStream'),
+    'Inventory': ('.inventory', 'Inventory'),
+}
+if PYTHON36_FEATURES:
+    _LAZY_ATTRIBUTES.update({
+        'WebSockets': ('.ws_api', 'WebSockets'),
+        'ssl': ('ssl', None),
+        'websockets': ('websockets', None),
+    })
+
+
+def _lazy_import(name):
+    """
+    Import a lazily loaded module-level name from `_LAZY_ATTRIBUTES`.
+
+    **Parameters:**
+
+      - **name:** Name to import
+
+    **Returns:** Imported module or attribute.
+    """
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    module = importlib.import_module(module_name, __name__)
+    return getattr(module, attribute) if attribute else module
+
+
+def __getattr__(name):
+    """
+    Module attribute hook (Python 3.7+), loads names from `_LAZY_ATTRIBUTES` on first access.
+    """
+    if name in _LAZY_ATTRIBUTES:
+        value = _lazy_import(name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module '{0}' has no attribute '{1}'".format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+    # No module __getattr__, load everything now.
+    for _lazy_name in _LAZY_ATTRIBUTES:
+        globals()[_lazy_name] = _lazy_import(_lazy_name)
+
+# Wrapper classes and WebSocket SSL contexts are shared by all API objects in the process.
+_WRAPPER_CLASSES = {}
+_SSL_CONTEXTS = {}
+_SHARED_LOCK = threading.Lock()
+
+# Process-wide CA bundle temp file, see `_ca_bundle_file`.
+_CA_BUNDLE_FILENAME = None
+
+# API object attributes that make up a logged in session, copied by `cloudgenix.API.clone`.
+_SESSION_STATE_ATTRIBUTES = ('controller', 'controller_orig', 'controller_region', 'ignore_region', 'tenant_id',
+                             'tenant_name', 'token_session', 'is_esp', 'client_id', 'address_string', 'email',
+                             'operator_id', '_user_id', 'roles', 'rest_call_timeout')
+
+
+def _wrapper_class(name):
+    """
+    Get the shared wrapper class for an API method class, creating it on first use.
+
+    Wrappers take the parent `cloudgenix.API` object as their only argument, so a single class serves every
+    API object instead of one class per constructor.
+
+    **Parameters:**
+
+      - **name:** Subclass name from `_SUBCLASS_MODULES` (ex. 'get')
+
+    **Returns:** Wrapper class.
+    """
+    wrapper = _WRAPPER_CLASSES.get(name)
+    if wrapper is None:
+        module_name, class_name = _SUBCLASS_MODULES[name]
+        base_class = getattr(importlib.import_module('.' + module_name, __name__), class_name)
+
+        def wrapper_init(wrapper_self, parent_class):
+            wrapper_self._parent_class = parent_class
+
+        with _SHARED_LOCK:
+            wrapper = _WRAPPER_CLASSES.setdefault(
+                name, type(str(class_name + 'Wrapper'), (base_class,), {'__init__': wrapper_init}))
+    return wrapper
+
+
+def _ca_bundle_file():
+    """
+    Get the process-wide temp file holding `BYTE_CA_BUNDLE` for Requests CA verification, creating it on first use.
+
+    The file is shared by all API objects and removed once, at interpreter exit.
+
+    **Returns:** Filename string.
+    """
+    global _CA_BUNDLE_FILENAME
+    if _CA_BUNDLE_FILENAME is None:
+        with _SHARED_LOCK:
+            if _CA_BUNDLE_FILENAME is None:
+                # closed before use, as Windows does not allow tmpfile access w/out close.
+                ca_file_handle = temp_ca_bundle(delete=False, suffix='.pem')
+                ca_file_handle.write(BYTE_CA_BUNDLE)
+                ca_file_handle.close()
+                _CA_BUNDLE_FILENAME = ca_file_handle.name
+                # register cleanup function for temp file.
+                atexit.register(_cleanup_ca_bundle_file)
+    return _CA_BUNDLE_FILENAME
+
+
+def _write_json_file(filename, content):
+    """
+    Atomically write a JSON cache file.
+
+    **Returns:** No return. Raises IOError/OSError on failure.
+    """
+    temp_name = "{0}.{1}.tmp".format(filename, os.getpid())
+    with open(temp_name, 'w') as file_handle:
+        json.dump(content, file_handle)
+    if hasattr(os, 'replace'):
+        os.replace(temp_name, filename)
+    else:
+        # python 2, rename is atomic on POSIX.
+        if os.name == 'nt' and os.path.exists(filename):
+            os.unlink(filename)
+        os.rename(temp_name, filename)
+
+
+def _cleanup_ca_bundle_file():
+    """
+    Remove the process-wide CA bundle temp file.
+
+    **Returns:** No return.
+    """
+    global _CA_BUNDLE_FILENAME
+    filename, _CA_BUNDLE_FILENAME = _CA_BUNDLE_FILENAME, None
+    if filename:
+        try:
+            os.unlink(filename)
+        except OSError:
+            pass
+
+
+def _ssl_context(verify):
+    """
+    Get the shared `ssl` context for WebSocket connections for a verify setting, creating it on first use.
+
+    The CA bundle is parsed once per process for each setting, and all API objects share the context.
+
+    **Parameters:**
+
+      - **verify:** True (builtin CA bundle), False (no verification) or path to a CA file/directory.
+
+    **Returns:** `ssl.SSLContext` object.
+    """
+    context = _SSL_CONTEXTS.get(verify)
+    if context is None:
+        import ssl
+        if verify is True:
+            context = ssl.create_default_context(cadata=BYTE_CA_BUNDLE.decode('ascii'))
+        elif verify is False:
+            # websocket: create default ssl context that does no verification
+            context = ssl.SSLContext()
+            context.verify_mode = ssl.CERT_NONE
+        else:
+            # set filename/filepath for context
+            context = ssl.create_default_context(cafile=verify, capath=verify)
+        with _SHARED_LOCK:
+            context = _SSL_CONTEXTS.setdefault(verify, context)
+    return context
 
 BYTE_CA_BUNDLE = binary_type(_CG_CA_BUNDLE)
 """
@@ -149,6 +336,9 @@ __version__ = version
 update_info_url = "https://pypi.org/pypi/cloudgenix/json"
 """URL for checking for updates."""
 
+# Set once the background update check has been started in this process.
+_UPDATE_CHECK_STARTED = False
+
 
 # regex
 SDK_BUILD_REGEX = re.compile(
@@ -291,6 +481,24 @@ def jdout_detailed(api_response, sensitive=False):
     return output
 
 
+class _LazySubclass(object):
+    """
+    Descriptor for `cloudgenix.API` method class links (get, post, etc.). Imports and binds the shared wrapper class on
+    first access, then caches the bound object on the API instance.
+    """
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        if self.name not in _SUBCLASS_MODULES:
+            raise AttributeError("'{0}' is not supported in this Python version.".format(self.name))
+        bound = _wrapper_class(self.name)(instance)
+        instance.__dict__[self.name] = bound
+        return bound
+
+
 class CloudGenixAPIError(Exception):
     """
     Custom exception for errors when not exiting.
@@ -298,6 +506,22 @@ class CloudGenixAPIError(Exception):
     pass
 
 
+class CloudGenixPageError(CloudGenixAPIError):
+    """
+    Exception raised by `cloudgenix.API.iter_items` when a page of results cannot be extracted.
+
+    Items from earlier pages have already been yielded when this is raised.
+    """
+    def __init__(self, message, response=None, page=None, items_yielded=None):
+        super(CloudGenixPageError, self).__init__(message)
+        self.response = response
+        """CloudGenix extended `requests.Response` object for the failing page, if any."""
+        self.page = page
+        """Zero-based index of the failing page."""
+        self.items_yielded = items_yielded
+        """Number of items yielded before the failure."""
+
+
 class API(object):
     """
     Class for interacting with the CloudGenix API.
@@ -309,6 +533,8 @@ class API(object):
      - put: links to `cloudgenix.put_api.Put` for API Put Operations
      - patch: links to `cloudgenix.patch_api.Patch` for API Patch Operations
      - delete: links to `cloudgenix.delete_api.Delete` for API Delete Operations
+     - monitor: links to `cloudgenix.monitor.Monitor` for Monitor helper Operations
+     - inventory: links to `cloudgenix.inventory.Inventory` for Inventory helper Operations
     """
     # Global structure, previously sdk_vars
     # Authentication is now stored as cookies, as part of the requests.Session() object.
@@ -371,10 +597,10 @@ class API(object):
     """Filename to use for CA verification."""
 
     _ca_verify_file_handle = None
-    """File handle for CA verification"""
+    """DEPRECATED: CA verification file is now shared process-wide, see `cloudgenix.API.ca_verify_filename`."""
 
-    _ca_ssl_context = None
-    """`ssl` library context for WebSocket connections (Python 3.6+ Only)"""
+    _ca_ssl_context_obj = None
+    """holder for `ssl` library context for WebSocket connections (Python 3.6+ Only)"""
 
     rest_call_retry = False
     """DEPRECATED: Please use `cloudgenix.API.modify_rest_retry`."""
@@ -397,22 +623,81 @@ class API(object):
     _session = None
     """holder for requests.Session() object"""
 
-    _websocket_headers = None
+    _websocket_headers_dict = None
     """holder for WebSocket Headers (Python 3.6+ Only)"""
 
+    _client_pool = None
+    """holder for `cloudgenix.sessions.ClientSessionPool`, see `cloudgenix.API.client_pool`."""
+
+    _session_validator = None
+    """holder for lazy validation of a session loaded by `cloudgenix.API.load_session`."""
+
+    _session_keeper = None
+    """holder for `cloudgenix.sessions.SessionKeeper`, see `cloudgenix.API.keep_session`."""
+
+    _token_pool = None
+    """holder for `cloudgenix.sessions.TokenPool`, see `cloudgenix.API.token_pool`."""
+
+    _region_router = None
+    """holder for `cloudgenix.sessions.RegionRouter`, see `cloudgenix.API.region_router`."""
+
+    get = _LazySubclass('get')
+    """API object link to `cloudgenix.get_api.Get`"""
+
+    post = _LazySubclass('post')
+    """API object link to `cloudgenix.post_api.Post`"""
+
+    put = _LazySubclass('put')
+    """API object link to `cloudgenix.put_api.Put`"""
+
+    patch = _LazySubclass('patch')
+    """API object link to `cloudgenix.patch_api.Patch`"""
+
+    delete = _LazySubclass('delete')
+    """API object link to `cloudgenix.delete_api.Delete`"""
+
+    interactive = _LazySubclass('interactive')
+    """API object link to `cloudgenix.interactive.Interactive`"""
+
+    monitor = _LazySubclass('monitor')
+    """API object link to `cloudgenix.monitor.Monitor`"""
+
+    inventory = _LazySubclass('inventory')
+    """API object link to `cloudgenix.inventory.Inventory`"""
+
+    ws = _LazySubclass('ws')
+    """API object link to `cloudgenix.ws.WebSockets` (Python 3.6+ Only)"""
+
     update_check = True
     """Notify users of available update to SDK"""
 
     update_info_url = None
     """Update Info URL for use once Constructor Created."""
 
-    def __init__(self, controller=controller, ssl_verify=verify, update_check=True):
+    update_check_ttl = 86400
+    """Seconds an SDK update check result is cached on disk. The check runs at most once per TTL per host."""
+
+    update_check_cache_file = os.environ.get("CLOUDGENIX_UPDATE_CHECK_CACHE",
+                                             os.path.join(os.path.expanduser("~"), ".cloudgenix_update_check.json"))
+    """File to cache SDK update check results in. Can be set with env `CLOUDGENIX_UPDATE_CHECK_CACHE`. None disables."""
+
+    region_cache_ttl = 7 * 86400
+    """Seconds a cached login region (see `cloudgenix.API.region_cache_file`) is used before being re-discovered."""
+
+    region_cache_file = os.environ.get("CLOUDGENIX_REGION_CACHE",
+                                       os.path.join(os.path.expanduser("~"), ".cloudgenix_region_cache.json"))
+    """File to cache each operator's login region in, so `cloudgenix.interactive.Interactive.login` can go straight
+    to the regional controller. Can be set with env `CLOUDGENIX_REGION_CACHE`. None disables."""
+
+    def __init__(self, controller=controller, ssl_verify=verify, update_check=True, connection_pool=None):
         """
         Create the API constructor object
 
           - **controller:** Initial Controller URL String
           - **ssl_verify:** Should SSL be verified for this system. Can be file or BOOL. See `cloudgenix.API.ssl_verify` for more details.
           - **update_check:** Bool to Enable/Disable SDK update check and new release notifications.
+          - **connection_pool:** Optional `requests.adapters.HTTPAdapter` to share connections with other API objects
+          (see `cloudgenix.API.spawn`). If not set, a new one is created with the default REST retry parameters.
         """
         # set version and update url from outer scope.
         self.version = version
@@ -434,13 +719,18 @@ class API(object):
             self.update_check = update_check
 
         if update_check:
-            self.notify_for_new_version()
+            # runs in a background thread, never blocks construction.
+            self.notify_for_new_version(background=True)
 
         # Create Requests Session.
         self._session = requests.Session()
 
-        # Set default REST retry parameters
-        self.modify_rest_retry()
+        if connection_pool is not None:
+            # Shared connection pool (and its retry parameters)
+            self._session.mount("https://", connection_pool)
+        else:
+            # Set default REST retry parameters
+            self.modify_rest_retry()
 
         # Identify SDK in the User-Agent.
         user_agent = self._session.headers.get('User-Agent')
@@ -462,8 +752,16 @@ class API(object):
                          self.verify,
                          self._session)
 
-        # Websocket/Python 3.6_ features
-        if PYTHON36_FEATURES:
+        # API method classes (get, post, etc.) and WebSocket headers are bound on first access.
+        return
+
+    @property
+    def _websocket_headers(self):
+        """
+        Headers for WebSocket requests (Python 3.6+ Only). Created on first access, as it requires `websockets`.
+        """
+        if self._websocket_headers_dict is None and PYTHON36_FEATURES:
+            import websockets
             # Update Headers for WebSocket requests
             websocketlib_name = websockets.__name__
             websocketlib_version = websockets.version.version
@@ -474,53 +772,58 @@ class API(object):
             ws_user_agent = 'python-{0}/{1} (CGX SDK v{2})'.format(websocketlib_name,
                                                                    websocketlib_version,
                                                                    self.version)
-            self._websocket_headers = {
+            self._websocket_headers_dict = {
                 'Accept': 'application/json',
                 'User-Agent': text_type(ws_user_agent)
             }
+        return self._websocket_headers_dict
 
-        # Bind API method classes to this object
-        subclasses = self._subclass_container()
-        self.get = subclasses["get"]()
-        """API object link to `cloudgenix.get_api.Get`"""
-
-        self.post = subclasses["post"]()
-        """API object link to `cloudgenix.post_api.Post`"""
-
-        self.put = subclasses["put"]()
-        """API object link to `cloudgenix.put_api.Put`"""
-
-        self.patch = subclasses["patch"]()
-        """API object link to `cloudgenix.patch_api.Patch`"""
-
-        self.delete = subclasses["delete"]()
-        """API object link to `cloudgenix.delete_api.Delete`"""
-
-        self.interactive = subclasses["interactive"]()
-        """API object link to `cloudgenix.interactive.Interactive`"""
-
-        if PYTHON36_FEATURES:
-            self.ws = subclasses["ws"]()
-            """API object link to `cloudgenix.ws.WebSockets`"""
-
-        return
+    @property
+    def _ca_ssl_context(self):
+        """
+        `ssl` library context for WebSocket connections (Python 3.6+ Only). Shared by all API objects with the same
+        `cloudgenix.API.ssl_verify` setting, and created on first access.
+        """
+        if self._ca_ssl_context_obj is None:
+            self._ca_ssl_context_obj = _ssl_context(self.verify)
+        return self._ca_ssl_context_obj
 
-    def notify_for_new_version(self):
+    def notify_for_new_version(self, background=False):
         """
         Check for a new version of the SDK on API constructor instantiation. If new version found, print
         Notification to STDERR.
 
+        The latest version is cached on disk in `cloudgenix.API.update_check_cache_file` for
+        `cloudgenix.API.update_check_ttl` seconds, so the HTTP check runs at most once per TTL per host.
+
         On failure of this check, fail silently.
 
-        **Returns:** No item returned, directly prints notification to `sys.stderr`.
+        **Parameters:**
+
+          - **background:** Optional - Bool, run the check in a daemon thread, only once per process. Default False.
+
+        **Returns:** `threading.Thread` if background check started, otherwise No item returned, directly prints
+        notification to `sys.stderr`.
         """
+        global _UPDATE_CHECK_STARTED
+
+        if background:
+            with _SHARED_LOCK:
+                if _UPDATE_CHECK_STARTED:
+                    return None
+                _UPDATE_CHECK_STARTED = True
+            update_thread = threading.Thread(target=self.notify_for_new_version, name="cloudgenix-update-check")
+            update_thread.daemon = True
+            update_thread.start()
+            return update_thread
 
         # broad exception clause, if this fails for any reason just return.
         try:
             recommend_update = False
-            update_check_resp = requests.get(self.update_info_url, timeout=3)
-            web_version = update_check_resp.json()["info"]["version"]
+            web_version = self._latest_sdk_version()
             api_logger.debug("RETRIEVED_VERSION: %s", web_version)
+            if not web_version:
+                return
 
             available_version = SDK_BUILD_REGEX.search(web_version).groupdict()
             current_version = SDK_BUILD_REGEX.search(self.version).groupdict()
@@ -564,6 +867,55 @@ class API(object):
             # just return and continue.
             return
 
+    def _latest_sdk_version(self):
+        """
+        Get the latest SDK version, from the on-disk cache if fresh, otherwise from `cloudgenix.API.update_info_url`.
+
+        **Returns:** Version string, or None if the last check failed.
+        """
+        cache_file = self.update_check_cache_file
+        now = time.time()
+
+        cached = None
+        if cache_file:
+            try:
+                with open(cache_file) as cache_fd:
+                    cached = json.load(cache_fd)
+            except (IOError, OSError, ValueError):
+                cached = None
+        if not isinstance(cached, dict) or cached.get('url') != self.update_info_url:
+            cached = {}
+
+        checked_at = cached.get('checked_at')
+        if isinstance(checked_at, (int, float)) and 0 <= now - checked_at < self.update_check_ttl:
+            api_logger.debug("UPDATE_CHECK: using cached result from %s", cache_file)
+            return cached.get('version')
+
+        # claim this TTL period first, so other processes on this host skip the check (and offline hosts don't retry).
+        self._write_update_check_cache(now, cached.get('version'))
+        web_version = None
+        try:
+            update_check_resp = requests.get(self.update_info_url, timeout=3)
+            web_version = update_check_resp.json()["info"]["version"]
+        finally:
+            self._write_update_check_cache(now, web_version)
+        return web_version
+
+    def _write_update_check_cache(self, checked_at, web_version):
+        """
+        Atomically write the update check cache file. Fails silently.
+
+        **Returns:** No return.
+        """
+        cache_file = self.update_check_cache_file
+        if not cache_file:
+            return
+        try:
+            _write_json_file(cache_file, {'url': self.update_info_url, 'checked_at': checked_at,
+                                          'version': web_version})
+        except (IOError, OSError) as e:
+            api_logger.debug("UPDATE_CHECK: unable to write cache %s: %s", cache_file, e)
+
     def ssl_verify(self, ssl_verify):
         """
         Modify ssl verification settings
@@ -578,49 +930,22 @@ class API(object):
         **Returns:** Mutates API object in place, no return.
         """
         self.verify = ssl_verify
+        # WebSocket ssl context is rebuilt from the new setting on next use.
+        self._ca_ssl_context_obj = None
         # if verify true/false, set ca_verify_file appropriately
         if isinstance(self.verify, bool):
             if self.verify:  # True
-                if os.name == 'nt':
-                    # Windows does not allow tmpfile access w/out close. Close file then delete it when done.
-                    self._ca_verify_file_handle = temp_ca_bundle(delete=False)
-                    self._ca_verify_file_handle.write(BYTE_CA_BUNDLE)
-                    self._ca_verify_file_handle.flush()
-                    self.ca_verify_filename = self._ca_verify_file_handle.name
-                    self._ca_verify_file_handle.close()
-
-                    if PYTHON36_FEATURES:
-                        # set ssl context for websocket
-                        self._ca_ssl_context = ssl.create_default_context(cadata=BYTE_CA_BUNDLE.decode('ascii'))
-
-                # Other (POSIX/Unix/Linux/OSX)
-                else:
-                    self._ca_verify_file_handle = temp_ca_bundle()
-                    self._ca_verify_file_handle.write(BYTE_CA_BUNDLE)
-                    self._ca_verify_file_handle.flush()
-                    self.ca_verify_filename = self._ca_verify_file_handle.name
-
-                    if PYTHON36_FEATURES:
-                        # set ssl context for websocket
-                        self._ca_ssl_context = ssl.create_default_context(cadata=BYTE_CA_BUNDLE.decode('ascii'))
-
-                # register cleanup function for temp file.
-                atexit.register(self._cleanup_ca_temp_file)
+                # use the process-wide CA bundle file, created once on first use.
+                self.ca_verify_filename = _ca_bundle_file()
 
             else:  # False
                 # disable warnings for SSL certs.
                 urllib3.disable_warnings()
                 self.ca_verify_filename = False
-                if PYTHON36_FEATURES:
-                    # websocket: create default ssl context that does no verification
-                    self._ca_ssl_context = ssl.SSLContext()
-                    self._ca_ssl_context.verify_mode = ssl.CERT_NONE
 
         else:
             # Not True/False, assume path to file/dir for Requests
             self.ca_verify_filename = self.verify
-            # set filename/filepath for context
-            self._ca_ssl_context = ssl.create_default_context(cafile=self.verify, capath=self.verify)
 
         return
 
@@ -899,64 +1224,228 @@ class API(object):
 
         return
 
-    def _subclass_container(self):
+    def _subclass_container(self, names=None):
         """
         Call subclasses via function to allow passing parent namespace to subclasses.
 
-        **Returns:** dict with subclass references.
+        Wrapper classes are shared by all API objects, and their modules are imported on first use.
+
+        **Parameters:**
+
+          - **names:** Optional - list of subclass names (ex. ['get', 'post']). Default: all available.
+
+        **Returns:** dict with subclass references, each callable with no arguments to create a bound object.
         """
-        _parent_class = self
+        if names is None:
+            names = list(_SUBCLASS_MODULES)
 
-        return_object = {}
+        return dict((name, functools.partial(_wrapper_class(name), self)) for name in names)
 
-        class GetWrapper(Get):
+    def connection_pool(self, url="https://"):
+        """
+        Get the `requests.adapters.HTTPAdapter` (connection pool and retry settings) used by this API object.
 
-            def __init__(self):
-                self._parent_class = _parent_class
-        return_object['get'] = GetWrapper
+        **Parameters:**
+
+          - **url:** Optional - URL to get the adapter for. Default `https://`
+
+        **Returns:** `requests.adapters.HTTPAdapter` object.
+        """
+        return self._session.get_adapter(url)
 
-        class PostWrapper(Post):
+    def spawn(self, share_connection_pool=True, controller=None):
+        """
+        Create a lightweight, unauthenticated API object with the same settings, for example one per client tenant.
 
-            def __init__(self):
-                self._parent_class = _parent_class
-        return_object['post'] = PostWrapper
+        The new object has its own `requests.Session` (cookies, headers and auth are not shared), but reuses this
+        object's SSL settings, REST timeout and, by default, its connection pool. It never runs the update check.
+        Calling `cloudgenix.API.modify_rest_retry` on the new object gives it its own connection pool.
 
-        class PutWrapper(Put):
+        **Parameters:**
 
-            def __init__(self):
-                self._parent_class = _parent_class
-        return_object['put'] = PutWrapper
+          - **share_connection_pool:** Optional - Bool, share this object's connection pool. Default True.
+          - **controller:** Optional - Controller URL. Default: this object's original controller.
 
-        class PatchWrapper(Patch):
+        **Returns:** `cloudgenix.API` object.
+        """
+        new_api = type(self)(controller=controller or self.controller_orig or self.controller,
+                             ssl_verify=self.verify, update_check=False,
+                             connection_pool=self.connection_pool() if share_connection_pool else None)
+        new_api.rest_call_timeout = self.rest_call_timeout
+        return new_api
 
-            def __init__(self):
-                self._parent_class = _parent_class
-        return_object['patch'] = PatchWrapper
+    def clone(self, share_connection_pool=True):
+        """
+        Create an independent copy of this API object, including its current login (cookies, headers, tenant and
+        operator info).
 
-        class DeleteWrapper(Delete):
+        Changes to the copy (ex. ESP/MSP client login, headers) do not affect this object. Uses
+        `cloudgenix.API.spawn` for the new object.
 
-            def __init__(self):
-                self._parent_class = _parent_class
-        return_object['delete'] = DeleteWrapper
+        **Parameters:**
 
-        class InteractiveWrapper(Interactive):
+          - **share_connection_pool:** Optional - Bool, share this object's connection pool. Default True.
 
-            def __init__(self):
-                self._parent_class = _parent_class
-        return_object['interactive'] = InteractiveWrapper
+        **Returns:** `cloudgenix.API` object.
+        """
+        new_api = self.spawn(share_connection_pool=share_connection_pool)
+        for attribute in _SESSION_STATE_ATTRIBUTES:
+            value = getattr(self, attribute)
+            setattr(new_api, attribute, list(value) if isinstance(value, list) else value)
+        if hasattr(self, 'address'):
+            new_api.address = self.address
+
+        new_api._session.headers = self._session.headers.copy()
+        new_api._session.cookies = self._session.cookies.copy()
+        if self._websocket_headers_dict is not None:
+            new_api._websocket_headers_dict = dict(self._websocket_headers_dict)
+        return new_api
+
+    def client_pool(self, max_size=None, idle_timeout=None):
+        """
+        Get this object's pool of logged in ESP/MSP client sessions, creating it on first use.
+        See `cloudgenix.sessions.ClientSessionPool`.
 
-        if PYTHON36_FEATURES:
-            class WebSocketsWrapper(WebSockets):
+        **Parameters:**
 
-                def __init__(self):
-                    self._parent_class = _parent_class
+          - **max_size:** Optional - Maximum client sessions to keep (LRU eviction). Updates an existing pool.
+          - **idle_timeout:** Optional - Seconds an unused client session is kept. Updates an existing pool.
 
-            return_object['ws'] = WebSocketsWrapper
+        **Returns:** `cloudgenix.sessions.ClientSessionPool` object. Use `.get(client)` for a client's API object.
+        """
+        if self._client_pool is None:
+            from .sessions import ClientSessionPool
+            self._client_pool = ClientSessionPool(self)
+        if max_size is not None:
+            self._client_pool.max_size = max_size
+        if idle_timeout is not None:
+            self._client_pool.idle_timeout = idle_timeout
+        return self._client_pool
+
+    def region_router(self, pool_size=None):
+        """
+        Get this object's region router, creating it on first use. Dispatches calls for ESP/MSP clients to their
+        regional controllers, with a connection pool per region. See `cloudgenix.sessions.RegionRouter`.
+
+        **Parameters:**
+
+          - **pool_size:** Optional - Connections kept per regional controller. Only used when creating the router.
+
+        **Returns:** `cloudgenix.sessions.RegionRouter` object. Use `.session(client)`, `.call()` or `.map()`.
+        """
+        if self._region_router is None:
+            from .sessions import RegionRouter
+            self._region_router = RegionRouter(self, pool_size=pool_size)
+        return self._region_router
+
+    def save_session(self, filename, key=None):
+        """
+        Save this object's login to a signed file. See `cloudgenix.sessions.save_session_state`.
+
+        **Parameters:**
+
+          - **filename:** File to write.
+          - **key:** Optional - Signing key. Default: env `CLOUDGENIX_SESSION_KEY`, or a per-user key file.
+
+        **Returns:** No return.
+        """
+        from .sessions import save_session_state
+        save_session_state(self, filename, key=key)
+
+    def load_session(self, filename, key=None, max_age=None, on_invalid=None):
+        """
+        Restore a login saved by `cloudgenix.API.save_session` with no API calls. The login is validated by the
+        first API call made. See `cloudgenix.sessions.load_session_state`.
+
+        **Parameters:**
+
+          - **filename:** File to read.
+          - **key:** Optional - Signing key used when saving.
+          - **max_age:** Optional - Reject state saved more than this many seconds ago.
+          - **on_invalid:** Optional - Callable taking this object, run if the restored login is rejected (401).
+            If it returns True, the rejected call is replayed once.
+
+        **Returns:** Bool, True if restored.
+        """
+        from .sessions import load_session_state
+        return load_session_state(self, filename, key=key, max_age=max_age, on_invalid=on_invalid)
+
+    def token_pool(self, tokens=None, strategy=None, include_self=True):
+        """
+        Get this object's auth token pool, creating it on first use. Once created, REST calls made by this object
+        are spread across the pool's logins. See `cloudgenix.sessions.TokenPool`.
+
+        **Parameters:**
+
+          - **tokens:** Optional - Iterable of static AUTH_TOKENs to add (see `TokenPool.add_token`). Operator logins
+            can be added with `TokenPool.add_login`.
+          - **strategy:** Optional - `least_loaded` (default) or `round_robin`. Updates an existing pool.
+          - **include_self:** Optional - Bool, use this object's own login as a pool member. Default True.
+
+        **Returns:** `cloudgenix.sessions.TokenPool` object.
+        """
+        if self._token_pool is None:
+            from .sessions import TokenPool
+            self._token_pool = TokenPool(self, strategy=strategy or 'least_loaded', include_self=include_self)
+        elif strategy is not None:
+            if strategy not in ('least_loaded', 'round_robin'):
+                raise ValueError("strategy must be one of 'least_loaded' or 'round_robin'.")
+            self._token_pool.strategy = strategy
+        for token in tokens or ():
+            self._token_pool.add_token(token)
+        return self._token_pool
+
+    def remove_token_pool(self):
+        """
+        Stop using the auth token pool, REST calls use this object's own login (and retry settings) again.
+
+        **Returns:** No return.
+        """
+        if self._token_pool is not None:
+            self._token_pool.close()
+        self._token_pool = None
+
+    def keep_session(self, reauth, keepalive_interval=300, max_session_age=None, refresh_margin=60):
+        """
+        Keep this object's login alive in a background thread, re-authenticating before it expires, and replay
+        requests that fail with 401 after re-authenticating. See `cloudgenix.sessions.SessionKeeper`.
+
+        Calling again replaces (and stops) any previous keeper.
+
+        **Parameters:**
 
-        return return_object
+          - **reauth:** Callable taking this object that logs in again and returns True on success. Ex:
+            `lambda sdk: sdk.interactive.use_token(token)`, or `lambda sdk: sdk.interactive.login(email, password)`
+          - **keepalive_interval:** Optional - Seconds between keepalive (`get.profile`) calls. Default 300.
+          - **max_session_age:** Optional - Seconds a login is valid. Default: from the AUTH_TOKEN cookie expiry.
+          - **refresh_margin:** Optional - Seconds before expiry to re-authenticate. Default 60.
+
+        **Returns:** `cloudgenix.sessions.SessionKeeper` object (already started).
+        """
+        from .sessions import SessionKeeper
+        if self._session_keeper is not None:
+            self._session_keeper.stop()
+        self._session_keeper = SessionKeeper(self, reauth, keepalive_interval=keepalive_interval,
+                                             max_session_age=max_session_age, refresh_margin=refresh_margin)
+        self._session_keeper.start()
+        return self._session_keeper
+
+    def for_each_client(self, func, clients=None, max_workers=None):
+        """
+        Run a function against ESP/MSP clients concurrently. See `cloudgenix.interactive.Interactive.for_each_client`.
+
+        **Parameters:**
+
+          - **func:** Callable taking a logged in, per-client `cloudgenix.API` object.
+          - **clients:** Optional - Iterable of Client Canonical Names, Client Names or Client IDs. Default: all.
+          - **max_workers:** Optional - Maximum concurrent clients.
+
+        **Returns:** Generator of (client_id, result, exception) tuples, in completion order.
+        """
+        return self.interactive.for_each_client(func, clients=clients, max_workers=max_workers)
 
     def rest_call(self, url, method, data=None, sensitive=False, timeout=None, content_json=True, raw_msgs=False,
-                  retry=None, max_retry=None, retry_sleep=None):
+                  retry=None, max_retry=None, retry_sleep=None, stream_content=False):
         """
         Generic REST call worker function
 
@@ -972,6 +1461,8 @@ class API(object):
           - **retry:** DEPRECATED - please use `cloudgenix.API.modify_rest_retry` instead.
           - **max_retry:** DEPRECATED - please use `cloudgenix.API.modify_rest_retry` instead.
           - **retry_sleep:** DEPRECATED - please use `cloudgenix.API.modify_rest_retry` instead.
+          - **stream_content:** True/False, if True, a successful response body is not read or parsed. `cgx_content`
+          will be None, and the caller must consume the body (ex. via `requests.Response.iter_content`).
 
         **Returns:** Requests.Response object, extended with:
 
@@ -982,9 +1473,6 @@ class API(object):
           - **cgx_warnings**: Text warning messages if any are present. None if none. List if raw_msgs is True.
 
         """
-        # pull retry related items from Constructor if not specified.
-        if timeout is None:
-            timeout = self.rest_call_timeout
         if retry is not None:
             # Someone using deprecated retry code. Notify.
             sys.stderr.write("WARNING: 'retry' option of rest_call() has been deprecated. "
@@ -998,6 +1486,49 @@ class API(object):
             sys.stderr.write("WARNING: 'max_retry' option of rest_call() has been deprecated. "
                              "Please use 'API.modify_rest_retry()' instead.")
 
+        call_kwargs = dict(data=data, sensitive=sensitive, timeout=timeout, content_json=content_json,
+                           raw_msgs=raw_msgs, stream_content=stream_content)
+
+        if self._session_validator is not None:
+            # first call after load_session(), check the restored login is still valid.
+            session_validator, self._session_validator = self._session_validator, None
+            response = self._authenticated_rest_call(url, method, **call_kwargs)
+            if getattr(response, 'status_code', None) is None:
+                # network failure, no answer from the controller. Check again on the next call.
+                if self._session_validator is None:
+                    self._session_validator = session_validator
+                return response
+            if session_validator(self, response):
+                response = self._authenticated_rest_call(url, method, **call_kwargs)
+            return response
+
+        return self._authenticated_rest_call(url, method, **call_kwargs)
+
+    def _authenticated_rest_call(self, url, method, **kwargs):
+        """
+        Send a REST call through the session keeper, if one is set (see `cloudgenix.API.keep_session`), so requests
+        that race a session expiry are replayed after re-authentication.
+
+        **Returns:** See `cloudgenix.API.rest_call`.
+        """
+        token_pool = self._token_pool
+        send = token_pool.call if token_pool is not None else self._rest_call
+        session_keeper = self._session_keeper
+        if session_keeper is not None:
+            return session_keeper.call(send, url, method, **kwargs)
+        return send(url, method, **kwargs)
+
+    def _rest_call(self, url, method, data=None, sensitive=False, timeout=None, content_json=True, raw_msgs=False,
+                   stream_content=False):
+        """
+        REST call worker for `cloudgenix.API.rest_call`, makes a single request.
+
+        **Returns:** See `cloudgenix.API.rest_call`.
+        """
+        # pull timeout from Constructor if not specified.
+        if timeout is None:
+            timeout = self.rest_call_timeout
+
         # Get logging level, use this to bypass logging functions with possible large content if not set.
         logger_level = api_logger.getEffectiveLevel()
 
@@ -1014,6 +1545,8 @@ class API(object):
         cookie = self._session.cookies.get_dict()
 
         # make sure data is populated if present.
+        if isinstance(data, Record):
+            data = data.to_dict()
         if isinstance(data, (list, dict)):
             data = json.dumps(data)
 
@@ -1066,6 +1599,17 @@ class API(object):
 
                 return response
 
+            elif stream_content:
+                # Caller will consume and parse the body incrementally.
+                api_logger.debug('RESPONSE NOT LOGGED (streamed content)')
+
+                # CGX extend requests.Response for return
+                response.cgx_status = True
+                response.cgx_content = None
+                response.cgx_warnings = None
+                response.cgx_errors = None
+                return response
+
             else:
 
                 # Simple JSON debug
@@ -1180,6 +1724,7 @@ class API(object):
             # Override automatic with any manually passed kwargs
             ws_kwargs.update(kwargs)
 
+            import websockets
             return websockets.connect(*ws_args, **ws_kwargs)
 
         else:
@@ -1190,15 +1735,12 @@ class API(object):
         """
         Function to clean up ca temp file for requests.
 
-        **Returns:** Removes TEMP ca file, no return
+        The CA temp file is now shared by all `API()` objects in the process and removed once at exit, so this is
+        a no-op kept for compatibility.
+
+        **Returns:** No return
         """
-        if os.name == 'nt':
-            if isinstance(self.ca_verify_filename, (binary_type, text_type)):
-                # windows requires file to be closed for access. Have to manually remove
-                os.unlink(self.ca_verify_filename)
-        else:
-            # other OS's allow close and delete of file.
-            self._ca_verify_file_handle.close()
+        return
 
     def parse_auth_token(self, auth_token):
         """
@@ -1297,6 +1839,81 @@ class API(object):
         api_logger.debug("UPDATED_CONTROLLER_REGION = %s", self.controller_region)
         return
 
+    def _region_cache_key(self, email):
+        """
+        **Returns:** Region cache key for an operator email on the base (non-regional) controller.
+        """
+        key = "{0}|{1}".format(self.controller_orig or self.controller, email.lower())
+        # hashed, so operator emails are not stored in the cache file.
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def _read_region_cache(self):
+        """
+        **Returns:** Dict of region cache entries, empty if missing or unreadable.
+        """
+        cache_file = self.region_cache_file
+        if not cache_file:
+            return {}
+        try:
+            with open(cache_file) as cache_fd:
+                cached = json.load(cache_fd)
+        except (IOError, OSError, ValueError):
+            return {}
+        return cached if isinstance(cached, dict) else {}
+
+    def cached_login_region(self, email):
+        """
+        Get the login region cached for an operator on this controller.
+
+        **Parameters:**
+
+          - **email:** Operator email.
+
+        **Returns:** Region string, or None if not cached (or older than `cloudgenix.API.region_cache_ttl`).
+        """
+        if not email:
+            return None
+        entry = self._read_region_cache().get(self._region_cache_key(email))
+        if not isinstance(entry, dict):
+            return None
+        updated = entry.get('updated')
+        if not isinstance(updated, (int, float)) or not 0 <= time.time() - updated < self.region_cache_ttl:
+            return None
+        return entry.get('region')
+
+    def cache_login_region(self, email, region):
+        """
+        Cache the login region for an operator on this controller. Fails silently.
+
+        **Parameters:**
+
+          - **email:** Operator email.
+          - **region:** Region string. None removes the cached entry.
+
+        **Returns:** No return.
+        """
+        cache_file = self.region_cache_file
+        if not cache_file or not email:
+            return
+        key = self._region_cache_key(email)
+        with _SHARED_LOCK:
+            cached = self._read_region_cache()
+            entry = cached.get(key)
+            if region is None:
+                if entry is None:
+                    return
+                cached.pop(key)
+            elif isinstance(entry, dict) and entry.get('region') == region and \
+                    time.time() - entry.get('updated', 0) < self.region_cache_ttl / 2:
+                # still fresh, skip the write.
+                return
+            else:
+                cached[key] = {'region': region, 'updated': time.time()}
+            try:
+                _write_json_file(cache_file, cached)
+            except (IOError, OSError) as e:
+                api_logger.debug("REGION_CACHE: unable to write cache %s: %s", cache_file, e)
+
     def parse_region(self, login_response):
         """
         Return region from a successful login response.
@@ -1369,6 +1986,34 @@ class API(object):
 
         return response
 
+    @staticmethod
+    def _build_cgx_response(content, status_code=200, raw_msgs=False):
+        """
+        Create a CloudGenix extended `requests.Response` object for content that was assembled locally (cached,
+        merged, or split results) instead of returned by a single `cloudgenix.API.rest_call`.
+
+        **Parameters:**
+
+          - **content:** Dict content for the response.
+          - **status_code:** Optional - HTTP status code to report (default 200).
+          - **raw_msgs:** Optional - True/False, if True, do not convert API sideband messages (warnings, errors) to text.
+
+        **Returns:** Requests.Response object, extended with cgx_status, cgx_content, cgx_errors and cgx_warnings.
+        """
+        response = requests.Response()
+        response.status_code = status_code
+        response.reason = 'OK' if status_code == requests.codes.ok else None
+        response._content = json.dumps(content).encode('utf-8')
+        response.encoding = 'utf-8'
+        response.headers['Content-Type'] = 'application/json'
+
+        # CGX extend requests.Response for return
+        response.cgx_status = status_code in [requests.codes.ok, requests.codes.no_content]
+        response.cgx_content = content
+        response.cgx_warnings = API.pull_content_warning(response, raw=raw_msgs)
+        response.cgx_errors = API.pull_content_error(response, raw=raw_msgs)
+        return response
+
     @staticmethod
     def url_decode(url):
         """
@@ -1465,6 +2110,106 @@ class API(object):
                 self.throw_error("Unable to extract '{0}' from response.".format(items_key), resp_object)
                 return [{}]
 
+    def iter_items(self, source, error_label=None, pass_code_list=None, items_key='items', record_type=None):
+        """
+        Generator counterpart of `cloudgenix.API.extract_items`. Yields items one at a time from one or more pages.
+
+        Pages are consumed lazily, so items from the first page can be processed while later pages are still being
+        requested. Responses made with `stream_content=True` are decoded incrementally from the response body.
+
+        **Parameters:**
+
+          - **source:** CloudGenix Extended `requests.Response` object, or an iterable of them (one per page, for
+          example `cloudgenix.API.iter_pages`).
+          - **error_label:** Optional - text to describe operation on error.
+          - **pass_code_list:** Optional - list of HTTP response codes to silently pass. Matching pages yield no items.
+          - **items_key:** Optional - Text for items key to extract (default 'items')
+          - **record_type:** Optional - Yield compact `cloudgenix.records.Record` objects instead of dicts. A Record
+          subclass, or a resource name from `cloudgenix.records.RECORD_TYPES` (ex. 'interfaces').
+
+        **Returns:** Generator of 'items' objects. Raises `cloudgenix.CloudGenixPageError` at the failing page.
+        """
+
+        if pass_code_list is None:
+            pass_code_list = [404, 400]
+
+        if isinstance(source, requests.Response):
+            source = [source]
+
+        convert = record_class(record_type) if record_type is not None else None
+
+        items_yielded = 0
+        for page, resp_object in enumerate(source):
+
+            if error_label is not None:
+                message = "Unable to extract '{0}' from {1} (page {2}).".format(items_key, error_label, page)
+            else:
+                message = "Unable to extract '{0}' from response (page {1}).".format(items_key, page)
+
+            def page_error(text, _resp=resp_object, _page=page, _count=items_yielded):
+                return CloudGenixPageError(text, response=_resp, page=_page, items_yielded=_count)
+
+            if resp_object.cgx_status and resp_object.cgx_content is None:
+                # streamed response, decode items as the body arrives.
+                from .monitor import JSONItemStream
+                try:
+                    for item in JSONItemStream(resp_object.iter_content(chunk_size=65536), (items_key,)):
+                        items_yielded += 1
+                        yield convert(item) if convert is not None else item
+                except (ValueError, requests.exceptions.RequestException) as e:
+                    api_logger.debug("ITER_ITEMS stream error on page %s: %s", page, e)
+                    self.throw_error("{0} {1}".format(message, e), exception=page_error)
+                continue
+
+            items = resp_object.cgx_content.get(items_key)
+
+            if resp_object.cgx_status and items is not None:
+                for item in items:
+                    items_yielded += 1
+                    yield convert(item) if convert is not None else item
+
+            # handle 404 and other error codes for certain APIs where objects may not exist
+            elif resp_object.status_code in pass_code_list:
+                continue
+
+            else:
+                self.throw_error(message, resp_object, exception=page_error)
+
+    def iter_pages(self, query_func, data, offset_key='_offset', max_pages=None, **kwargs):
+        """
+        Page through a query API that returns an offset for the next page (ex. `cloudgenix.post_api.Post.events_query`).
+
+        Each response is yielded before the next page is requested. Paging stops when a page has no items, no new
+        offset, or is not successful. Combine with `cloudgenix.API.iter_items` to stream items across pages.
+
+        **Parameters:**
+
+          - **query_func:** SDK function to call, ex. `sdk.post.events_query`. Called as `query_func(data, **kwargs)`.
+          - **data:** Query dict for the first page. Not modified.
+          - **offset_key:** Optional - Key holding the next page offset in the response and request (default '_offset')
+          - **max_pages:** Optional - Stop after this many pages.
+          - **kwargs:** Optional - Passed to `query_func` (ex. tenant_id, api_version)
+
+        **Returns:** Generator of CloudGenix Extended `requests.Response` objects, one per page.
+        """
+        data = dict(data)
+        pages = 0
+        while True:
+            resp_object = query_func(data, **kwargs)
+            yield resp_object
+            pages += 1
+
+            if max_pages is not None and pages >= max_pages:
+                return
+            content = resp_object.cgx_content if resp_object.cgx_status else None
+            if not isinstance(content, dict) or not content.get('items'):
+                return
+            next_offset = content.get(offset_key)
+            if next_offset is None or next_offset == data.get(offset_key):
+                return
+            api_logger.debug("ITER_PAGES page %s, next %s: %s", pages, offset_key, next_offset)
+            data[offset_key] = next_offset
+
     def build_lookup_dict(self, list_content, key_val='name', value_val='id', force_nag=False, nag_cache=None):
         """
         Build key/value lookup dictionary from a list of dictionaries with specified key/value entries.
@@ -1483,10 +2228,13 @@ class API(object):
             already_nagged_dup_keys = nag_cache
         else:
             already_nagged_dup_keys = []
+        already_nagged_dup_key_set = set(already_nagged_dup_keys)
 
         lookup_dict = {}
+        # keep duplicate keys in order for warnings, with set/dict lookups to stay linear on large lists.
         blacklist_duplicate_keys = []
-        blacklist_duplicate_entries = []
+        blacklist_duplicate_key_set = set()
+        blacklist_duplicate_entries = {}
 
         for item in list_content:
             item_key = item.get(key_val)
@@ -1498,31 +2246,50 @@ class API(object):
                     # First duplicate we've seen - save for warning.
                     duplicate_value = lookup_dict.get(item_key)
                     blacklist_duplicate_keys.append(item_key)
-                    blacklist_duplicate_entries.append({item_key: duplicate_value})
-                    blacklist_duplicate_entries.append({item_key: item_value})
+                    blacklist_duplicate_key_set.add(item_key)
+                    blacklist_duplicate_entries[item_key] = [{item_key: duplicate_value}, {item_key: item_value}]
                     # remove from lookup dict to prevent accidental overlap usage
                     del lookup_dict[str(item_key)]
 
                 # check if it was a third+ duplicate key for a previous key
-                elif item_key in blacklist_duplicate_keys:
+                elif item_key in blacklist_duplicate_key_set:
                     # save for warning.
-                    blacklist_duplicate_entries.append({item_key: item_value})
+                    blacklist_duplicate_entries[item_key].append({item_key: item_value})
 
                 else:
                     # no duplicates, append
                     lookup_dict[str(item_key)] = item_value
 
         for duplicate_key in blacklist_duplicate_keys:
-            matching_entries = [entry for entry in blacklist_duplicate_entries if duplicate_key in entry]
+            matching_entries = blacklist_duplicate_entries[duplicate_key]
             # check if force_nag set and if not, has key already been notified to the end user.
-            if force_nag or duplicate_key not in already_nagged_dup_keys:
+            if force_nag or duplicate_key not in already_nagged_dup_key_set:
                 self.throw_warning(
                     "Lookup value '{0}' was seen two or more times. To use, please remove duplicates in the controller,"
                     " or reference it explicitly by the actual value: ".format(duplicate_key), matching_entries)
                 # we've now notified, add to notified list.
                 already_nagged_dup_keys.append(duplicate_key)
+                already_nagged_dup_key_set.add(duplicate_key)
         return lookup_dict
 
+    @staticmethod
+    def build_lookup_index(list_content, key_fields=('name',), value_field='id', case_insensitive=False):
+        """
+        Build a reusable multi-key lookup index from a list of dictionaries. Unlike `cloudgenix.API.build_lookup_dict`,
+        the index supports multiple key fields, reverse and prefix lookups, and incremental updates.
+
+        **Parameters:**
+
+          - **list_content:** List of dicts to derive the index from
+          - **key_fields:** Optional - Iterable of values to extract from each entry as keys
+          - **value_field:** Optional - Value to extract from entry to be value
+          - **case_insensitive:** Optional - Bool, if True key lookups ignore case.
+
+        **Returns:** `cloudgenix.lookup.LookupIndex` object
+        """
+        return LookupIndex(list_content, key_fields=key_fields, value_field=value_field,
+                           case_insensitive=case_insensitive)
+
     @staticmethod
     def pull_content_error(resp_object, raw=False):
         """
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+CloudGenix Python SDK - Concurrency helper functions
+
+**Author:** CloudGenix
+
+**Copyright:** (c) 2017-2021 CloudGenix, Inc
+
+**License:** MIT
+"""
+import logging
+
+__author__ = "CloudGenix Developer Support <developers@cloudgenix.com>"
+__email__ = "developers@cloudgenix.com"
+__copyright__ = "Copyright (c) 2017-2021 CloudGenix, Inc"
+__license__ = """
+    MIT License
+
+    Copyright (c) 2017-2021 CloudGenix, Inc
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+# Set logging to function name
+api_logger = logging.getLogger(__name__)
+"""`logging.getlogger` object to enable debug printing via `cloudgenix.API.set_debug`"""
+
+CONCURRENT_FEATURES = False
+""" Boolean: This flag is automatically set if `concurrent.futures` is available (Python 3, or the Python 2
+`futures` backport). If False, helpers in this module run serially."""
+
+try:
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    CONCURRENT_FEATURES = True
+except ImportError:
+    # Python 2.x without the 'futures' backport. Run serially.
+    ThreadPoolExecutor = None
+    as_completed = None
+
+DEFAULT_MAX_WORKERS = 8
+"""Default number of worker threads used by SDK concurrent helpers."""
+
+
+def map_concurrent(func, items, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Run `func(item)` for each item with bounded concurrency, yielding results as they complete.
+
+    Exceptions raised by `func` do not stop other items, they are returned in the result tuple.
+
+    **Parameters:**
+
+      - **func:** Callable taking one item.
+      - **items:** Iterable of items.
+      - **max_workers:** Optional - Maximum concurrent calls. 1 (or no `concurrent.futures`) runs serially.
+
+    **Returns:** Generator of (item, result, exception) tuples, in completion order. One of result/exception is None.
+    """
+    items = list(items)
+
+    if not CONCURRENT_FEATURES or max_workers is None or max_workers <= 1 or len(items) <= 1:
+        for item in items:
+            try:
+                yield item, func(item), None
+            except Exception as e:
+                api_logger.debug("MAP_CONCURRENT item %s raised %s", item, e)
+                yield item, None, e
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(items)))
+    future_map = {}
+    try:
+        future_map = dict((executor.submit(func, item), item) for item in items)
+        for future in as_completed(future_map):
+            item = future_map[future]
+            exception = future.exception()
+            if exception is not None:
+                api_logger.debug("MAP_CONCURRENT item %s raised %s", item, exception)
+                yield item, None, exception
+            else:
+                yield item, future.result(), None
+    finally:
+        # if the consumer stops early, don't start queued work.
+        for future in future_map:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def run_concurrent(func, items, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Run `func(item)` for each item with bounded concurrency, and return results in input order.
+
+    The first exception raised by `func` (in input order) is re-raised after all items finish.
+
+    **Parameters:**
+
+      - **func:** Callable taking one item.
+      - **items:** Iterable of items.
+      - **max_workers:** Optional - Maximum concurrent calls.
+
+    **Returns:** List of results, in the same order as `items`.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    errors = [None] * len(items)
+    for index, result, exception in map_concurrent(lambda idx: func(items[idx]), range(len(items)),
+                                                   max_workers=max_workers):
+        results[index] = result
+        errors[index] = exception
+    for exception in errors:
+        if exception is not None:
+            raise exception
+    return results
@@ -15,6 +15,8 @@ import logging
 import time
 import sys
 
+from .concurrency import map_concurrent, run_concurrent, DEFAULT_MAX_WORKERS
+
 __author__ = "CloudGenix Developer Support <developers@cloudgenix.com>"
 __email__ = "developers@cloudgenix.com"
 __copyright__ = "Copyright (c) 2017-2021 CloudGenix, Inc"
@@ -83,6 +85,12 @@ class Interactive(object):
     # placeholder for parent class namespace
     _parent_class = None
 
+    max_workers = DEFAULT_MAX_WORKERS
+    """Default maximum concurrent clients for `Interactive.for_each_client`."""
+
+    # ESP/MSP client responses fetched at login, see `Interactive._bootstrap_session`.
+    _prefetched_clients = None
+
     def login(self, email=None, password=None, saml_auto_browser=True,
               saml_wait_loops=20, saml_wait_delay=5, client_login=True, client=None,
               prompt=None):
@@ -146,6 +154,14 @@ class Interactive(object):
             else:
                 password = getpass.getpass(password_prompt)
 
+        # If this operator's region is cached, go straight to the regional controller (skips the region redirect).
+        # Only on the first attempt (no region set yet), so a stale entry can't override a login_region redirect.
+        if not self._parent_class.ignore_region and self._parent_class.controller_region is None:
+            cached_region = self._parent_class.cached_login_region(email)
+            if cached_region and cached_region != self._parent_class.controller_region:
+                api_logger.debug('Using cached login region %s', cached_region)
+                self._parent_class.update_region_to_controller(cached_region)
+
         # Try and login
         # For SAML 2.0 support, set the Referer URL prior to logging in.
         # add referer header to the session.
@@ -206,6 +222,8 @@ class Interactive(object):
                     if not self._parent_class.ignore_region:
                         # We are on the wrong region. We need to change regions and resubmit login request.
                         self._parent_class.update_region_to_controller(login_region)
+                        # replace any stale cached region for this operator.
+                        self._parent_class.cache_login_region(email, login_region)
                         # recall the login function with the new region. Return the result.
                         return self.login(email=email, password=password, saml_auto_browser=saml_auto_browser,
                                           saml_wait_loops=saml_wait_loops, saml_wait_delay=saml_wait_delay,
@@ -222,16 +240,23 @@ class Interactive(object):
                 # token in the original login (not saml) means region parsing has not been done.
                 # do now, and recheck if cookie needs set.
                 auth_region = self._parent_class.parse_region(response)
+                login_controller = self._parent_class.controller
                 self._parent_class.update_region_to_controller(auth_region)
-                self._parent_class.reparse_login_cookie_after_region_update(response)
+                if self._parent_class.controller != login_controller:
+                    # login was not sent to the regional controller, cookies need re-parsing.
+                    self._parent_class.reparse_login_cookie_after_region_update(response)
+                if auth_region and not self._parent_class.ignore_region:
+                    self._parent_class.cache_login_region(email, auth_region)
             # debug info if needed
             api_logger.debug("AUTH_TOKEN=%s", response.cgx_content.get('x_auth_token'))
 
-            # Step 2: Get operator profile for tenant ID and other info. Verify we have tenant_id.
-            if self.update_profile_vars() and self._parent_class.tenant_id:
+            # Step 2: Get operator profile for tenant ID and other info, then tenant info (and ESP/MSP client info,
+            # if client login may follow). Verify we have tenant_id.
+            c_profile, t_profile = self._bootstrap_session(prefetch_clients=client_login)
+            if c_profile and self._parent_class.tenant_id:
 
                 # add tenant values to API() object
-                if self.tenant_update_vars():
+                if t_profile:
 
                     # Step 3: Check for ESP/MSP. If client login is enabled, handle client login.
                     if self._parent_class.is_esp and client_login:
@@ -338,11 +363,12 @@ class Interactive(object):
         if PYTHON36_FEATURES:
             self._parent_class.websocket_add_headers(x_auth_header)
 
-        # Step 2: Get operator profile for tenant ID and other info.
-        if self.update_profile_vars() and self._parent_class.tenant_id:
+        # Step 2: Get operator profile for tenant ID and other info, then tenant info.
+        c_profile, t_profile = self._bootstrap_session()
+        if c_profile and self._parent_class.tenant_id:
 
             # add tenant values to API() object
-            if self.tenant_update_vars():
+            if t_profile:
 
                 # For future use, if AUTH_TOKENs are ever permitted for client login/logout.
                 # # Step 3: Check for ESP/MSP. If client login is enabled, handle client login.
@@ -400,36 +426,9 @@ class Interactive(object):
 
             if choose_status:
                 # attempt to login as client
-                clogin_resp = self._parent_class.post.clients_login(chosen_client_id, {})
+                clogin_resp, c_profile, t_profile = self._client_session_login(chosen_client_id)
 
                 if clogin_resp.cgx_status:
-                    # see if we need to change regions.
-                    redirect_region = clogin_resp.cgx_content.get('redirect_region')
-                    redirect_x_auth_token = clogin_resp.cgx_content.get('redirect_x_auth_token')
-                    redirect_urlpath = clogin_resp.cgx_content.get('redirect_urlpath')
-
-                    if redirect_region is not None and redirect_x_auth_token is not None:
-                        api_logger.debug('CLIENT REGION SWITCH: %s -> %s', self._parent_class.controller_region,
-                                         redirect_region)
-                        # Need to change regions.
-                        self._parent_class.update_region_to_controller(redirect_region)
-
-                        # Now set a temporary X-Auth-Token header, overwriting previous if there.
-                        # if using a static AUTH_TOKEN, client login will switch to dynamic via
-                        # Cookies.
-                        self._parent_class.add_headers({'X-Auth-Token': redirect_x_auth_token})
-
-                    # login successful, update profile
-
-                    # Profile call will set new login cookies if switching regions.
-                    c_profile = self.update_profile_vars()
-                    if redirect_region is not None and redirect_x_auth_token is not None:
-                        # if region switch, we need to clear the X-Auth-Token header, as it was a temporary value
-                        # and now we are using cookies for ephemeral AUTH_TOKENs.
-                        self._parent_class.remove_header('X-Auth-Token')
-
-                    # Update tenant info.
-                    t_profile = self.tenant_update_vars()
 
                     if c_profile and t_profile:
                         # successful full client login.
@@ -475,6 +474,128 @@ class Interactive(object):
             self._parent_class.remove_header('Referer')
             return False
 
+    def _client_session_login(self, client_id):
+        """
+        Login to an ESP/MSP client by ID, and update profile and tenant info. No prompts or output.
+
+        **Parameters:**:
+
+          - **client_id**: ESP/MSP managed Client ID
+
+        **Returns:** Tuple of (clients_login response, Boolean profile update, Boolean tenant update). Profile and
+                     tenant updates are False if the client login failed.
+        """
+        clogin_resp = self._parent_class.post.clients_login(client_id, {})
+
+        if not clogin_resp.cgx_status:
+            return clogin_resp, False, False
+
+        # see if we need to change regions.
+        redirect_region = clogin_resp.cgx_content.get('redirect_region')
+        redirect_x_auth_token = clogin_resp.cgx_content.get('redirect_x_auth_token')
+
+        if redirect_region is not None and redirect_x_auth_token is not None:
+            api_logger.debug('CLIENT REGION SWITCH: %s -> %s', self._parent_class.controller_region,
+                             redirect_region)
+            # Need to change regions.
+            self._parent_class.update_region_to_controller(redirect_region)
+
+            # Now set a temporary X-Auth-Token header, overwriting previous if there.
+            # if using a static AUTH_TOKEN, client login will switch to dynamic via
+            # Cookies.
+            self._parent_class.add_headers({'X-Auth-Token': redirect_x_auth_token})
+
+        # login successful, update profile and tenant info. A client's tenant ID is its client ID, so both
+        # can be requested at once.
+
+        # Profile call will set new login cookies if switching regions.
+        c_profile, t_profile = self._bootstrap_session(client_id)
+        if redirect_region is not None and redirect_x_auth_token is not None:
+            # if region switch, we need to clear the X-Auth-Token header, as it was a temporary value
+            # and now we are using cookies for ephemeral AUTH_TOKENs.
+            self._parent_class.remove_header('X-Auth-Token')
+
+        return clogin_resp, c_profile, t_profile
+
+    def _client_session_logout(self):
+        """
+        Log a per-client session (ex. a `cloudgenix.API.clone` used for one client) out of its client, without
+        restoring the ESP/MSP profile. No prompts or output, failures are logged and ignored.
+
+        **Returns:** Boolean Success.
+        """
+        try:
+            clogout_resp = self._parent_class.post.clients_logout({})
+        except Exception as e:
+            api_logger.debug("Client logout for %s failed: %s", self._parent_class.client_id, e)
+            return False
+        if not clogout_resp.cgx_status:
+            api_logger.debug("Client logout for %s failed: %s", self._parent_class.client_id,
+                             clogout_resp.cgx_content)
+        return clogout_resp.cgx_status
+
+    def for_each_client(self, func, clients=None, max_workers=None):
+        """
+        Run a function against ESP/MSP clients concurrently, each in its own isolated client session.
+
+        Each client gets a `cloudgenix.API.clone` of the current ESP/MSP session, which is then logged in to the
+        client, and logged out of it again once `func` returns. The current `cloudgenix.API` object (tenant, cookies,
+        headers) is not modified.
+
+        **Parameters:**:
+
+          - **func**: Callable taking a logged in, per-client `cloudgenix.API` object. Its return value is the result.
+          - **clients**: Optional. Iterable of Client Canonical Names, Client Names, or Client IDs (matched in this
+                         order). Default: all clients this session has access to.
+          - **max_workers**: Optional. Maximum clients to run concurrently. Default `Interactive.max_workers`.
+
+        **Returns:** Generator of (client_id, result, exception) tuples, in completion order. Client login failures
+                     and exceptions raised by `func` are returned as the exception for that client only.
+                     Unmatched client names are returned with client_id set to the name given.
+        """
+        api_logger.info('for_each_client function:')
+
+        if self._parent_class.token_session is True:
+            # AUTH_TOKENs are not allowed to do client login/logout.
+            self._parent_class.throw_error("Static AUTH_TOKENs are not allowed to perform client login/logout "
+                                           "operations.")
+
+        session_status, client_n2id, client_canonical_n2id, client_id2r = self.session_allowed_clients()
+        if not session_status:
+            self._parent_class.throw_error("ESP/MSP detail retrieval failed. Current session may not be an ESP/MSP.")
+
+        if max_workers is None:
+            max_workers = self.max_workers
+
+        if clients is None:
+            client_ids = list(client_id2r.keys())
+        else:
+            client_ids = []
+            for client in clients:
+                # match canonical name, then name, then ID.
+                client_id = client_canonical_n2id.get(client, client_n2id.get(client))
+                client_ids.append(client_id if client_id is not None else client)
+
+        parent = self._parent_class
+
+        def run_client(client_id):
+            if client_id not in client_id2r:
+                parent.throw_error("ESP/MSP client '{0}' not found in clients allowed for this session."
+                                   "".format(client_id))
+            client_api = parent.clone()
+            clogin_resp, c_profile, t_profile = client_api.interactive._client_session_login(client_id)
+            try:
+                if not (clogin_resp.cgx_status and c_profile and t_profile):
+                    parent.throw_error("ESP Client Login failed for client '{0}'.".format(client_id), clogin_resp)
+                client_api.client_id = client_id
+                return func(client_api)
+            finally:
+                if clogin_resp.cgx_status:
+                    # don't leave the client login active server-side.
+                    client_api.interactive._client_session_logout()
+
+        return map_concurrent(run_client, client_ids, max_workers=max_workers)
+
     def client_logout(self, client_login=True, client=None):
         """
         If logged into a client, go back to ESP/MSP.
@@ -569,7 +690,14 @@ class Interactive(object):
         **Returns:** Boolean on success/failure,
         """
         api_logger.info('tenant_update_vars function:')
-        tenant_resp = self._parent_class.get.tenants(self._parent_class.tenant_id)
+        return self._apply_tenant_vars(self._parent_class.get.tenants(self._parent_class.tenant_id))
+
+    def _apply_tenant_vars(self, tenant_resp):
+        """
+        Update the `cloudgenix.API` object from a `cloudgenix.get_api.Get.tenants` response.
+
+        **Returns:** Boolean on success/failure,
+        """
         status = tenant_resp.cgx_status
         tenant_dict = tenant_resp.cgx_content
 
@@ -606,9 +734,14 @@ class Interactive(object):
         **Returns:** Boolean on success/failure,
         """
         api_logger.info('update_profile_vars function:')
+        return self._apply_profile_vars(self._parent_class.get.profile())
 
-        profile = self._parent_class.get.profile()
+    def _apply_profile_vars(self, profile):
+        """
+        Update the `cloudgenix.API` object from a `cloudgenix.get_api.Get.profile` response.
 
+        **Returns:** Boolean on success/failure,
+        """
         if profile.cgx_status:
 
             # if successful, save tenant id and email info to cli state.
@@ -628,6 +761,56 @@ class Interactive(object):
             self._parent_class._password = None
             return False
 
+    def _bootstrap_session(self, tenant_id_hint=None, prefetch_clients=False):
+        """
+        Run `Interactive.update_profile_vars` and `Interactive.tenant_update_vars` after login.
+
+        The tenant request needs the tenant ID from the profile. If it is already known (`tenant_id_hint`, ex. the
+        client ID on client login), both are requested concurrently, and the tenant request is redone if the
+        profile shows a different tenant ID. Otherwise the profile is fetched first, and the tenant request (plus
+        the ESP/MSP client requests, if `prefetch_clients`) then run concurrently using its tenant and operator IDs.
+
+        **Parameters:**:
+
+          - **tenant_id_hint**: Optional. Known tenant ID, ex. the client ID on ESP/MSP client login.
+          - **prefetch_clients**: Optional. Also fetch the `Interactive.session_allowed_clients` data, used by the
+                                  next call to it if the tenant is an ESP/MSP. Default: False
+
+        **Returns:** Tuple of (Boolean profile update, Boolean tenant update).
+        """
+        api_logger.info('_bootstrap_session function (tenant_id_hint=%s):', tenant_id_hint)
+        get = self._parent_class.get
+        self._prefetched_clients = None
+
+        if tenant_id_hint:
+            profile_resp, tenant_resp = run_concurrent(lambda call: call(),
+                                                       [get.profile, lambda: get.tenants(tenant_id_hint)],
+                                                       max_workers=2)
+            c_profile = self._apply_profile_vars(profile_resp)
+            if not (c_profile and self._parent_class.tenant_id):
+                return c_profile, False
+            if self._parent_class.tenant_id != tenant_id_hint:
+                api_logger.debug("Tenant ID hint %s did not match profile tenant ID %s, re-requesting tenant.",
+                                 tenant_id_hint, self._parent_class.tenant_id)
+                return c_profile, self.tenant_update_vars()
+            return c_profile, self._apply_tenant_vars(tenant_resp)
+
+        c_profile = self.update_profile_vars()
+        if not (c_profile and self._parent_class.tenant_id):
+            return c_profile, False
+
+        tenant_id = self._parent_class.tenant_id
+        operator_id = self._parent_class.operator_id
+        calls = [lambda: get.tenants(tenant_id)]
+        if prefetch_clients:
+            calls.extend([get.tenant_clients, lambda: get.esp_operator_permissions(operator_id)])
+        responses = run_concurrent(lambda call: call(), calls, max_workers=len(calls))
+
+        t_profile = self._apply_tenant_vars(responses[0])
+        if t_profile and prefetch_clients and self._parent_class.is_esp:
+            self._prefetched_clients = (responses[1], responses[2])
+        return c_profile, t_profile
+
     def session_allowed_clients(self):
         """
         Get the current ESP session allowed clients info.
@@ -639,9 +822,18 @@ class Interactive(object):
 
         # sanity check if ESP
         if self._parent_class.is_esp:
-            # Make API requests
-            clients = self._parent_class.get.tenant_clients()
-            clients_perms = self._parent_class.get.esp_operator_permissions(self._parent_class.operator_id)
+            prefetched, self._prefetched_clients = self._prefetched_clients, None
+            if prefetched is not None:
+                # fetched at login, see `Interactive._bootstrap_session`.
+                clients, clients_perms = prefetched
+            else:
+                # Make API requests, these are independent so run concurrently.
+                get = self._parent_class.get
+                operator_id = self._parent_class.operator_id
+                clients, clients_perms = run_concurrent(lambda call: call(),
+                                                        [get.tenant_clients,
+                                                         lambda: get.esp_operator_permissions(operator_id)],
+                                                        max_workers=2)
 
             client_status = clients.cgx_status
             clients_dict = clients.cgx_content
@@ -871,6 +1063,12 @@ class Interactive(object):
         """
         api_logger.info('logout function:')
 
+        # stop any session keeper, so it doesn't log back in.
+        session_keeper = self._parent_class._session_keeper
+        if session_keeper is not None:
+            session_keeper.stop()
+            self._parent_class._session_keeper = None
+
         # Extract requests session for manipulation.
         session = self._parent_class.expose_session()
 
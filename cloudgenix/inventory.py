@@ -0,0 +1,540 @@
+#!/usr/bin/env python
+"""
+CloudGenix Python SDK - Inventory helper functions
+
+**Author:** CloudGenix
+
+**Copyright:** (c) 2017-2021 CloudGenix, Inc
+
+**License:** MIT
+"""
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+
+from .concurrency import map_concurrent, DEFAULT_MAX_WORKERS
+
+__author__ = "CloudGenix Developer Support <developers@cloudgenix.com>"
+__email__ = "developers@cloudgenix.com"
+__copyright__ = "Copyright (c) 2017-2021 CloudGenix, Inc"
+__license__ = """
+    MIT License
+
+    Copyright (c) 2017-2021 CloudGenix, Inc
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+# Set logging to function name
+api_logger = logging.getLogger(__name__)
+"""`logging.getlogger` object to enable debug printing via `cloudgenix.API.set_debug`"""
+
+INVENTORY_TYPES = ("sites", "elements", "interfaces", "waninterfaces", "lannetworks")
+"""Object types collected by `Inventory.crawl` by default, in hierarchy order."""
+
+TENANT_TYPES = ("wannetworks", "policysets")
+"""Additional tenant-level object types `Inventory.crawl` can collect."""
+
+STATE_TRACKERS = OrderedDict([
+    ("sites", ("sites_bulk_config_state_query", "sites")),
+    ("elements", ("elements_bulk_config_state_query", "elements")),
+    ("networks", ("networks_bulk_config_state_query", "wannetworks")),
+    ("policysets", ("policysets_bulk_config_state_query", "policysets")),
+])
+"""Bulk config/state trackers used by `Inventory.refresh`: name -> (`post` query function, graph object type)."""
+
+
+def _fingerprint(entry):
+    """
+    Short stable digest of a bulk config/state entry. Any change in config, state, or `_etag` changes it.
+    """
+    return hashlib.sha1(json.dumps(entry, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class InventoryGraph(object):
+    """
+    In-memory tenant object graph, indexed by ID, by (type, name), and by parent/child relationship.
+    """
+
+    def __init__(self):
+        """
+        Create an empty graph.
+        """
+        self.objects = {}
+        """Dict of object ID to object dict."""
+
+        self.types = {}
+        """Dict of object ID to object type (ex. `sites`)."""
+
+        self.by_type = dict((obj_type, OrderedDict()) for obj_type in INVENTORY_TYPES)
+        """Dict of object type to an ordered dict of object ID to object dict."""
+
+        self.parents = {}
+        """Dict of object ID to parent object ID."""
+
+        self.errors = []
+        """List of (description, response) tuples for calls that failed during a non-strict crawl."""
+
+        self.state = {}
+        """Dict of state tracker name to a dict of object ID to bulk config/state fingerprint. See `Inventory.refresh`."""
+
+        self._names = {}
+        self._children = {}
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __contains__(self, object_id):
+        return object_id in self.objects
+
+    def add(self, obj_type, obj, parent_id=None):
+        """
+        Add (or replace) an object.
+
+          - **obj_type:** Object type (ex. `interfaces`)
+          - **obj:** Object dict, must contain `id`.
+          - **parent_id:** Optional: ID of the parent object.
+
+        **Returns:** No return.
+        """
+        object_id = obj.get('id')
+        if object_id is None:
+            return
+        if object_id in self.objects:
+            self.remove(object_id)
+
+        self.objects[object_id] = obj
+        self.types[object_id] = obj_type
+        self.by_type.setdefault(obj_type, OrderedDict())[object_id] = obj
+        name = obj.get('name')
+        if name is not None:
+            self._names.setdefault((obj_type, name), set()).add(object_id)
+        if parent_id is not None:
+            self.parents[object_id] = parent_id
+            self._children.setdefault(parent_id, set()).add(object_id)
+
+    def remove(self, object_id):
+        """
+        Remove an object (children are kept, but lose their parent link target).
+
+          - **object_id:** Object ID
+
+        **Returns:** Removed object dict, or None if not present.
+        """
+        obj = self.objects.pop(object_id, None)
+        if obj is None:
+            return None
+        obj_type = self.types.pop(object_id)
+        self.by_type[obj_type].pop(object_id, None)
+        name_ids = self._names.get((obj_type, obj.get('name')))
+        if name_ids is not None:
+            name_ids.discard(object_id)
+            if not name_ids:
+                del self._names[(obj_type, obj.get('name'))]
+        parent_id = self.parents.pop(object_id, None)
+        if parent_id is not None:
+            self._children.get(parent_id, set()).discard(object_id)
+        return obj
+
+    def remove_tree(self, object_id):
+        """
+        Remove an object and all of its descendants.
+
+          - **object_id:** Object ID
+
+        **Returns:** List of removed object IDs.
+        """
+        removed = []
+        pending = [object_id]
+        while pending:
+            current_id = pending.pop()
+            pending.extend(self._children.pop(current_id, ()))
+            if self.remove(current_id) is not None:
+                removed.append(current_id)
+        return removed
+
+    def save(self, filename):
+        """
+        Save the graph (objects, parent links and state fingerprints) to a JSON file.
+
+          - **filename:** File path
+
+        **Returns:** No return.
+        """
+        snapshot = {
+            "objects": [[self.types[object_id], obj, self.parents.get(object_id)]
+                        for object_id, obj in self.objects.items()],
+            "state": self.state,
+        }
+        with open(filename, 'w') as snapshot_file:
+            json.dump(snapshot, snapshot_file)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load a graph saved with `InventoryGraph.save`.
+
+          - **filename:** File path
+
+        **Returns:** `InventoryGraph` object.
+        """
+        with open(filename, 'r') as snapshot_file:
+            snapshot = json.load(snapshot_file)
+        graph = cls()
+        for obj_type, obj, parent_id in snapshot.get("objects", []):
+            graph.add(obj_type, obj, parent_id=parent_id)
+        graph.state = snapshot.get("state", {})
+        return graph
+
+    def get(self, object_id, default=None):
+        """
+        Get an object by ID.
+
+          - **object_id:** Object ID
+          - **default:** Optional: Value to return if not found.
+
+        **Returns:** Object dict or `default`.
+        """
+        return self.objects.get(object_id, default)
+
+    def find(self, obj_type, name):
+        """
+        Find objects of a type by name.
+
+          - **obj_type:** Object type (ex. `sites`)
+          - **name:** Object name
+
+        **Returns:** List of matching object dicts (names are not unique in all object types).
+        """
+        return [self.objects[object_id] for object_id in sorted(self._names.get((obj_type, name), ()))]
+
+    def parent(self, object_id):
+        """
+        Get the parent of an object.
+
+          - **object_id:** Object ID
+
+        **Returns:** Parent object dict, or None.
+        """
+        return self.objects.get(self.parents.get(object_id))
+
+    def children(self, object_id, obj_type=None):
+        """
+        Get the children of an object.
+
+          - **object_id:** Object ID
+          - **obj_type:** Optional: Only return children of this type.
+
+        **Returns:** List of child object dicts.
+        """
+        return [self.objects[child_id] for child_id in sorted(self._children.get(object_id, ()))
+                if child_id in self.objects and (obj_type is None or self.types[child_id] == obj_type)]
+
+
+class Inventory(object):
+    """
+    CloudGenix API - Inventory helper functions
+
+    Object to help build and maintain an indexed view of tenant objects.
+    """
+
+    # placeholder for parent class namespace
+    _parent_class = None
+
+    max_workers = DEFAULT_MAX_WORKERS
+    """Maximum concurrent per-site/per-element requests during a crawl."""
+
+    def crawl(self, types=INVENTORY_TYPES, max_workers=None, use_query=True, strict=True, track_state=False,
+              tenant_id=None):
+        """
+        Fetch the site -> element -> interface / WAN interface / LAN network hierarchy into an `InventoryGraph`.
+
+        Tenant-wide calls (`get.sites`, `get.elements`, `post.interfaces_query`, `post.tenant_waninterfaces_query`)
+        are used where possible. Per-site and per-element calls are only made where no tenant-wide call exists, or a
+        query response was incomplete, and run with bounded concurrency.
+
+          **Parameters:**:
+
+          - **types**: Optional: Iterable of object types to collect. Default `INVENTORY_TYPES`. May also include
+                       `TENANT_TYPES`.
+          - **max_workers**: Optional: Maximum concurrent requests. Default `Inventory.max_workers`.
+          - **use_query**: Optional: Bool, use tenant-wide `*_query` endpoints when available. Default True.
+          - **strict**: Optional: Bool, if True raise `cloudgenix.CloudGenixAPIError` on the first failed call.
+                        If False, failures are recorded in `InventoryGraph.errors`. Default True.
+          - **track_state**: Optional: Bool, record bulk config/state fingerprints before crawling, so the graph
+                             can be kept current with `Inventory.refresh`. Default False.
+          - **tenant_id**: Tenant ID
+
+        **Returns:** `cloudgenix.inventory.InventoryGraph` object.
+        """
+        if tenant_id is None and self._parent_class.tenant_id:
+            # Pull tenant_id from parent namespace cache.
+            tenant_id = self._parent_class.tenant_id
+        elif not tenant_id:
+            # No value for tenant_id.
+            raise TypeError("tenant_id is required but not set or cached.")
+        if max_workers is None:
+            max_workers = self.max_workers
+        types = set(types)
+
+        graph = InventoryGraph()
+        get = self._parent_class.get
+        post = self._parent_class.post
+
+        if track_state:
+            # snapshot state first, so anything changing mid-crawl is picked up by the next refresh.
+            for tracker in STATE_TRACKERS:
+                graph.state[tracker] = self._state_query(graph, tracker, strict, tenant_id)
+
+        # sites are the root, always needed to walk per-site objects.
+        for site in self._items(graph, "sites", get.sites(tenant_id=tenant_id), strict):
+            graph.add("sites", site)
+        site_ids = list(graph.by_type["sites"])
+
+        if types & {"elements", "interfaces"}:
+            for element in self._items(graph, "elements", get.elements(tenant_id=tenant_id), strict):
+                site_id = element.get('site_id')
+                graph.add("elements", element, parent_id=site_id if site_id in graph else None)
+
+        if "interfaces" in types:
+            elements = [(element.get('site_id'), element_id) for element_id, element
+                        in graph.by_type["elements"].items() if element.get('site_id') in graph]
+            query_items = None
+            if use_query:
+                query_items = self._query_items("interfaces",
+                                                post.interfaces_query({}, tenant_id=tenant_id))
+            if query_items is not None:
+                for interface in query_items:
+                    graph.add("interfaces", interface, parent_id=interface.get('element_id'))
+            else:
+                self._crawl_children(graph, "interfaces", elements,
+                                     lambda parent: get.interfaces(parent[0], parent[1], tenant_id=tenant_id),
+                                     max_workers, strict)
+
+        if "waninterfaces" in types:
+            query_items = None
+            if use_query:
+                query_items = self._query_items("waninterfaces",
+                                                post.tenant_waninterfaces_query({}, tenant_id=tenant_id))
+            if query_items is not None:
+                for waninterface in query_items:
+                    graph.add("waninterfaces", waninterface, parent_id=waninterface.get('site_id'))
+            else:
+                self._crawl_children(graph, "waninterfaces", site_ids,
+                                     lambda parent: get.waninterfaces(parent, tenant_id=tenant_id),
+                                     max_workers, strict)
+
+        if "lannetworks" in types:
+            # no tenant-wide query exists for LAN networks.
+            self._crawl_children(graph, "lannetworks", site_ids,
+                                 lambda parent: get.lannetworks(parent, tenant_id=tenant_id),
+                                 max_workers, strict)
+
+        for obj_type in TENANT_TYPES:
+            if obj_type in types:
+                for obj in self._items(graph, obj_type, getattr(get, obj_type)(tenant_id=tenant_id), strict):
+                    graph.add(obj_type, obj)
+
+        api_logger.debug("CRAWL: %s objects, %s errors", len(graph), len(graph.errors))
+        return graph
+
+    def refresh(self, graph, trackers=None, max_workers=None, strict=True, tenant_id=None):
+        """
+        Incrementally update a graph from `Inventory.crawl` (or `InventoryGraph.load`) using the
+        `*_bulk_config_state_query` endpoints. Only objects whose config/state (or `_etag`) changed are re-fetched,
+        along with their per-object children (interfaces for elements, WAN interfaces and LAN networks for sites).
+        Objects no longer present are removed with their descendants.
+
+        A tracker without a recorded baseline treats every object as changed.
+
+          **Parameters:**:
+
+          - **graph**: `InventoryGraph` to update in place.
+          - **trackers**: Optional: Iterable of `STATE_TRACKERS` names to check. Default: all trackers with object
+                          types present in the graph, or already tracked.
+          - **max_workers**: Optional: Maximum concurrent requests. Default `Inventory.max_workers`.
+          - **strict**: Optional: Bool, if True raise `cloudgenix.CloudGenixAPIError` on the first failed call.
+                        If False, failures are recorded in `InventoryGraph.errors`, and the failed objects are
+                        re-checked on the next refresh. Default True.
+          - **tenant_id**: Tenant ID
+
+        **Returns:** Dict with `changed` and `removed` dicts of object type to list of object IDs.
+        """
+        if tenant_id is None and self._parent_class.tenant_id:
+            # Pull tenant_id from parent namespace cache.
+            tenant_id = self._parent_class.tenant_id
+        elif not tenant_id:
+            # No value for tenant_id.
+            raise TypeError("tenant_id is required but not set or cached.")
+        if max_workers is None:
+            max_workers = self.max_workers
+        if trackers is None:
+            trackers = [tracker for tracker, (_, obj_type) in STATE_TRACKERS.items()
+                        if tracker in graph.state or graph.by_type.get(obj_type)]
+
+        summary = {"changed": {}, "removed": {}}
+        tasks = []
+        new_states = {}
+        for tracker in trackers:
+            obj_type = STATE_TRACKERS[tracker][1]
+            new_state = self._state_query(graph, tracker, strict, tenant_id)
+            if new_state is None:
+                continue
+            old_state = graph.state.get(tracker, {})
+            new_states[tracker] = new_state
+
+            changed = [object_id for object_id, fingerprint in new_state.items()
+                       if old_state.get(object_id) != fingerprint]
+            removed = [object_id for object_id in old_state if object_id not in new_state]
+            if tracker not in graph.state:
+                # no baseline, objects in the graph that the controller no longer reports are gone too.
+                removed.extend(object_id for object_id in graph.by_type.get(obj_type, {})
+                               if object_id not in new_state)
+
+            for object_id in removed:
+                graph.remove_tree(object_id)
+            summary["removed"][obj_type] = removed
+            summary["changed"][obj_type] = changed
+            tasks.extend((obj_type, object_id) for object_id in changed)
+
+        api_logger.debug("REFRESH: %s objects to re-fetch", len(tasks))
+
+        site_ids = set(graph.by_type["sites"]) | set(new_states.get("sites", {}))
+        failed = set()
+        for task, results, exception in map_concurrent(lambda item: self._refetch(item[0], item[1], site_ids,
+                                                                                  tenant_id),
+                                                        tasks, max_workers=max_workers):
+            if exception is not None:
+                raise exception
+            for obj_type, parent_id, resp in results:
+                if not resp.cgx_status:
+                    if parent_id is None and resp.status_code == 404:
+                        # deleted after the state query.
+                        graph.remove_tree(task[1])
+                        continue
+                    self._items(graph, "{0} of {1}".format(obj_type, parent_id or task[1]), resp, strict)
+                    failed.add(task)
+                    continue
+
+                if parent_id is None:
+                    obj = resp.cgx_content
+                    obj_parent_id = obj.get('site_id') if obj_type == "elements" else None
+                    graph.add(obj_type, obj, parent_id=obj_parent_id if obj_parent_id in site_ids else None)
+                else:
+                    # replace this type of children wholesale.
+                    for child in graph.children(parent_id, obj_type=obj_type):
+                        graph.remove_tree(child.get('id'))
+                    for child in resp.cgx_content.get('items', []):
+                        graph.add(obj_type, child, parent_id=parent_id)
+
+        for tracker, new_state in new_states.items():
+            obj_type = STATE_TRACKERS[tracker][1]
+            for failed_type, object_id in failed:
+                if failed_type == obj_type:
+                    # forget the fingerprint, so the object is retried next time.
+                    new_state.pop(object_id, None)
+            graph.state[tracker] = new_state
+
+        return summary
+
+    def _refetch(self, obj_type, object_id, site_ids, tenant_id):
+        """
+        Re-fetch one changed object and its per-object children.
+
+        **Returns:** List of (object type, parent ID for children or None for the object itself, response) tuples.
+        """
+        get = self._parent_class.get
+        if obj_type == "sites":
+            return [
+                ("sites", None, get.sites(object_id, tenant_id=tenant_id)),
+                ("waninterfaces", object_id, get.waninterfaces(object_id, tenant_id=tenant_id)),
+                ("lannetworks", object_id, get.lannetworks(object_id, tenant_id=tenant_id)),
+            ]
+        if obj_type == "elements":
+            resp = get.elements(object_id, tenant_id=tenant_id)
+            results = [("elements", None, resp)]
+            site_id = resp.cgx_content.get('site_id') if resp.cgx_status else None
+            if site_id in site_ids:
+                results.append(("interfaces", object_id, get.interfaces(site_id, object_id, tenant_id=tenant_id)))
+            return results
+        return [(obj_type, None, getattr(get, obj_type)(object_id, tenant_id=tenant_id))]
+
+    def _state_query(self, graph, tracker, strict, tenant_id):
+        """
+        Run a bulk config/state query.
+
+        **Returns:** Dict of object ID to fingerprint, or None on (non-strict) failure.
+        """
+        query_name, obj_type = STATE_TRACKERS[tracker]
+        resp = getattr(self._parent_class.post, query_name)({}, tenant_id=tenant_id)
+        if not resp.cgx_status or resp.cgx_content.get('items') is None:
+            self._items(graph, "{0} config/state".format(tracker), resp, strict)
+            return None
+        state = {}
+        for entry in resp.cgx_content.get('items', []):
+            if not isinstance(entry, dict):
+                continue
+            object_id = entry.get('id')
+            if object_id is None:
+                object_id = entry.get(obj_type[:-1] + '_id')
+            if object_id is not None:
+                state[object_id] = _fingerprint(entry)
+        return state
+
+    def _crawl_children(self, graph, obj_type, parents, fetch, max_workers, strict):
+        """
+        Fetch child objects for each parent concurrently, adding them to the graph as results arrive.
+        A parent is either an ID, or a tuple ending in the ID.
+        """
+        for parent, resp, exception in map_concurrent(fetch, parents, max_workers=max_workers):
+            parent_id = parent[-1] if isinstance(parent, tuple) else parent
+            if exception is not None:
+                raise exception
+            for child in self._items(graph, "{0} of {1}".format(obj_type, parent_id), resp, strict):
+                graph.add(obj_type, child, parent_id=parent_id)
+
+    def _items(self, graph, description, resp, strict):
+        """
+        Items from a list response, handling failures per `strict`.
+        """
+        items = resp.cgx_content.get('items') if resp.cgx_status else None
+        if items is not None:
+            return items
+        if strict:
+            self._parent_class.throw_error("Unable to retrieve {0}.".format(description), resp)
+        api_logger.warning("Unable to retrieve %s: %s", description, resp.cgx_errors)
+        graph.errors.append((description, resp))
+        return []
+
+    @staticmethod
+    def _query_items(description, resp):
+        """
+        Items from a tenant-wide query response, or None if the per-parent fallback should be used.
+        """
+        items = resp.cgx_content.get('items') if resp.cgx_status else None
+        if items is None:
+            api_logger.debug("%s query failed, using per-parent requests: %s", description, resp.cgx_errors)
+            return None
+        total_count = resp.cgx_content.get('total_count')
+        if isinstance(total_count, int) and total_count > len(items):
+            api_logger.debug("%s query returned %s of %s, using per-parent requests", description, len(items),
+                             total_count)
+            return None
+        return items
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""
+CloudGenix Python SDK - Lookup index functions
+
+**Author:** CloudGenix
+
+**Copyright:** (c) 2017-2021 CloudGenix, Inc
+
+**License:** MIT
+"""
+import bisect
+import logging
+
+__author__ = "CloudGenix Developer Support <developers@cloudgenix.com>"
+__email__ = "developers@cloudgenix.com"
+__copyright__ = "Copyright (c) 2017-2021 CloudGenix, Inc"
+__license__ = """
+    MIT License
+
+    Copyright (c) 2017-2021 CloudGenix, Inc
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+# Set logging to function name
+api_logger = logging.getLogger(__name__)
+"""`logging.getlogger` object to enable debug printing via `cloudgenix.API.set_debug`"""
+
+
+class LookupIndex(object):
+    """
+    Reusable multi-key lookup index over a list of API objects (dicts).
+
+    Builds forward (key -> value) and reverse (value -> object) maps for any number of key fields in one pass.
+    Keys seen on more than one object are tracked as duplicates and, like `cloudgenix.API.build_lookup_dict`, are
+    not returned by `LookupIndex.lookup`. The index is updated incrementally by `LookupIndex.add` and
+    `LookupIndex.remove`.
+    """
+
+    def __init__(self, items=None, key_fields=('name',), value_field='id', case_insensitive=False):
+        """
+        Create a lookup index.
+
+          - **items:** Optional: Iterable of dicts to index.
+          - **key_fields:** Optional: Iterable of fields to index objects by. Default `('name',)`.
+          - **value_field:** Optional: Field holding each object's unique value. Default `id`.
+          - **case_insensitive:** Optional: Bool, match keys without regard to case. Default False.
+        """
+        self.key_fields = tuple(key_fields)
+        self.value_field = value_field
+        self.case_insensitive = case_insensitive
+
+        self._objects = {}
+        self._forward = dict((field, {}) for field in self.key_fields)
+        self._display_keys = dict((field, {}) for field in self.key_fields)
+        self._sorted_keys = dict((field, None) for field in self.key_fields)
+
+        if items is not None:
+            self.update(items)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, value):
+        return value in self._objects
+
+    def _normalize(self, key):
+        key = str(key)
+        return key.lower() if self.case_insensitive else key
+
+    def add(self, item):
+        """
+        Add (or replace) an object in the index.
+
+          - **item:** Object dict. Ignored if it has no `value_field`.
+
+        **Returns:** No return.
+        """
+        value = item.get(self.value_field)
+        if value is None:
+            return
+        if value in self._objects:
+            self.remove(value)
+        self._objects[value] = item
+
+        for field in self.key_fields:
+            key = item.get(field)
+            if not key:
+                continue
+            normalized = self._normalize(key)
+            values = self._forward[field].get(normalized)
+            if values is None:
+                self._forward[field][normalized] = {value}
+                self._display_keys[field][normalized] = str(key)
+                self._sorted_keys[field] = None
+            else:
+                values.add(value)
+
+    def update(self, items):
+        """
+        Add (or replace) multiple objects in the index.
+
+          - **items:** Iterable of object dicts.
+
+        **Returns:** No return.
+        """
+        for item in items:
+            self.add(item)
+
+    def remove(self, value):
+        """
+        Remove an object from the index.
+
+          - **value:** The object's `value_field` value, or the object dict itself.
+
+        **Returns:** Removed object dict, or None if not present.
+        """
+        if isinstance(value, dict):
+            value = value.get(self.value_field)
+        item = self._objects.pop(value, None)
+        if item is None:
+            return None
+
+        for field in self.key_fields:
+            key = item.get(field)
+            if not key:
+                continue
+            normalized = self._normalize(key)
+            values = self._forward[field].get(normalized)
+            if values is None:
+                continue
+            values.discard(value)
+            if not values:
+                del self._forward[field][normalized]
+                del self._display_keys[field][normalized]
+                self._sorted_keys[field] = None
+        return item
+
+    def lookup(self, key, field=None, default=None):
+        """
+        Look up the value for a unique key.
+
+          - **key:** Key to look up.
+          - **field:** Optional: Key field to use. Default: the first of `key_fields`.
+          - **default:** Optional: Returned if the key is missing or a duplicate.
+
+        **Returns:** Value, or `default`.
+        """
+        values = self._forward[field or self.key_fields[0]].get(self._normalize(key))
+        if values is None or len(values) != 1:
+            return default
+        return next(iter(values))
+
+    def lookup_all(self, key, field=None):
+        """
+        Look up all values for a key, including duplicates.
+
+          - **key:** Key to look up.
+          - **field:** Optional: Key field to use. Default: the first of `key_fields`.
+
+        **Returns:** Set of values (empty if not found).
+        """
+        return set(self._forward[field or self.key_fields[0]].get(self._normalize(key), ()))
+
+    def prefix(self, prefix, field=None):
+        """
+        Find keys starting with a prefix.
+
+          - **prefix:** Key prefix.
+          - **field:** Optional: Key field to use. Default: the first of `key_fields`.
+
+        **Returns:** List of (key, set of values) tuples, sorted by key.
+        """
+        field = field or self.key_fields[0]
+        sorted_keys = self._sorted_keys[field]
+        if sorted_keys is None:
+            sorted_keys = self._sorted_keys[field] = sorted(self._forward[field])
+
+        normalized = self._normalize(prefix)
+        results = []
+        for position in range(bisect.bisect_left(sorted_keys, normalized), len(sorted_keys)):
+            key = sorted_keys[position]
+            if not key.startswith(normalized):
+                break
+            results.append((self._display_keys[field][key], set(self._forward[field][key])))
+        return results
+
+    def reverse(self, value, field=None):
+        """
+        Reverse lookup, value to object or key.
+
+          - **value:** The object's `value_field` value.
+          - **field:** Optional: If set, return this field of the object instead of the object.
+
+        **Returns:** Object dict (or field value), or None if not present.
+        """
+        item = self._objects.get(value)
+        if item is None or field is None:
+            return item
+        return item.get(field)
+
+    def duplicates(self, field=None):
+        """
+        Keys that map to more than one object.
+
+          - **field:** Optional: Key field to use. Default: the first of `key_fields`.
+
+        **Returns:** Dict of key to set of values.
+        """
+        field = field or self.key_fields[0]
+        return dict((self._display_keys[field][key], set(values))
+                    for key, values in self._forward[field].items() if len(values) > 1)
+
+    def as_dict(self, field=None):
+        """
+        Plain lookup dict of unique keys, equivalent to `cloudgenix.API.build_lookup_dict` output.
+
+          - **field:** Optional: Key field to use. Default: the first of `key_fields`.
+
+        **Returns:** Dict of key to value.
+        """
+        field = field or self.key_fields[0]
+        return dict((self._display_keys[field][key], next(iter(values)))
+                    for key, values in self._forward[field].items() if len(values) == 1)
@@ -0,0 +1,1106 @@
+#!/usr/bin/env python
+"""
+CloudGenix Python SDK - Monitor helper functions
+
+**Author:** CloudGenix
+
+**Copyright:** (c) 2017-2021 CloudGenix, Inc
+
+**License:** MIT
+"""
+import calendar
+import codecs
+import copy
+import csv
+import datetime
+import gzip
+import heapq
+import io
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from .concurrency import map_concurrent, run_concurrent, DEFAULT_MAX_WORKERS
+
+__author__ = "CloudGenix Developer Support <developers@cloudgenix.com>"
+__email__ = "developers@cloudgenix.com"
+__copyright__ = "Copyright (c) 2017-2021 CloudGenix, Inc"
+__license__ = """
+    MIT License
+
+    Copyright (c) 2017-2021 CloudGenix, Inc
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+# Set logging to function name
+api_logger = logging.getLogger(__name__)
+"""`logging.getlogger` object to enable debug printing via `cloudgenix.API.set_debug`"""
+
+# python 2 and 3 handling
+if sys.version_info >= (3, ):
+    text_type = str
+    binary_type = bytes
+else:
+    text_type = unicode
+    binary_type = str
+
+INTERVAL_SECONDS = {
+    "1min": 60,
+    "5min": 300,
+    "10min": 600,
+    "15min": 900,
+    "30min": 1800,
+    "1hour": 3600,
+    "6hour": 21600,
+    "12hour": 43200,
+    "1day": 86400,
+}
+"""Monitor API interval strings, mapped to their length in seconds."""
+
+DEFAULT_MAX_POINTS = 10000
+"""Default maximum datapoints to request from a Monitor API in one call. Larger queries are split."""
+
+MONITOR_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
+"""strftime format used for Monitor API `start_time`/`end_time` values."""
+
+
+def parse_monitor_time(value):
+    """
+    Convert a Monitor API timestamp to UTC epoch seconds.
+
+    **Parameters:**
+
+      - **value:** ISO 8601 UTC string (ex. `2021-05-07T10:00:00.000Z`), `datetime.datetime`, or epoch int/float.
+
+    **Returns:** Integer UTC epoch seconds.
+    """
+    if isinstance(value, datetime.datetime):
+        return int(calendar.timegm(value.utctimetuple()))
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (text_type, binary_type)):
+        text = value.decode('ascii') if isinstance(value, binary_type) else value
+        # strip fractional seconds and zone designator, everything from the controller is UTC.
+        text = text.strip().rstrip('Z').split('+')[0].split('.')[0]
+        return int(calendar.timegm(time.strptime(text, "%Y-%m-%dT%H:%M:%S")))
+    raise ValueError("Unable to parse Monitor API time value: {0}".format(value))
+
+
+def format_monitor_time(epoch):
+    """
+    Convert UTC epoch seconds to a Monitor API timestamp string.
+
+    **Parameters:**
+
+      - **epoch:** UTC epoch seconds.
+
+    **Returns:** text_type timestamp (ex. `2021-05-07T10:00:00.000Z`).
+    """
+    return text_type(time.strftime(MONITOR_TIME_FORMAT, time.gmtime(epoch)))
+
+
+def _point_time(datapoint):
+    """
+    Epoch time of a Monitor API datapoint, or None if it has no parseable time.
+    """
+    try:
+        return parse_monitor_time(datapoint.get('time'))
+    except (ValueError, AttributeError):
+        return None
+
+
+def _canonical(obj):
+    """
+    Stable text representation of a JSON-style object, used for cache keys and series identity.
+    """
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'))
+
+
+_SERIES_IDENTITY_KEYS = ('name', 'unit', 'view')
+"""Descriptive fields that identify a series/data entry across split sub-responses."""
+
+
+_NO_IDENTITY = _canonical({})
+"""Identity of a list entry with no descriptive or scalar fields."""
+
+
+def _identity(item):
+    """
+    Identity of a response list entry when merging.
+
+    Series/data entries are keyed on their descriptive fields (`_SERIES_IDENTITY_KEYS`) only, so per-range scalars
+    (ex. totals, counts) don't split one series in two. Other entries (ex. datapoints) use all of their non-list
+    values.
+    """
+    descriptive = dict((k, item[k]) for k in _SERIES_IDENTITY_KEYS if k in item)
+    if descriptive:
+        return _canonical(descriptive)
+    return _canonical(dict((k, v) for k, v in item.items() if not isinstance(v, list)))
+
+
+def merge_content(base, extra):
+    """
+    Merge two Monitor API response bodies for the same query over different (adjacent) time ranges.
+
+    Dicts are merged key by key. Lists of dicts are merged by identity (matching entries are merged recursively,
+    new entries are appended), so series/data entries line up and their datapoints are concatenated in order.
+    Series are matched on name/unit/view only, see `_identity`. Lists of dicts with no identity at all (ex. the
+    per-metric entries of a multi-metric `metrics` list) are merged by position.
+    Other lists are unioned, and scalar values from `base` are kept.
+
+    **Parameters:**
+
+      - **base:** Earlier response content.
+      - **extra:** Later response content.
+
+    **Returns:** Merged content.
+    """
+    if isinstance(base, dict) and isinstance(extra, dict):
+        merged = dict(base)
+        for key, value in extra.items():
+            merged[key] = merge_content(base[key], value) if key in base else value
+        return merged
+
+    if isinstance(base, list) and isinstance(extra, list):
+        if all(isinstance(item, dict) for item in base + extra):
+            if all(_identity(item) == _NO_IDENTITY for item in base + extra):
+                merged = [merge_content(base_item, extra_item) for base_item, extra_item in zip(base, extra)]
+                return merged + list(base[len(extra):]) + list(extra[len(base):])
+            merged = list(base)
+            positions = dict((_identity(item), position) for position, item in enumerate(merged))
+            for item in extra:
+                item_id = _identity(item)
+                if item_id in positions:
+                    merged[positions[item_id]] = merge_content(merged[positions[item_id]], item)
+                else:
+                    positions[item_id] = len(merged)
+                    merged.append(item)
+            return merged
+        return list(base) + [item for item in extra if item not in base]
+
+    return base
+
+
+class MetricsCache(object):
+    """
+    Time-bucketed cache for `cloudgenix.post_api.Post.monitor_metrics` data.
+
+    Entries are keyed by (tenant, object, metric, interval) and stored in fixed-width time buckets. Only complete
+    buckets (fetched in full, and older than `mutable_seconds`) are served from cache. Memory use is bounded by
+    datapoint count (LRU eviction), and the optional on-disk store is bounded by total bytes (oldest evicted first).
+
+    One cache can be shared by multiple `cloudgenix.API` objects, as the tenant is part of the key.
+    """
+
+    def __init__(self, bucket_seconds=3600, mutable_seconds=600, max_memory_points=1000000, cache_dir=None,
+                 max_disk_bytes=268435456):
+        """
+        Create a metrics cache.
+
+          - **bucket_seconds:** Width of a cache bucket in seconds. Rounded up to a multiple of the query interval.
+          - **mutable_seconds:** Buckets ending less than this many seconds ago are always re-fetched.
+          - **max_memory_points:** Maximum number of datapoints held in memory before LRU eviction.
+          - **cache_dir:** Optional directory to persist complete buckets to. None disables the disk store.
+          - **max_disk_bytes:** Maximum size of the disk store in bytes.
+        """
+        self.bucket_seconds = int(bucket_seconds)
+        self.mutable_seconds = int(mutable_seconds)
+        self.max_memory_points = int(max_memory_points)
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = int(max_disk_bytes)
+
+        self._lock = threading.RLock()
+        self._memory = OrderedDict()
+        self._memory_points = 0
+        self._disk_files = OrderedDict()
+        self._disk_bytes = 0
+
+        if self.cache_dir:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir)
+            # index existing files, oldest first, so eviction order survives restarts.
+            existing = []
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith('.json'):
+                    path = os.path.join(self.cache_dir, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    existing.append((stat.st_mtime, path, stat.st_size))
+            for _, path, size in sorted(existing):
+                self._disk_files[path] = size
+                self._disk_bytes += size
+            self._enforce_disk_bound()
+
+    @staticmethod
+    def make_key(tenant_id, object_key, metric, interval):
+        """
+        Build a cache key.
+
+          - **tenant_id:** Tenant ID
+          - **object_key:** Canonical text of the query filter/view the metric applies to.
+          - **metric:** Metric entry dict (or name) from the `metrics` list of the query.
+          - **interval:** Monitor API interval string.
+
+        **Returns:** Tuple cache key.
+        """
+        if isinstance(metric, dict):
+            metric = _canonical(metric)
+        return text_type(tenant_id), text_type(object_key), text_type(metric), text_type(interval)
+
+    def bucket_width(self, interval):
+        """
+        Bucket width (seconds) used for a given interval.
+
+          - **interval:** Monitor API interval string.
+
+        **Returns:** Integer seconds.
+        """
+        interval_seconds = INTERVAL_SECONDS.get(interval, 60)
+        if self.bucket_seconds <= interval_seconds:
+            return interval_seconds
+        # round up to a whole number of intervals so datapoints never straddle buckets.
+        return -(-self.bucket_seconds // interval_seconds) * interval_seconds
+
+    def get(self, key, bucket_start):
+        """
+        Get a complete bucket from cache.
+
+          - **key:** Cache key from `MetricsCache.make_key`
+          - **bucket_start:** Bucket start, UTC epoch seconds.
+
+        **Returns:** List of series dicts for the bucket, or None if not cached.
+        """
+        mem_key = (key, bucket_start)
+        with self._lock:
+            entry = self._memory.get(mem_key)
+            if entry is not None:
+                self._memory.pop(mem_key)
+                self._memory[mem_key] = entry
+                return entry[0]
+
+        if not self.cache_dir:
+            return None
+
+        path = self._disk_path(key, bucket_start)
+        try:
+            with open(path, 'r') as disk_file:
+                series = json.load(disk_file)
+        except (IOError, OSError, ValueError):
+            return None
+        self._store_memory(mem_key, series)
+        return series
+
+    def put(self, key, bucket_start, series):
+        """
+        Store a complete bucket.
+
+          - **key:** Cache key from `MetricsCache.make_key`
+          - **bucket_start:** Bucket start, UTC epoch seconds.
+          - **series:** List of series dicts, with datapoints limited to the bucket.
+
+        **Returns:** No return.
+        """
+        self._store_memory((key, bucket_start), series)
+
+        if not self.cache_dir:
+            return
+
+        path = self._disk_path(key, bucket_start)
+        payload = _canonical(series)
+        try:
+            with open(path, 'w') as disk_file:
+                disk_file.write(payload)
+        except (IOError, OSError) as e:
+            api_logger.debug("Unable to write metrics cache file %s: %s", path, e)
+            return
+
+        with self._lock:
+            old_size = self._disk_files.pop(path, 0)
+            self._disk_files[path] = len(payload)
+            self._disk_bytes += len(payload) - old_size
+            self._enforce_disk_bound()
+
+    def clear(self):
+        """
+        Remove all entries from memory and disk.
+
+        **Returns:** No return.
+        """
+        with self._lock:
+            self._memory.clear()
+            self._memory_points = 0
+            for path in list(self._disk_files):
+                self._remove_disk_file(path)
+
+    def _store_memory(self, mem_key, series):
+        points = sum(len(data.get('datapoints', [])) for entry in series for data in entry.get('data', []))
+        with self._lock:
+            old = self._memory.pop(mem_key, None)
+            if old is not None:
+                self._memory_points -= old[1]
+            self._memory[mem_key] = (series, points)
+            self._memory_points += points
+            while self._memory_points > self.max_memory_points and len(self._memory) > 1:
+                _, (_, evicted_points) = self._memory.popitem(last=False)
+                self._memory_points -= evicted_points
+
+    def _disk_path(self, key, bucket_start):
+        digest = hashlib.sha1(_canonical([list(key), bucket_start]).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest + '.json')
+
+    def _enforce_disk_bound(self):
+        while self._disk_bytes > self.max_disk_bytes and self._disk_files:
+            path = next(iter(self._disk_files))
+            self._remove_disk_file(path)
+
+    def _remove_disk_file(self, path):
+        self._disk_bytes -= self._disk_files.pop(path, 0)
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+class JSONItemStream(object):
+    """
+    Incremental decoder for one JSON array inside a (possibly very large) JSON document.
+
+    The document is read chunk by chunk, and the array at `path` is yielded one item at a time, so memory use is
+    bounded by the largest single item instead of the whole document. Values outside `path` are skipped.
+    """
+
+    def __init__(self, chunks, path):
+        """
+        Create a streaming decoder.
+
+          - **chunks:** Iterable of bytes or text chunks (ex. `requests.Response.iter_content()`).
+          - **path:** List/tuple of object keys leading to the array to stream (ex. `('flows', 'items')`).
+        """
+        self.path = list(path)
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._exhausted = False
+
+    def __iter__(self):
+        """
+        Iterate the items of the array at `path`. Yields nothing if `path` is not present.
+        """
+        for key in self.path:
+            self._expect('{')
+            while True:
+                char = self._peek()
+                if char == '}' or char is None:
+                    return
+                current_key = self._value()
+                self._expect(':')
+                if current_key == key:
+                    break
+                # not on our path, skip the value.
+                self._value()
+                if self._peek() == ',':
+                    self._pos += 1
+
+        self._expect('[')
+        while True:
+            char = self._peek()
+            if char == ']' or char is None:
+                return
+            yield self._value()
+            if self._peek() == ',':
+                self._pos += 1
+
+    def _fill(self):
+        """
+        Read the next chunk into the buffer, discarding consumed text. Returns False at end of input.
+        """
+        if self._exhausted:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._exhausted = True
+            text = self._text_decoder.decode(b'', final=True)
+        elif isinstance(chunk, binary_type):
+            text = self._text_decoder.decode(chunk)
+        else:
+            text = chunk
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return not self._exhausted or bool(text)
+
+    def _peek(self):
+        """
+        Skip whitespace and return the next character without consuming it, or None at end of input.
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return None
+
+    def _expect(self, char):
+        found = self._peek()
+        if found != char:
+            raise ValueError("Expected '{0}' in JSON stream, found '{1}'.".format(char, found))
+        self._pos += 1
+
+    def _value(self):
+        """
+        Decode one complete JSON value at the current position, reading more input as needed.
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+            if end >= len(self._buffer) and not self._exhausted:
+                # a number or literal at the end of the buffer may continue in the next chunk.
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+
+def _open_chunk(path, compress):
+    """
+    Open a chunk file for text writing, optionally gzip compressed.
+    """
+    if sys.version_info >= (3, ):
+        if compress:
+            return gzip.open(path, 'wt', newline='')
+        return io.open(path, 'w', newline='')
+    # Python 2.x csv/json write native strings.
+    if compress:
+        return gzip.open(path, 'wb')
+    return open(path, 'wb')
+
+
+class Monitor(object):
+    """
+    CloudGenix API - Monitor helper functions
+
+    Object to help with higher level Monitor API operations, built on `cloudgenix.post_api.Post` monitor calls.
+    """
+
+    # placeholder for parent class namespace
+    _parent_class = None
+
+    # placeholder for the default metrics cache, created on first use.
+    _metrics_cache = None
+
+    # placeholder for per-scope TopN partial results, created on first use.
+    _topn_partials = None
+
+    max_points = DEFAULT_MAX_POINTS
+    """Maximum datapoints to request in one Monitor API call before splitting."""
+
+    max_workers = DEFAULT_MAX_WORKERS
+    """Maximum concurrent sub-requests for split queries."""
+
+    topn_cache_size = 1024
+    """Maximum per-scope TopN results kept by `Monitor.topn` (least recently used are evicted)."""
+
+    def metrics_cache(self, **kwargs):
+        """
+        Get (or re-create) the default `MetricsCache` used by `Monitor.metrics`.
+
+          **Parameters:**:
+
+          - **&ast;&ast;kwargs**: Optional: If present, replace the default cache with `MetricsCache(**kwargs)`.
+
+        **Returns:** `cloudgenix.monitor.MetricsCache` object.
+        """
+        if kwargs or self._metrics_cache is None:
+            self._metrics_cache = MetricsCache(**kwargs)
+        return self._metrics_cache
+
+    def estimate_points(self, data, object_count=None):
+        """
+        Estimate the number of datapoints a Monitor API query will return.
+
+          **Parameters:**:
+
+          - **data**: Dictionary containing the Monitor query (`start_time`, `end_time`, `interval`, ...)
+          - **object_count**: Optional: Number of objects (series) the query covers. Default: the length of the
+                              largest list in the query `filter`, or 1.
+
+        **Returns:** Integer estimated datapoint count.
+        """
+        start = parse_monitor_time(data['start_time'])
+        end = parse_monitor_time(data['end_time'])
+        interval_seconds = INTERVAL_SECONDS.get(data.get('interval'), 60)
+        if object_count is None:
+            object_count = self._object_count(data)
+        metric_count = max(1, len(data.get('metrics') or []))
+        intervals = max(1, -(-(end - start) // interval_seconds))
+        return intervals * object_count * metric_count
+
+    def split_query(self, call, data, max_points=None, auto_interval=False, object_count=None, max_workers=None,
+                    **kwargs):
+        """
+        Run a Monitor API query, keeping each request under `max_points` datapoints.
+
+        If the estimated size is too large and `auto_interval` is set, the smallest coarser interval that fits is
+        used. Otherwise the time range is split into interval-aligned sub-ranges that are requested concurrently
+        and merged with `merge_content`.
+
+          **Parameters:**:
+
+          - **call**: Monitor API function to call, ex. `sdk.post.monitor_aggregates`.
+          - **data**: Dictionary containing the Monitor query.
+          - **max_points**: Optional: Maximum datapoints per request. Default `Monitor.max_points`.
+          - **auto_interval**: Optional: Bool, allow a coarser interval instead of splitting. Default False.
+          - **object_count**: Optional: Number of objects the query covers, see `Monitor.estimate_points`.
+          - **max_workers**: Optional: Maximum concurrent sub-requests. Default `Monitor.max_workers`.
+          - **&ast;&ast;kwargs**: Optional: Additional Keyword Arguments to pass to `call` (ex. `tenant_id`).
+
+        **Returns:** requests.Response object extended with cgx_status and cgx_content properties. On any failed
+                     sub-request, the first failed response is returned instead.
+        """
+        if max_points is None:
+            max_points = self.max_points
+        if max_workers is None:
+            max_workers = self.max_workers
+        if object_count is None:
+            object_count = self._object_count(data)
+
+        estimate = self.estimate_points(data, object_count=object_count)
+        if estimate <= max_points:
+            return call(data, **kwargs)
+
+        interval = data.get('interval')
+        interval_seconds = INTERVAL_SECONDS.get(interval, 60)
+
+        if auto_interval:
+            for legal_interval, legal_seconds in sorted(INTERVAL_SECONDS.items(), key=lambda item: item[1]):
+                if legal_seconds <= interval_seconds:
+                    continue
+                query = dict(data)
+                query['interval'] = legal_interval
+                if self.estimate_points(query, object_count=object_count) <= max_points:
+                    api_logger.debug("SPLIT_QUERY: %s points at %s, using interval %s", estimate, interval,
+                                     legal_interval)
+                    return call(query, **kwargs)
+
+        start = parse_monitor_time(data['start_time'])
+        end = parse_monitor_time(data['end_time'])
+        points_per_interval = estimate // max(1, -(-(end - start) // interval_seconds))
+        chunk_seconds = max(1, max_points // max(1, points_per_interval)) * interval_seconds
+
+        ranges = []
+        range_start = start
+        while range_start < end:
+            ranges.append((range_start, min(range_start + chunk_seconds, end)))
+            range_start += chunk_seconds
+        api_logger.debug("SPLIT_QUERY: %s points, splitting into %s requests", estimate, len(ranges))
+
+        def range_call(time_range):
+            query = dict(data)
+            query['start_time'] = format_monitor_time(time_range[0])
+            query['end_time'] = format_monitor_time(time_range[1])
+            return call(query, **kwargs)
+
+        responses = run_concurrent(range_call, ranges, max_workers=max_workers)
+        content = {}
+        for resp in responses:
+            if not resp.cgx_status:
+                return resp
+            content = merge_content(content, resp.cgx_content)
+        return self._parent_class._build_cgx_response(content)
+
+    def aggregates(self, data, max_points=None, auto_interval=False, object_count=None, tenant_id=None,
+                   api_version="v3.0"):
+        """
+        `cloudgenix.post_api.Post.monitor_aggregates` with automatic interval selection and range splitting.
+        See `Monitor.split_query`.
+
+          **Parameters:**:
+
+          - **data**: Dictionary containing the `monitor_aggregates` query.
+          - **max_points**: Optional: Maximum datapoints per request. Default `Monitor.max_points`.
+          - **auto_interval**: Optional: Bool, allow a coarser interval instead of splitting. Default False.
+          - **object_count**: Optional: Number of objects the query covers, see `Monitor.estimate_points`.
+          - **tenant_id**: Tenant ID
+          - **api_version**: API version to use (default v3.0)
+
+        **Returns:** requests.Response object extended with cgx_status and cgx_content properties.
+        """
+        return self.split_query(self._parent_class.post.monitor_aggregates, data, max_points=max_points,
+                                auto_interval=auto_interval, object_count=object_count, tenant_id=tenant_id,
+                                api_version=api_version)
+
+    def metrics(self, data, cache=None, tenant_id=None, api_version="v2.2"):
+        """
+        Cached `cloudgenix.post_api.Post.monitor_metrics`. Only time buckets not already in cache, or still
+        mutable (recent), are requested from the controller. Results are spliced back together for the
+        requested window. Requests over `Monitor.max_points` are split, see `Monitor.split_query`.
+
+          **Parameters:**:
+
+          - **data**: Dictionary containing the `monitor_metrics` query (`start_time`, `end_time`, `interval`,
+                      `metrics`, and any `filter`/`view`).
+          - **cache**: Optional `MetricsCache` to use. Default: the cache from `Monitor.metrics_cache`. If False,
+                       bypass caching and only split the request as needed.
+          - **tenant_id**: Tenant ID
+          - **api_version**: API version to use (default v2.2)
+
+        **Returns:** requests.Response object extended with cgx_status and cgx_content properties. `cgx_content`
+                     has one `metrics` entry per requested metric. On any failed sub-request, that failed
+                     response is returned instead.
+        """
+        if tenant_id is None and self._parent_class.tenant_id:
+            # Pull tenant_id from parent namespace cache.
+            tenant_id = self._parent_class.tenant_id
+        elif not tenant_id:
+            # No value for tenant_id.
+            raise TypeError("tenant_id is required but not set or cached.")
+        if cache is False:
+            return self._fetch_metrics(data, tenant_id, api_version)
+        if cache is None:
+            cache = self.metrics_cache()
+
+        start = parse_monitor_time(data['start_time'])
+        end = parse_monitor_time(data['end_time'])
+        interval = data.get('interval', '1min')
+        width = cache.bucket_width(interval)
+        mutable_after = time.time() - cache.mutable_seconds
+
+        object_key = _canonical(dict((k, v) for k, v in data.items()
+                                     if k not in ('start_time', 'end_time', 'interval', 'metrics')))
+        object_key += "@" + api_version
+
+        metrics = data.get('metrics', [])
+        keys = []
+        metric_buckets = []
+        metric_missing = []
+        for metric in metrics:
+            key = cache.make_key(tenant_id, object_key, metric, interval)
+
+            buckets = OrderedDict()
+            missing = set()
+            bucket_start = start - (start % width)
+            while bucket_start < end:
+                cached = None
+                if bucket_start + width <= mutable_after:
+                    cached = cache.get(key, bucket_start)
+                if cached is None:
+                    missing.add(bucket_start)
+                buckets[bucket_start] = cached
+                bucket_start += width
+
+            api_logger.debug("METRICS_CACHE %s: %s buckets, %s to fetch", metric, len(buckets), len(missing))
+            keys.append(key)
+            metric_buckets.append(buckets)
+            metric_missing.append(missing)
+
+        # one request per missing range, for every metric missing any bucket in it.
+        all_missing = sorted(set().union(*metric_missing)) if metric_missing else []
+        for range_start, range_end in self._coalesce(all_missing, width):
+            range_buckets = range(range_start, range_end, width)
+            indexes = [index for index, missing in enumerate(metric_missing)
+                       if any(bucket_start in missing for bucket_start in range_buckets)]
+
+            # complete buckets are fetched in full so they can be cached. Never ask past the requested end
+            # for still-mutable buckets, as they will not be cached anyway.
+            fetch_end = range_end if range_end <= mutable_after else min(range_end, end)
+            query = copy.deepcopy(data)
+            query['start_time'] = format_monitor_time(range_start)
+            query['end_time'] = format_monitor_time(fetch_end)
+            query['metrics'] = [metrics[index] for index in indexes]
+            resp = self._fetch_metrics(query, tenant_id, api_version)
+            if not resp.cgx_status:
+                return resp
+
+            per_metric = self._split_metrics(resp.cgx_content, query['metrics'])
+            for index, metric_content in zip(indexes, per_metric):
+                fetched = self._split_series(metric_content, range_start, range_end, width)
+                for fetched_start in range_buckets:
+                    series = fetched.get(fetched_start, [])
+                    metric_buckets[index][fetched_start] = series
+                    complete = fetched_start + width <= fetch_end and fetched_start + width <= mutable_after
+                    if complete:
+                        cache.put(keys[index], fetched_start, series)
+
+        merged_metrics = [{"series": self._splice(buckets.values(), start, end)} for buckets in metric_buckets]
+        return self._parent_class._build_cgx_response({"metrics": merged_metrics})
+
+    def _fetch_metrics(self, query, tenant_id, api_version):
+        """
+        Fetch one uncached range from the controller, splitting as needed. The interval is never changed, as
+        cached buckets depend on it.
+        """
+        return self.split_query(self._parent_class.post.monitor_metrics, query, tenant_id=tenant_id,
+                                api_version=api_version)
+
+    @staticmethod
+    def _object_count(data):
+        """
+        Default object count for a query: the longest list in its `filter`, or 1.
+        """
+        query_filter = data.get('filter') or {}
+        lengths = [len(value) for value in query_filter.values() if isinstance(value, list)]
+        return max(lengths + [1])
+
+    @staticmethod
+    def _coalesce(bucket_starts, width):
+        """
+        Merge a sorted list of bucket starts into contiguous (start, end) ranges.
+        """
+        ranges = []
+        for bucket_start in bucket_starts:
+            if ranges and ranges[-1][1] == bucket_start:
+                ranges[-1][1] = bucket_start + width
+            else:
+                ranges.append([bucket_start, bucket_start + width])
+        return [(range_start, range_end) for range_start, range_end in ranges]
+
+    @staticmethod
+    def _split_metrics(content, metrics):
+        """
+        Split a multi-metric `monitor_metrics` response into one response body per requested metric.
+
+        Series are matched to metrics by name. Split sub-responses are merged into one `metrics` entry by
+        `merge_content`, so position is only used for series without a matching name.
+        """
+        entries = content.get('metrics', [])
+        names = [metric.get('name') if isinstance(metric, dict) else metric for metric in metrics]
+        per_metric = [[] for _ in metrics]
+        for position, metric_entry in enumerate(entries):
+            for series in metric_entry.get('series', []):
+                name = series.get('name')
+                if name in names:
+                    per_metric[names.index(name)].append(series)
+                elif len(entries) == len(metrics):
+                    per_metric[position].append(series)
+                elif len(metrics) == 1:
+                    per_metric[0].append(series)
+        return [{"metrics": [{"series": series_list}]} for series_list in per_metric]
+
+    @staticmethod
+    def _split_series(content, range_start, range_end, width):
+        """
+        Split a `monitor_metrics` response into per-bucket series lists.
+        """
+        buckets = {}
+        for metric_entry in content.get('metrics', []):
+            for series in metric_entry.get('series', []):
+                for data_entry in series.get('data', []):
+                    per_bucket = {}
+                    for datapoint in data_entry.get('datapoints', []):
+                        point_time = _point_time(datapoint)
+                        if point_time is None or not range_start <= point_time < range_end:
+                            continue
+                        per_bucket.setdefault(point_time - (point_time - range_start) % width, []).append(datapoint)
+
+                    for bucket_start in range(range_start, range_end, width):
+                        bucket_series = buckets.setdefault(bucket_start, [])
+                        new_series = dict((k, v) for k, v in series.items() if k != 'data')
+                        new_data = dict((k, v) for k, v in data_entry.items() if k != 'datapoints')
+                        new_data['datapoints'] = per_bucket.get(bucket_start, [])
+                        new_series['data'] = [new_data]
+                        bucket_series.append(new_series)
+        return buckets
+
+    @staticmethod
+    def _splice(bucket_series_lists, start, end):
+        """
+        Join per-bucket series lists back into one series list, limited to [start, end).
+        """
+        series_map = OrderedDict()
+        for bucket_series in bucket_series_lists:
+            for series in bucket_series or []:
+                series_id = _canonical(dict((k, v) for k, v in series.items() if k != 'data'))
+                merged_series = series_map.get(series_id)
+                if merged_series is None:
+                    merged_series = dict((k, v) for k, v in series.items() if k != 'data')
+                    merged_series['data'] = OrderedDict()
+                    series_map[series_id] = merged_series
+                for data_entry in series.get('data', []):
+                    data_id = _canonical(dict((k, v) for k, v in data_entry.items() if k != 'datapoints'))
+                    merged_data = merged_series['data'].get(data_id)
+                    if merged_data is None:
+                        merged_data = dict((k, v) for k, v in data_entry.items() if k != 'datapoints')
+                        merged_data['datapoints'] = []
+                        merged_series['data'][data_id] = merged_data
+                    merged_data['datapoints'].extend(
+                        datapoint for datapoint in data_entry.get('datapoints', [])
+                        if start <= (_point_time(datapoint) or 0) < end)
+
+        result = []
+        for merged_series in series_map.values():
+            merged_series['data'] = list(merged_series['data'].values())
+            result.append(merged_series)
+        return result
+
+    def export_flows(self, data, out_dir, file_format="ndjson", compress=True, records_per_chunk=50000,
+                     window_seconds=None, on_chunk=None, csv_fields=None, items_path=('flows', 'items'),
+                     file_prefix="flows", tenant_id=None, api_version="v3.6"):
+        """
+        Stream `cloudgenix.post_api.Post.monitor_flows` results to chunked files on disk with bounded memory.
+
+        The response body is decoded incrementally (see `JSONItemStream`), and each flow record is written as it
+        is read. Optionally, the query time range is walked in `window_seconds` windows so no single response is
+        too large for the controller.
+
+        Example top-talkers callback:
+
+            #!python
+            talkers = collections.Counter()
+            def top_talkers(records, chunk_path):
+                for flow in records:
+                    talkers[flow.get('source_ip')] += flow.get('bytes_c2s', 0) + flow.get('bytes_s2c', 0)
+            sdk.monitor.export_flows(query, "/tmp/flows", on_chunk=top_talkers)
+            print(talkers.most_common(10))
+
+          **Parameters:**:
+
+          - **data**: Dictionary containing the `monitor_flows` query.
+          - **out_dir**: Directory to write chunk files to. Created if needed.
+          - **file_format**: Optional: `ndjson` (default) or `csv`.
+          - **compress**: Optional: Bool, gzip compress chunk files. Default True.
+          - **records_per_chunk**: Optional: Maximum flow records per chunk file. Default 50000.
+          - **window_seconds**: Optional: If set, request the time range in windows of this many seconds.
+          - **on_chunk**: Optional: Callable `on_chunk(records, chunk_path)` run as each chunk file is completed.
+                          When set, a chunk of records is held in memory for the callback.
+          - **csv_fields**: Optional: List of CSV columns. Default: sorted keys of the first record. Nested values
+                            are written as JSON text.
+          - **items_path**: Optional: Keys leading to the flow record list in the response.
+                            Default `('flows', 'items')`.
+          - **file_prefix**: Optional: Chunk file name prefix. Default `flows`.
+          - **tenant_id**: Tenant ID
+          - **api_version**: API version to use (default v3.6)
+
+        **Returns:** Dict with `records` (int), `chunks` (list of chunk file paths) and `windows` (int) counts.
+        """
+        if tenant_id is None and self._parent_class.tenant_id:
+            # Pull tenant_id from parent namespace cache.
+            tenant_id = self._parent_class.tenant_id
+        elif not tenant_id:
+            # No value for tenant_id.
+            raise TypeError("tenant_id is required but not set or cached.")
+        if file_format not in ("ndjson", "csv"):
+            raise ValueError("file_format must be 'ndjson' or 'csv'.")
+        if not os.path.isdir(out_dir):
+            os.makedirs(out_dir)
+
+        url = str(self._parent_class.controller) + "/{}/api/tenants/{}/monitor/flows".format(api_version,
+                                                                                             tenant_id)
+        api_logger.debug("URL = %s", url)
+
+        if window_seconds:
+            start = parse_monitor_time(data['start_time'])
+            end = parse_monitor_time(data['end_time'])
+            windows = []
+            window_start = start
+            while window_start < end:
+                window_end = min(window_start + int(window_seconds), end)
+                query = dict(data)
+                query['start_time'] = format_monitor_time(window_start)
+                query['end_time'] = format_monitor_time(window_end)
+                windows.append(query)
+                window_start = window_end
+        else:
+            windows = [data]
+
+        extension = "." + file_format + (".gz" if compress else "")
+        summary = {"records": 0, "chunks": [], "windows": len(windows)}
+        state = {"file": None, "writer": None, "path": None, "count": 0, "records": []}
+
+        def close_chunk():
+            if state["file"] is None:
+                return
+            state["file"].close()
+            if on_chunk is not None:
+                on_chunk(state["records"], state["path"])
+            state.update({"file": None, "writer": None, "path": None, "count": 0, "records": []})
+
+        def write_record(record):
+            if state["file"] is None:
+                state["path"] = os.path.join(out_dir, "{0}-{1:05d}{2}".format(file_prefix, len(summary["chunks"]),
+                                                                              extension))
+                state["file"] = _open_chunk(state["path"], compress)
+                summary["chunks"].append(state["path"])
+                if file_format == "csv":
+                    fields = csv_fields if csv_fields else sorted(record.keys())
+                    state["writer"] = csv.DictWriter(state["file"], fieldnames=fields, extrasaction='ignore')
+                    state["writer"].writeheader()
+
+            if file_format == "csv":
+                state["writer"].writerow(dict((key, json.dumps(value) if isinstance(value, (dict, list)) else value)
+                                              for key, value in record.items()))
+            else:
+                state["file"].write(json.dumps(record) + "\n")
+
+            if on_chunk is not None:
+                state["records"].append(record)
+            state["count"] += 1
+            summary["records"] += 1
+            if state["count"] >= records_per_chunk:
+                close_chunk()
+
+        try:
+            for query in windows:
+                resp = self._parent_class.rest_call(url, "post", data=query, stream_content=True)
+                if not resp.cgx_status:
+                    self._parent_class.throw_error("Unable to export flows for {0} - {1}."
+                                                   "".format(query.get('start_time'), query.get('end_time')), resp)
+                try:
+                    for record in JSONItemStream(resp.iter_content(chunk_size=65536), items_path):
+                        write_record(record)
+                finally:
+                    resp.close()
+        finally:
+            close_chunk()
+
+        api_logger.debug("EXPORT_FLOWS: %s records in %s chunks", summary["records"], len(summary["chunks"]))
+        return summary
+
+    def topn(self, data, scopes, limit=50, score=None, items_path=('items',), sys_metrics=False, max_age=300,
+             refresh=None, max_workers=None, tenant_id=None, api_version=None):
+        """
+        Fleet-wide TopN. Runs a `cloudgenix.post_api.Post.monitor_topn` (or `monitor_sys_metrics_topn`) query
+        concurrently across multiple scopes, and merges the per-scope results into a global TopN with a bounded heap.
+
+        Per-scope results are cached for `max_age` seconds, so a refresh only re-queries scopes that are stale or
+        explicitly listed in `refresh`. Results are keyed on the scope filter and the query without its
+        `start_time`/`end_time`, so a sliding window reuses them until `max_age`. At most `Monitor.topn_cache_size`
+        results are kept.
+
+          **Parameters:**:
+
+          - **data**: Dictionary containing the TopN query.
+          - **scopes**: Dict of scope name to a dict merged into the query `filter` for that scope.
+                        (ex. `{"west": {"site": [...]}, "east": {"site": [...]}}`)
+          - **limit**: Optional: Number of global results to return. Default 50.
+          - **score**: Optional: Callable returning the numeric rank value for an item. Default: the item `value`
+                       key for dicts, otherwise the item, as a number (0 if not numeric).
+          - **items_path**: Optional: Keys leading to the result item list in each response. Default `('items',)`.
+          - **sys_metrics**: Optional: Bool, use `monitor_sys_metrics_topn` instead of `monitor_topn`.
+          - **max_age**: Optional: Seconds a cached per-scope result may be reused. 0 disables reuse. Default 300.
+          - **refresh**: Optional: List of scope names to always re-query.
+          - **max_workers**: Optional: Maximum concurrent scope queries. Default `Monitor.max_workers`.
+          - **tenant_id**: Tenant ID
+          - **api_version**: Optional: API version to use (default is the underlying function default)
+
+        **Returns:** requests.Response object extended with cgx_status and cgx_content properties. `cgx_content`
+                     `items` is a list of `{"scope", "score", "item"}` dicts, highest score first. Failed scopes
+                     are reported in `cgx_warnings`, and their last cached result (if any) is used.
+        """
+        if tenant_id is None and self._parent_class.tenant_id:
+            # Pull tenant_id from parent namespace cache.
+            tenant_id = self._parent_class.tenant_id
+        elif not tenant_id:
+            # No value for tenant_id.
+            raise TypeError("tenant_id is required but not set or cached.")
+        if max_workers is None:
+            max_workers = self.max_workers
+        if score is None:
+            score = self._default_score
+        if self._topn_partials is None:
+            self._topn_partials = OrderedDict()
+        refresh = set(refresh or [])
+
+        call = self._parent_class.post.monitor_sys_metrics_topn if sys_metrics else self._parent_class.post.monitor_topn
+        call_kwargs = {"tenant_id": tenant_id}
+        if api_version is not None:
+            call_kwargs["api_version"] = api_version
+        query_key = _canonical([tenant_id, sys_metrics, api_version,
+                                dict((k, v) for k, v in data.items() if k not in ('start_time', 'end_time'))])
+        partial_keys = dict((scope_name, (query_key, scope_name, _canonical(scope_filter)))
+                            for scope_name, scope_filter in scopes.items())
+
+        now = time.time()
+        stale = []
+        for scope_name in scopes:
+            cached = self._topn_partials.get(partial_keys[scope_name])
+            if scope_name in refresh or cached is None or now - cached[0] > max_age:
+                stale.append(scope_name)
+        api_logger.debug("TOPN: %s scopes, %s to query", len(scopes), len(stale))
+
+        def scope_call(scope_name):
+            query = copy.deepcopy(data)
+            query_filter = query.get('filter') or {}
+            query_filter.update(scopes[scope_name])
+            query['filter'] = query_filter
+            return call(query, **call_kwargs)
+
+        warnings = []
+        for scope_name, resp, exception in map_concurrent(scope_call, stale, max_workers=max_workers):
+            if exception is None and resp.cgx_status:
+                items = resp.cgx_content
+                for key in items_path:
+                    items = items.get(key) if isinstance(items, dict) else None
+                self._topn_partials.pop(partial_keys[scope_name], None)
+                self._topn_partials[partial_keys[scope_name]] = (time.time(), items or [])
+            else:
+                error_text = text_type(exception) if exception is not None else resp.cgx_errors
+                warnings.append({"code": "TOPN_SCOPE_FAILED",
+                                 "message": "TopN for scope '{0}' failed: {1}".format(scope_name, error_text)})
+
+        partials = {}
+        for scope_name in scopes:
+            cached = self._topn_partials.pop(partial_keys[scope_name], None)
+            if cached is not None:
+                # mark most recently used.
+                self._topn_partials[partial_keys[scope_name]] = cached
+                partials[scope_name] = cached[1]
+        while len(self._topn_partials) > self.topn_cache_size:
+            self._topn_partials.popitem(last=False)
+
+        def scored_items():
+            for scope_name in scopes:
+                for item in partials.get(scope_name, []):
+                    yield {"scope": scope_name, "score": score(item), "item": item}
+
+        content = {"items": heapq.nlargest(limit, scored_items(), key=lambda entry: entry["score"])}
+        if warnings:
+            content["_warning"] = warnings
+        return self._parent_class._build_cgx_response(content)
+
+    @staticmethod
+    def _default_score(item):
+        """
+        Default TopN rank value: the item's `value` key for dicts, otherwise the item, as a number. Values that are
+        not numeric rank as 0.
+        """
+        if isinstance(item, dict):
+            item = item.get('value')
+        if isinstance(item, bool):
+            return 0
+        if isinstance(item, (int, float)):
+            return item
+        try:
+            return float(item)
+        except (TypeError, ValueError):
+            return 0
@@ -0,0 +1,351 @@
+#!/usr/bin/env python
+"""
+CloudGenix Python SDK - Compact record types
+
+**Author:** CloudGenix
+
+**Copyright:** (c) 2017-2021 CloudGenix, Inc
+
+**License:** MIT
+"""
+import keyword
+import logging
+import re
+import sys
+
+__author__ = "CloudGenix Developer Support <developers@cloudgenix.com>"
+__email__ = "developers@cloudgenix.com"
+__copyright__ = "Copyright (c) 2017-2021 CloudGenix, Inc"
+__license__ = """
+    MIT License
+
+    Copyright (c) 2017-2021 CloudGenix, Inc
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+# Set logging to function name
+api_logger = logging.getLogger(__name__)
+"""`logging.getlogger` object to enable debug printing via `cloudgenix.API.set_debug`"""
+
+
+# python 2 and 3 handling. Only native strings can be interned (bytes on python 2).
+if sys.version_info < (3,):
+    from __builtin__ import intern as _intern
+else:
+    _intern = sys.intern
+_native_str = str
+
+_IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+_MISSING = object()
+
+
+def intern_value(value, intern_strings=False):
+    """
+    Recursively intern strings in a JSON value: dict keys always, string values only if `intern_strings` is set.
+
+    Interned strings are kept for the life of the process, so only intern values from a small set (ex. states,
+    types, model names), never unique IDs or timestamps.
+
+    **Parameters:**
+
+      - **value:** Decoded JSON value (dict, list, string, number, bool or None).
+      - **intern_strings:** Optional: Bool, also intern string values (not only keys). Default False.
+
+    **Returns:** Equivalent value, sharing interned strings.
+    """
+    if isinstance(value, _native_str):
+        return _intern(value) if intern_strings else value
+    elif isinstance(value, dict):
+        return dict((_intern(k) if isinstance(k, _native_str) else k, intern_value(v, intern_strings))
+                    for k, v in value.items())
+    elif isinstance(value, list):
+        return [intern_value(v, intern_strings) for v in value]
+    return value
+
+
+class _RecordMeta(type):
+    """
+    Build `__slots__` for each record class from its `_fields`.
+    """
+    def __new__(mcs, name, bases, namespace):
+        fields = tuple(namespace.get('_fields', ()))
+        inherited = set()
+        for base in bases:
+            inherited.update(getattr(base, '_slot_fields', ()))
+        # only identifiers can be slots, anything else is kept in the overflow dict.
+        slot_fields = frozenset(str(f) for f in fields if _IDENTIFIER_RE.match(f) and not keyword.iskeyword(f)
+                                and not f.startswith('__'))
+        namespace['_slot_fields'] = slot_fields | frozenset(inherited)
+        namespace['__slots__'] = tuple(namespace.get('__slots__', ())) + \
+            tuple(str(f) for f in fields if f in slot_fields and f not in inherited)
+        return super(_RecordMeta, mcs).__new__(mcs, name, bases, namespace)
+
+
+# python 2/3 compatible metaclass base.
+_RecordBase = _RecordMeta(str('_RecordBase'), (object,), {'__slots__': ()})
+
+
+class Record(_RecordBase):
+    """
+    Compact, read-only-by-convention record for a single API object.
+
+    Known fields (`_fields`) are stored in `__slots__`, any other keys are kept in an overflow dict, so conversion
+    back with `Record.to_dict` is lossless. Keys absent from the source dict stay absent. Dict keys, and the values of
+    known low-cardinality fields (`_interned_fields`, ex. states, types, model names), are interned, which shares
+    these repeated strings across records.
+
+    Supports dict-style reads: `record['name']`, `record.get('name')`, `in`, `keys()`, `items()`, `values()`, `len()`
+    and iteration over keys. Records are also accepted directly as `data` by SDK PUT/POST calls.
+    """
+    __slots__ = ('_extra',)
+    _fields = ()
+    _slot_fields = frozenset()
+    _interned_fields = frozenset()
+
+    def __init__(self, data=None, intern_strings=True):
+        """
+        Create a record.
+
+          - **data:** Optional: Dict of the API object.
+          - **intern_strings:** Optional: Bool, intern keys and `_interned_fields` values. Default True.
+        """
+        self._extra = None
+        if data:
+            slot_fields = self._slot_fields
+            for key, value in data.items():
+                if intern_strings:
+                    value = intern_value(value, key in self._interned_fields)
+                if key in slot_fields:
+                    setattr(self, key, value)
+                else:
+                    if self._extra is None:
+                        self._extra = {}
+                    self._extra[_intern(key) if intern_strings and isinstance(key, _native_str) else key] = value
+
+    @classmethod
+    def from_dict(cls, data, intern_strings=True):
+        """
+        Create a record from an API object dict.
+
+          - **data:** Dict of the API object.
+          - **intern_strings:** Optional: Bool, intern keys and `_interned_fields` values. Default True.
+
+        **Returns:** Record object.
+        """
+        return cls(data, intern_strings=intern_strings)
+
+    def to_dict(self):
+        """
+        Convert back to a plain dict, suitable for JSON encoding (ex. PUT).
+
+        **Returns:** Dict with the same keys and values as the source object.
+        """
+        result = {}
+        for key in self._fields:
+            if key in self._slot_fields:
+                value = getattr(self, key, _MISSING)
+                if value is not _MISSING:
+                    result[key] = value
+        if self._extra:
+            result.update(self._extra)
+        return result
+
+    def __getitem__(self, key):
+        if key in self._slot_fields:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self):
+        return [key for key in self]
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def __iter__(self):
+        for key in self._fields:
+            if key in self._slot_fields and getattr(self, key, _MISSING) is not _MISSING:
+                yield key
+        if self._extra:
+            for key in self._extra:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(state)
+
+    def __repr__(self):
+        return "{0}({1!r})".format(type(self).__name__, self.to_dict())
+
+
+_COMMON_FIELDS = ('id', '_etag', '_schema', '_created_on_utc', '_updated_on_utc', '_debug', '_info', '_warning',
+                  '_error', 'tenant_id', 'name', 'description', 'tags')
+
+
+class SiteRecord(Record):
+    """
+    Compact record for a site (`cloudgenix.get_api.Get.sites`).
+    """
+    _fields = _COMMON_FIELDS + (
+        'address', 'location', 'element_cluster_role', 'admin_state', 'policy_set_id', 'security_policyset_id',
+        'security_policysetstack_id', 'network_policysetstack_id', 'priority_policysetstack_id',
+        'nat_policysetstack_id', 'service_binding', 'extended_tags', 'multicast_peer_group_id',
+        'perfmgmt_policysetstack_id', 'vrf_context_profile_id')
+    _interned_fields = frozenset(('_schema', 'tenant_id', 'element_cluster_role', 'admin_state'))
+
+
+class ElementRecord(Record):
+    """
+    Compact record for an element (`cloudgenix.get_api.Get.elements`).
+    """
+    _fields = _COMMON_FIELDS + (
+        'site_id', 'serial_number', 'hw_id', 'model_name', 'software_version', 'state', 'role', 'admin_action',
+        'allowed_roles', 'cluster_id', 'cluster_insertion_mode', 'connected', 'deployment_op', 'led_config',
+        'l3_direct_private_wan_forwarding', 'l3_lan_forwarding', 'main_power_usage_threshold',
+        'nat_policysetstack_id', 'network_policysetstack_id', 'priority_policysetstack_id', 'spoke_ha_config',
+        'sw_obj', 'vpn_to_vpn_forwarding', 'fips_mode', 'fips_mode_change_start_time', 'device_profile_id')
+    _interned_fields = frozenset(('_schema', 'tenant_id', 'model_name', 'software_version', 'state', 'role',
+                                  'admin_action', 'allowed_roles', 'cluster_insertion_mode', 'fips_mode'))
+
+
+class InterfaceRecord(Record):
+    """
+    Compact record for an element interface (`cloudgenix.get_api.Get.interfaces`).
+    """
+    _fields = _COMMON_FIELDS + (
+        'type', 'admin_up', 'used_for', 'mtu', 'mac_address', 'parent', 'scope', 'site_wan_interface_ids',
+        'ethernet_port', 'ipv4_config', 'ipv6_config', 'pppoe_config', 'sub_interface', 'bound_interfaces',
+        'bypass_pair', 'nat_address', 'nat_port', 'nat_zone_id', 'nat_pools', 'dhcp_relay', 'service_link_config',
+        'static_arp_configs', 'cellular_config', 'peer_bypasspair_wan_port_type', 'port_channel_config',
+        'lldp_enabled', 'power_usage_threshold', 'network_context_id', 'attached_lan_networks',
+        'directed_broadcast', 'devicemgmt_policysetstack_id', 'interface_profile_id', 'ipfixcollectorcontext_id',
+        'ipfixfiltercontext_id', 'secondary_ip_configs', 'multicast_config', 'poe_enabled', 'switch_port_config',
+        'authentication_config', 'vlan_config', 'vrf_context_id', 'element_id', 'site_id')
+    _interned_fields = frozenset(('_schema', 'tenant_id', 'type', 'used_for', 'scope', 'peer_bypasspair_wan_port_type'))
+
+
+class WANInterfaceRecord(Record):
+    """
+    Compact record for a site WAN interface (`cloudgenix.get_api.Get.waninterfaces`).
+    """
+    _fields = _COMMON_FIELDS + (
+        'type', 'link_bw_down', 'link_bw_up', 'network_id', 'label_id', 'bw_config_mode', 'bwc_enabled', 'cost',
+        'lqm_config', 'lqm_enabled', 'use_for_application_reachability_probes', 'use_for_controller_connections',
+        'use_lqm_for_non_hub_paths', 'vpnlink_configuration', 'l3_reachability', 'site_id')
+    _interned_fields = frozenset(('_schema', 'tenant_id', 'type', 'bw_config_mode'))
+
+
+class EventRecord(Record):
+    """
+    Compact record for an event (`cloudgenix.post_api.Post.events_query`).
+    """
+    _fields = _COMMON_FIELDS + (
+        'code', 'type', 'severity', 'time', 'end_time', 'entity_ref', 'info', 'correlation_id', 'element_id',
+        'site_id', 'cleared', 'priority', 'standing', 'suppressed', 'suppressed_info', 'acknowledged',
+        'acknowledgement_info')
+    _interned_fields = frozenset(('_schema', 'tenant_id', 'code', 'type', 'severity', 'priority'))
+
+
+class VPNLinkRecord(Record):
+    """
+    Compact record for a VPN link (`cloudgenix.post_api.Post.vpnlinks_query`).
+    """
+    _fields = _COMMON_FIELDS + (
+        'type', 'status', 'admin_up', 'active', 'usable', 'link_up', 'anynet_link_id', 'link_path_id',
+        'hub_cluster_id', 'ep1_site_id', 'ep1_element_id', 'ep1_wan_if_id', 'ep1_wan_network_id', 'ep2_site_id',
+        'ep2_element_id', 'ep2_wan_if_id', 'ep2_wan_network_id', 'vpn_config')
+    _interned_fields = frozenset(('_schema', 'tenant_id', 'type', 'status'))
+
+
+RECORD_TYPES = {
+    'sites': SiteRecord,
+    'elements': ElementRecord,
+    'interfaces': InterfaceRecord,
+    'waninterfaces': WANInterfaceRecord,
+    'events': EventRecord,
+    'vpnlinks': VPNLinkRecord,
+}
+"""Record class for each supported resource name."""
+
+
+def record_class(record_type):
+    """
+    Resolve a record class from a class or resource name.
+
+    **Parameters:**
+
+      - **record_type:** `Record` subclass, or a resource name from `RECORD_TYPES` (ex. 'elements').
+
+    **Returns:** `Record` subclass. Raises ValueError if the name is unknown.
+    """
+    if isinstance(record_type, type) and issubclass(record_type, Record):
+        return record_type
+    try:
+        return RECORD_TYPES[record_type]
+    except KeyError:
+        raise ValueError("Unknown record type '{0}', expected one of: {1}".format(
+            record_type, ", ".join(sorted(RECORD_TYPES))))
+
+
+def to_records(items, record_type, intern_strings=True):
+    """
+    Convert a list of API object dicts to records.
+
+    **Parameters:**
+
+      - **items:** Iterable of dicts (ex. from `cloudgenix.API.extract_items`). Empty dicts are skipped.
+      - **record_type:** `Record` subclass, or a resource name from `RECORD_TYPES`.
+      - **intern_strings:** Optional: Bool, intern string values and nested keys. Default True.
+
+    **Returns:** List of records.
+    """
+    cls = record_class(record_type)
+    return [cls(item, intern_strings=intern_strings) for item in items if item]
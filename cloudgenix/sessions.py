@@ -0,0 +1,1016 @@
+#!/usr/bin/env python
+"""
+CloudGenix Python SDK - Session management helpers
+
+**Author:** CloudGenix
+
+**Copyright:** (c) 2017-2021 CloudGenix, Inc
+
+**License:** MIT
+"""
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from requests.adapters import HTTPAdapter
+from requests.cookies import create_cookie
+
+from . import PYTHON36_FEATURES
+from .concurrency import map_concurrent, DEFAULT_MAX_WORKERS
+
+__author__ = "CloudGenix Developer Support <developers@cloudgenix.com>"
+__email__ = "developers@cloudgenix.com"
+__copyright__ = "Copyright (c) 2017-2021 CloudGenix, Inc"
+__license__ = """
+    MIT License
+
+    Copyright (c) 2017-2021 CloudGenix, Inc
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+# Set logging to function name
+api_logger = logging.getLogger(__name__)
+"""`logging.getlogger` object to enable debug printing via `cloudgenix.API.set_debug`"""
+
+SESSION_STATE_VERSION = 1
+"""Format version of saved session state files."""
+
+SESSION_KEY_ENV = "CLOUDGENIX_SESSION_KEY"
+"""Environment variable holding the session state signing key."""
+
+SESSION_KEY_FILE = os.path.join(os.path.expanduser("~"), ".cloudgenix_session.key")
+"""Per-user signing key file, created on first use if no key is given and `SESSION_KEY_ENV` is not set."""
+
+# API object attributes saved with the session state.
+_SESSION_STATE_FIELDS = ('controller', 'controller_orig', 'controller_region', 'ignore_region', 'tenant_id',
+                         'tenant_name', 'is_esp', 'client_id', 'email', 'operator_id', 'roles', 'token_session')
+
+
+class ClientSessionPool(object):
+    """
+    Pool of logged in ESP/MSP client sessions, keyed by client ID.
+
+    Each entry is an independent `cloudgenix.API` object (see `cloudgenix.API.clone`) logged in to one client, so
+    switching back to a recently used client costs no API calls. The least recently used session is evicted when
+    the pool is full, and sessions unused for `idle_timeout` seconds are dropped. Evicted and dropped sessions are
+    logged out of their client (`clients_logout`), so do not keep using an object from `get` after it has left
+    the pool.
+
+    Create via `cloudgenix.API.client_pool`.
+    """
+
+    def __init__(self, api, max_size=16, idle_timeout=900):
+        """
+        Create a client session pool.
+
+          - **api:** Logged in ESP/MSP `cloudgenix.API` object. Not modified by the pool.
+          - **max_size:** Optional: Maximum client sessions to keep. Default 16.
+          - **idle_timeout:** Optional: Seconds an unused session is kept. None keeps until evicted. Default 900.
+        """
+        self.api = api
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._login_locks = {}
+        self._client_maps = None
+
+    def __len__(self):
+        with self._lock:
+            expired = self._expire()
+            count = len(self._sessions)
+        self._logout(expired)
+        return count
+
+    def __contains__(self, client_id):
+        with self._lock:
+            expired = self._expire()
+            found = client_id in self._sessions
+        self._logout(expired)
+        return found
+
+    def _expire(self, now=None):
+        """
+        Drop idle sessions. Must be called with the pool lock held.
+
+        **Returns:** List of dropped (client_id, client_api) tuples, to pass to `ClientSessionPool._logout` once the
+                     lock is released.
+        """
+        dropped = []
+        if self.idle_timeout is None:
+            return dropped
+        if now is None:
+            now = time.time()
+        # OrderedDict is in LRU order, oldest first.
+        while self._sessions:
+            client_id, (client_api, last_used) = next(iter(self._sessions.items()))
+            if now - last_used < self.idle_timeout:
+                break
+            api_logger.debug("CLIENT_POOL: expiring idle session for %s", client_id)
+            del self._sessions[client_id]
+            self._prune_login_lock(client_id)
+            dropped.append((client_id, client_api))
+        return dropped
+
+    def _prune_login_lock(self, client_id):
+        """
+        Forget the login lock of a client no longer pooled, unless a login is in progress. Must be called with the
+        pool lock held.
+        """
+        login_lock = self._login_locks.get(client_id)
+        if login_lock is not None and not login_lock.locked():
+            del self._login_locks[client_id]
+
+    @staticmethod
+    def _logout(dropped):
+        """
+        Log dropped client sessions out of their client, so they don't linger server-side. Must be called without
+        the pool lock held. Failures are logged and ignored.
+        """
+        for client_id, client_api in dropped:
+            api_logger.debug("CLIENT_POOL: logging out session for %s", client_id)
+            client_api.interactive._client_session_logout()
+
+    def resolve(self, client):
+        """
+        Resolve a Client Canonical Name, Client Name, or Client ID (matched in this order) to a Client ID.
+
+          - **client:** Client Canonical Name, Client Name, or Client ID.
+
+        **Returns:** Client ID, or None if this session has no access to the client.
+        """
+        for refresh in (False, True):
+            if self._client_maps is None or refresh:
+                session_status, client_n2id, client_canonical_n2id, client_id2r = \
+                    self.api.interactive.session_allowed_clients()
+                if not session_status:
+                    self.api.throw_error("ESP/MSP detail retrieval failed. Current session may not be an ESP/MSP.")
+                self._client_maps = (client_n2id, client_canonical_n2id, client_id2r)
+            client_n2id, client_canonical_n2id, client_id2r = self._client_maps
+            client_id = client_canonical_n2id.get(client, client_n2id.get(client))
+            if client_id is None and client in client_id2r:
+                client_id = client
+            if client_id is not None:
+                return client_id
+        return None
+
+    def get(self, client):
+        """
+        Get a logged in `cloudgenix.API` object for a client, logging in only if not already pooled.
+
+          - **client:** Client Canonical Name, Client Name, or Client ID.
+
+        **Returns:** `cloudgenix.API` object logged in to the client. Raises `cloudgenix.CloudGenixAPIError` if the
+                     client is not found or login fails.
+        """
+        with self._lock:
+            expired = self._expire()
+            entry = self._sessions.get(client)
+            if entry is not None:
+                self._sessions[client] = (entry[0], time.time())
+                self._move_to_end(client)
+        self._logout(expired)
+        if entry is not None:
+            return entry[0]
+
+        client_id = self.resolve(client)
+        if client_id is None:
+            self.api.throw_error("ESP/MSP client '{0}' not found in clients allowed for this session.".format(client))
+
+        with self._lock:
+            login_lock = self._login_locks.setdefault(client_id, threading.Lock())
+
+        # one login per client at a time, other callers wait and reuse it.
+        with login_lock:
+            with self._lock:
+                expired = self._expire()
+                entry = self._sessions.get(client_id)
+                if entry is not None:
+                    self._sessions[client_id] = (entry[0], time.time())
+                    self._move_to_end(client_id)
+            self._logout(expired)
+            if entry is not None:
+                return entry[0]
+
+            client_api = self.api.clone()
+            clogin_resp, c_profile, t_profile = client_api.interactive._client_session_login(client_id)
+            if not (clogin_resp.cgx_status and c_profile and t_profile):
+                self.api.throw_error("ESP Client Login failed for client '{0}'.".format(client_id), clogin_resp)
+            client_api.client_id = client_id
+
+            evicted = []
+            with self._lock:
+                self._sessions[client_id] = (client_api, time.time())
+                self._move_to_end(client_id)
+                while self.max_size is not None and len(self._sessions) > self.max_size:
+                    evicted_id, (evicted_api, _) = self._sessions.popitem(last=False)
+                    api_logger.debug("CLIENT_POOL: evicted least recently used session for %s", evicted_id)
+                    self._prune_login_lock(evicted_id)
+                    evicted.append((evicted_id, evicted_api))
+        self._logout(evicted)
+        return client_api
+
+    def _move_to_end(self, client_id):
+        """
+        Mark a session most recently used. Must be called with the pool lock held.
+        """
+        # python 2.7 OrderedDict has no move_to_end.
+        self._sessions[client_id] = self._sessions.pop(client_id)
+
+    def invalidate(self, client):
+        """
+        Remove a client session from the pool (ex. after it expired server-side). The session is not logged out,
+        as it is assumed to be no longer valid.
+
+          - **client:** Client ID.
+
+        **Returns:** Bool, True if a session was removed.
+        """
+        with self._lock:
+            removed = self._sessions.pop(client, None) is not None
+            self._prune_login_lock(client)
+            return removed
+
+    def clear(self):
+        """
+        Log out and remove all client sessions, and the cached client list.
+
+        **Returns:** No return.
+        """
+        with self._lock:
+            dropped = [(client_id, entry[0]) for client_id, entry in self._sessions.items()]
+            self._sessions.clear()
+            for client_id, _ in dropped:
+                self._prune_login_lock(client_id)
+            self._client_maps = None
+        self._logout(dropped)
+
+
+def _write_private_file(filename, content):
+    """
+    Atomically write a file readable only by the current user.
+    """
+    temp_name = "{0}.{1}.tmp".format(filename, os.getpid())
+    file_descriptor = os.open(temp_name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(file_descriptor, 'wb') as file_handle:
+        file_handle.write(content)
+    if hasattr(os, 'replace'):
+        os.replace(temp_name, filename)
+    else:
+        # python 2, rename is atomic on POSIX.
+        if os.name == 'nt' and os.path.exists(filename):
+            os.unlink(filename)
+        os.rename(temp_name, filename)
+
+
+def _signing_key(key=None):
+    """
+    Get the session state signing key: `key`, then `SESSION_KEY_ENV`, then `SESSION_KEY_FILE` (created if missing).
+
+    **Returns:** Key bytes.
+    """
+    if key is None:
+        key = os.environ.get(SESSION_KEY_ENV)
+    if key is None:
+        try:
+            with open(SESSION_KEY_FILE, 'rb') as key_file:
+                key = key_file.read().strip()
+        except (IOError, OSError):
+            key = None
+        if not key:
+            key = hashlib.sha256(os.urandom(64)).hexdigest().encode('ascii')
+            _write_private_file(SESSION_KEY_FILE, key)
+    if not isinstance(key, bytes):
+        key = key.encode('utf-8')
+    return key
+
+
+def _sign(payload, key):
+    """
+    HMAC-SHA256 signature of a payload dict, over its canonical JSON encoding.
+    """
+    message = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+
+def save_session_state(api, filename, key=None):
+    """
+    Save the login state of an API object to a signed file, for use by `load_session_state`.
+
+    Saves cookies, the `X-Auth-Token` header, controller/region, tenant and operator info. The file is signed to
+    detect tampering (HMAC-SHA256), not encrypted - it is written readable only by the current user.
+
+    **Parameters:**
+
+      - **api:** Logged in `cloudgenix.API` object.
+      - **filename:** File to write.
+      - **key:** Optional: Signing key (str or bytes). Default: env `CLOUDGENIX_SESSION_KEY`, or a per-user key file.
+
+    **Returns:** No return.
+    """
+    cookies = []
+    for cookie in api.expose_session().cookies:
+        cookies.append({
+            'name': cookie.name,
+            'value': cookie.value,
+            'domain': cookie.domain,
+            'path': cookie.path,
+            'secure': cookie.secure,
+            'expires': cookie.expires,
+        })
+
+    payload = dict((field, getattr(api, field)) for field in _SESSION_STATE_FIELDS)
+    payload.update({
+        'version': SESSION_STATE_VERSION,
+        'saved_at': time.time(),
+        'cookies': cookies,
+        'x_auth_token': api.expose_session().headers.get('X-Auth-Token'),
+    })
+    state = {
+        'payload': payload,
+        'signature': _sign(payload, _signing_key(key)),
+    }
+    _write_private_file(filename, json.dumps(state, indent=2).encode('utf-8'))
+    api_logger.debug("SESSION_STATE: saved to %s", filename)
+
+
+def load_session_state(api, filename, key=None, max_age=None, on_invalid=None):
+    """
+    Restore login state saved by `save_session_state` into an API object, without any API calls.
+
+    The state is validated lazily: the first API call made afterwards checks it. If that call returns 401
+    (session expired or logged out), the restored login is cleared, and `on_invalid(api)` is called if set. If
+    `on_invalid` returns True (ex. it logged in again), the call is replayed once.
+
+    **Parameters:**
+
+      - **api:** `cloudgenix.API` object to restore into.
+      - **filename:** File to read.
+      - **key:** Optional: Signing key used when saving.
+      - **max_age:** Optional: Reject state saved more than this many seconds ago.
+      - **on_invalid:** Optional: Callable taking the API object, run if the restored session is rejected.
+
+    **Returns:** Bool, True if the state was restored. False if missing, unsigned/tampered, too old, or unreadable.
+    """
+    try:
+        with open(filename, 'rb') as state_file:
+            state = json.loads(state_file.read().decode('utf-8'))
+        payload = state['payload']
+        signature = state['signature']
+    except (IOError, OSError, ValueError, KeyError, TypeError) as e:
+        api_logger.debug("SESSION_STATE: unable to read %s: %s", filename, e)
+        return False
+
+    if not hmac.compare_digest(str(signature), str(_sign(payload, _signing_key(key)))):
+        api_logger.warning("Session state file %s has an invalid signature, ignoring.", filename)
+        return False
+    if payload.get('version') != SESSION_STATE_VERSION:
+        api_logger.debug("SESSION_STATE: unsupported version %s", payload.get('version'))
+        return False
+    if max_age is not None and time.time() - payload.get('saved_at', 0) > max_age:
+        api_logger.debug("SESSION_STATE: %s is older than %s seconds", filename, max_age)
+        return False
+
+    session = api.expose_session()
+    session.cookies.clear()
+    for cookie_dict in payload.get('cookies', []):
+        cookie = create_cookie(cookie_dict['name'], cookie_dict['value'], domain=cookie_dict.get('domain', ''),
+                               path=cookie_dict.get('path', '/'), secure=cookie_dict.get('secure', False),
+                               expires=cookie_dict.get('expires'))
+        if not cookie.is_expired():
+            session.cookies.set_cookie(cookie)
+
+    x_auth_token = payload.get('x_auth_token')
+    if x_auth_token:
+        api.add_headers({'X-Auth-Token': x_auth_token})
+        if PYTHON36_FEATURES:
+            api.websocket_add_headers({'X-Auth-Token': x_auth_token})
+    else:
+        api.remove_header('X-Auth-Token')
+
+    for field in _SESSION_STATE_FIELDS:
+        setattr(api, field, payload.get(field))
+    # for backwards compatible _user_id after promoting operator_id to public.
+    api._user_id = api.operator_id
+
+    api._session_validator = _SessionStateValidator(filename, on_invalid)
+    api_logger.debug("SESSION_STATE: restored from %s", filename)
+    return True
+
+
+class _SessionStateValidator(object):
+    """
+    Checks the first response after `load_session_state`, see `cloudgenix.API.rest_call`.
+    """
+
+    def __init__(self, filename, on_invalid=None):
+        self.filename = filename
+        self.on_invalid = on_invalid
+
+    def __call__(self, api, response):
+        """
+        **Returns:** Bool, True if the request should be replayed.
+        """
+        if getattr(response, 'status_code', None) != 401:
+            return False
+
+        api_logger.warning("Session restored from %s is no longer valid.", self.filename)
+        api.expose_session().cookies.clear()
+        api.remove_header('X-Auth-Token')
+        if PYTHON36_FEATURES:
+            api.websocket_remove_header('X-Auth-Token')
+        for field in ('tenant_id', 'tenant_name', 'is_esp', 'client_id', 'email', 'operator_id', 'roles',
+                      'token_session'):
+            setattr(api, field, None)
+        api._user_id = None
+
+        if self.on_invalid is not None:
+            return bool(self.on_invalid(api))
+        return False
+
+
+class SessionKeeper(object):
+    """
+    Keeps a `cloudgenix.API` login alive, and recovers requests that race a session expiry.
+
+    A background thread sends a keepalive (`get.profile`) when the session has been idle for `keepalive_interval`,
+    and re-authenticates `refresh_margin` seconds before the session expires. A request that still gets a 401
+    triggers one re-authentication (shared by all concurrent requests that failed on the same login), and is then
+    replayed once.
+
+    Create via `cloudgenix.API.keep_session`.
+    """
+
+    def __init__(self, api, reauth, keepalive_interval=300, max_session_age=None, refresh_margin=60):
+        """
+        Create a session keeper. Call `SessionKeeper.start` to start the background thread.
+
+          - **api:** Logged in `cloudgenix.API` object.
+          - **reauth:** Callable taking the `cloudgenix.API` object, logs in again and returns True on success.
+          - **keepalive_interval:** Optional: Idle seconds before a keepalive call. None disables. Default 300.
+          - **max_session_age:** Optional: Seconds a login is valid. Default: from the AUTH_TOKEN cookie expiry.
+          - **refresh_margin:** Optional: Seconds before expiry to re-authenticate. Default 60.
+        """
+        self.api = api
+        self.reauth = reauth
+        self.keepalive_interval = keepalive_interval
+        self.max_session_age = max_session_age
+        self.refresh_margin = refresh_margin
+
+        self.generation = 0
+        """Incremented on each successful re-authentication."""
+        self.last_auth = time.time()
+        self.last_activity = self.last_auth
+        self.reauth_count = 0
+        self.replay_count = 0
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        """
+        Bool, True if the background thread is running.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        Start the background keepalive/re-authentication thread.
+
+        **Returns:** No return.
+        """
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="cloudgenix-session-keeper")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop the background thread. Requests are still recovered on 401 until the keeper is removed from the API
+        object.
+
+          - **timeout:** Optional: Seconds to wait for the thread to exit.
+
+        **Returns:** No return.
+        """
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._thread = None
+
+    def call(self, func, url, method, **kwargs):
+        """
+        Make a REST call, re-authenticating and replaying it once on 401. See `cloudgenix.API.rest_call`.
+
+        **Returns:** Requests.Response object, from the replay if one was made.
+        """
+        if getattr(self._local, 'in_reauth', False):
+            # calls made by reauth itself, don't recurse.
+            return func(url, method, **kwargs)
+
+        generation = self.generation
+        response = func(url, method, **kwargs)
+        # network failures return the bare Response class, with no status_code.
+        status_code = getattr(response, 'status_code', None)
+        if status_code is None:
+            return response
+        self.last_activity = time.time()
+        if status_code != 401:
+            return response
+
+        if not self._recover(generation):
+            return response
+        with self._lock:
+            self.replay_count += 1
+        api_logger.debug("SESSION_KEEPER: replaying %s %s after re-authentication", method.upper(), url)
+        return func(url, method, **kwargs)
+
+    def reauthenticate(self):
+        """
+        Re-authenticate now.
+
+        **Returns:** Bool, True on success.
+        """
+        with self._lock:
+            return self._reauthenticate()
+
+    def _recover(self, generation):
+        """
+        Re-authenticate after a 401, unless another thread already did since `generation` was read.
+        """
+        with self._lock:
+            if self.generation != generation:
+                return True
+            return self._reauthenticate()
+
+    def _reauthenticate(self):
+        """
+        Call reauth. Must be called with the keeper lock held.
+        """
+        self._local.in_reauth = True
+        try:
+            result = bool(self.reauth(self.api))
+        except Exception as e:
+            api_logger.warning("Session re-authentication raised %s", e)
+            result = False
+        finally:
+            self._local.in_reauth = False
+
+        if not result:
+            api_logger.warning("Session re-authentication failed.")
+            return False
+        self.generation += 1
+        self.reauth_count += 1
+        self.last_auth = self.last_activity = time.time()
+        api_logger.debug("SESSION_KEEPER: re-authenticated (generation %s)", self.generation)
+        return True
+
+    def _expiry(self):
+        """
+        **Returns:** Epoch time the current login expires, or None if unknown.
+        """
+        if self.max_session_age is not None:
+            return self.last_auth + self.max_session_age
+        expires = [cookie.expires for cookie in self.api.expose_session().cookies if cookie.expires]
+        return min(expires) if expires else None
+
+    def _next_wakeup(self):
+        """
+        **Returns:** Seconds until the background thread has work to do.
+        """
+        now = time.time()
+        wait_times = []
+        if self.keepalive_interval is not None:
+            wait_times.append(self.last_activity + self.keepalive_interval - now)
+        expiry = self._expiry()
+        if expiry is not None:
+            wait_times.append(expiry - self.refresh_margin - now)
+        if not wait_times:
+            return 60
+        # don't spin if the login can't be refreshed.
+        return max(min(wait_times), 1)
+
+    def _run(self):
+        """
+        Background thread body.
+        """
+        while not self._stop_event.wait(self._next_wakeup()):
+            now = time.time()
+            expiry = self._expiry()
+            try:
+                if expiry is not None and now >= expiry - self.refresh_margin:
+                    generation = self.generation
+                    if not self._recover(generation):
+                        # retry after the next keepalive period, not in a tight loop.
+                        self._stop_event.wait(self.keepalive_interval or 60)
+                elif self.keepalive_interval is not None and \
+                        now - self.last_activity >= self.keepalive_interval:
+                    api_logger.debug("SESSION_KEEPER: sending keepalive")
+                    self.api.get.profile()
+            except Exception as e:
+                api_logger.warning("Session keepalive raised %s", e)
+
+
+class _TokenPoolMember(object):
+    """
+    One authenticated session in a `TokenPool`, with its load and rate-limit state.
+    """
+    __slots__ = ('api', 'label', 'in_flight', 'requests', 'rate_limited', 'cooldown_until')
+
+    def __init__(self, api, label):
+        self.api = api
+        self.label = label
+        self.in_flight = 0
+        self.requests = 0
+        self.rate_limited = 0
+        self.cooldown_until = 0.0
+
+
+class TokenPool(object):
+    """
+    Spread REST calls for one tenant across several logins (static AUTH_TOKENs or operator credentials), so a
+    per-token or per-session controller rate limit does not cap throughput.
+
+    Each request is sent using one member login, picked round-robin or least-loaded (fewest in-flight requests).
+    A member that gets a 429 is skipped until its `Retry-After` has passed, and the request is retried on another
+    member. A member that gets a 401 (revoked or expired token) is evicted, and the request is retried on another
+    member. The API object's own login (`include_self`) is never evicted, its 401s are returned as-is so
+    `cloudgenix.API.keep_session` can re-authenticate. If no members are left, the own login is used.
+
+    The default `cloudgenix.API.modify_rest_retry` settings retry 429 in place (and honor `Retry-After` for any
+    status), which would keep a rate limited request on the same login. The pool therefore mounts its own adapter
+    on every member, with the API object's retry settings minus 429 and with `respect_retry_after_header` off.
+    `TokenPool.close` (called by `cloudgenix.API.remove_token_pool`) puts the API object's adapter back. Calling
+    `cloudgenix.API.modify_rest_retry` while the pool is in use replaces the pool's adapter on the API object.
+
+    Create via `cloudgenix.API.token_pool`.
+    """
+
+    def __init__(self, api, strategy='least_loaded', include_self=True, default_retry_after=1):
+        """
+        Create a token pool.
+
+          - **api:** `cloudgenix.API` object the pool sends requests for.
+          - **strategy:** Optional: `least_loaded` or `round_robin`. Default `least_loaded`.
+          - **include_self:** Optional: Bool, use `api`'s own login as a member. Default True.
+          - **default_retry_after:** Optional: Seconds to skip a rate limited member without `Retry-After`. Default 1.
+        """
+        if strategy not in ('least_loaded', 'round_robin'):
+            raise ValueError("strategy must be one of 'least_loaded' or 'round_robin'.")
+        self.api = api
+        self.strategy = strategy
+        self.default_retry_after = default_retry_after
+
+        self._members = []
+        self._next_index = 0
+        self._added = 0
+        self._lock = threading.Lock()
+
+        self._original_adapter = api.connection_pool()
+        self._adapter = self._member_adapter(self._original_adapter)
+        if include_self:
+            api.expose_session().mount("https://", self._adapter)
+            self._members.append(_TokenPoolMember(api, 'self'))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._members)
+
+    def _add_member(self, member_api, label):
+        """
+        Check a logged in member is for the same controller/tenant as the pool, and add it.
+        """
+        if member_api.controller != self.api.controller or \
+                (self.api.tenant_id is not None and member_api.tenant_id != self.api.tenant_id):
+            api_logger.warning("TOKEN_POOL: %s is for a different controller/tenant (%s/%s), not added.",
+                               label, member_api.controller, member_api.tenant_id)
+            return False
+        with self._lock:
+            self._members.append(_TokenPoolMember(member_api, label))
+        return True
+
+    @staticmethod
+    def _member_adapter(adapter):
+        """
+        **Returns:** `requests.adapters.HTTPAdapter` with the same pool size and retry settings as `adapter`, except
+                     429 is never retried in place, so the pool can move the request to another member.
+        """
+        retry = adapter.max_retries
+        status_forcelist = set(retry.status_forcelist or ()) - set([429])
+        retry = retry.new(status_forcelist=status_forcelist, respect_retry_after_header=False)
+        return HTTPAdapter(pool_connections=getattr(adapter, '_pool_connections', 10),
+                           pool_maxsize=getattr(adapter, '_pool_maxsize', 10), max_retries=retry)
+
+    def _spawn_member(self):
+        """
+        **Returns:** New, not logged in `cloudgenix.API` object using the pool's connection pool.
+        """
+        member_api = self.api.spawn(share_connection_pool=False)
+        member_api.expose_session().mount("https://", self._adapter)
+        member_api.ignore_region = self.api.ignore_region
+        return member_api
+
+    def close(self):
+        """
+        Restore the API object's own adapter (retry settings), if the pool's adapter is still mounted on it.
+
+        **Returns:** No return.
+        """
+        if self.api.connection_pool() is self._adapter:
+            self.api.expose_session().mount("https://", self._original_adapter)
+
+    def add_token(self, token, label=None):
+        """
+        Add a static AUTH_TOKEN to the pool (see `cloudgenix.interactive.Interactive.use_token`).
+
+          - **token:** Static AUTH_TOKEN for the same tenant (and ESP/MSP client, if any) as the pool.
+          - **label:** Optional: Name for this member in `TokenPool.stats`. Default: `token-<n>`.
+
+        **Returns:** Bool, True if the token worked and was added.
+        """
+        self._added += 1
+        label = label or "token-{0}".format(self._added)
+        member_api = self._spawn_member()
+        client_id = self.api.client_id
+        if not member_api.interactive.use_token(token, client_login=bool(client_id), client=client_id):
+            api_logger.warning("TOKEN_POOL: %s could not be used, not added.", label)
+            return False
+        return self._add_member(member_api, label)
+
+    def add_login(self, email, password, label=None):
+        """
+        Add an operator login to the pool (see `cloudgenix.interactive.Interactive.login`).
+
+          - **email:** Operator email.
+          - **password:** Operator password.
+          - **label:** Optional: Name for this member in `TokenPool.stats`. Default: the email.
+
+        **Returns:** Bool, True if the login worked and was added.
+        """
+        label = label or email
+        member_api = self._spawn_member()
+        client_id = self.api.client_id
+        if not member_api.interactive.login(email, password, client_login=bool(client_id), client=client_id):
+            api_logger.warning("TOKEN_POOL: login for %s failed, not added.", label)
+            return False
+        return self._add_member(member_api, label)
+
+    def remove(self, label):
+        """
+        Remove a member from the pool.
+
+          - **label:** Member label.
+
+        **Returns:** Bool, True if a member was removed.
+        """
+        with self._lock:
+            for member in self._members:
+                if member.label == label:
+                    self._members.remove(member)
+                    return True
+        return False
+
+    def stats(self):
+        """
+        Per-member load and rate-limit counters.
+
+        **Returns:** Dict of label to dict with `in_flight`, `requests`, `rate_limited` and `cooldown` (seconds
+                     until the member is used again).
+        """
+        now = time.time()
+        with self._lock:
+            return dict((member.label, {'in_flight': member.in_flight,
+                                        'requests': member.requests,
+                                        'rate_limited': member.rate_limited,
+                                        'cooldown': max(member.cooldown_until - now, 0)})
+                        for member in self._members)
+
+    def _acquire(self, exclude):
+        """
+        Pick a member and mark a request in flight on it.
+
+        **Returns:** `_TokenPoolMember`, or None if no members are left.
+        """
+        while True:
+            with self._lock:
+                candidates = [member for member in self._members if member not in exclude] or \
+                    list(self._members)
+                if not candidates:
+                    return None
+                now = time.time()
+                ready = [member for member in candidates if member.cooldown_until <= now]
+                if ready:
+                    if self.strategy == 'round_robin':
+                        member = ready[self._next_index % len(ready)]
+                        self._next_index += 1
+                    else:
+                        member = min(ready, key=lambda m: (m.in_flight, m.requests))
+                    member.in_flight += 1
+                    member.requests += 1
+                    return member
+                wait = min(member.cooldown_until for member in candidates) - now
+            # every member is rate limited, wait for the first to come back.
+            api_logger.debug("TOKEN_POOL: all members rate limited, waiting %.2fs", wait)
+            time.sleep(max(wait, 0))
+
+    def _retry_after(self, response):
+        """
+        **Returns:** Seconds from a response's `Retry-After` header, or `default_retry_after`.
+        """
+        try:
+            return max(float(response.headers.get('Retry-After')), 0)
+        except (TypeError, ValueError):
+            return self.default_retry_after
+
+    def call(self, url, method, **kwargs):
+        """
+        Make a REST call using a pool member. See `cloudgenix.API.rest_call`.
+
+        **Returns:** Requests.Response object.
+        """
+        tried = []
+        response = None
+        with self._lock:
+            # each member gets up to two tries (the second after its Retry-After).
+            attempts_left = max(2 * len(self._members), 1)
+        while attempts_left > 0:
+            attempts_left -= 1
+            member = self._acquire(tried)
+            if member is None:
+                break
+            try:
+                response = member.api._rest_call(url, method, **kwargs)
+            finally:
+                with self._lock:
+                    member.in_flight -= 1
+
+            # network failures return the bare Response class, with no status_code.
+            status_code = getattr(response, 'status_code', None)
+            if status_code == 429:
+                with self._lock:
+                    member.rate_limited += 1
+                    member.cooldown_until = time.time() + self._retry_after(response)
+                api_logger.debug("TOKEN_POOL: %s rate limited", member.label)
+            elif status_code == 401:
+                if member.api is self.api:
+                    # the API object's own login is never evicted, re-auth is up to the caller (or
+                    # `cloudgenix.API.keep_session`).
+                    return response
+                with self._lock:
+                    if member in self._members:
+                        api_logger.warning("TOKEN_POOL: %s is no longer valid, evicting.", member.label)
+                        self._members.remove(member)
+            else:
+                return response
+            tried.append(member)
+
+        if response is None:
+            # no members left, use the API object's own login.
+            api_logger.debug("TOKEN_POOL: no members left, using own login.")
+            return self.api._rest_call(url, method, **kwargs)
+        return response
+
+
+class RegionRouter(object):
+    """
+    Front end for an ESP/MSP login whose clients are homed in different regions.
+
+    Calls are dispatched by tenant/client to a session on that client's regional controller (logged in on first
+    use, and kept in `cloudgenix.API.client_pool`). Each regional controller gets its own connection pool, so
+    concurrent work in one region does not queue behind, or evict connections to, another.
+
+    Create via `cloudgenix.API.region_router`.
+    """
+
+    def __init__(self, api, pool_size=None):
+        """
+        Create a region router.
+
+          - **api:** Logged in ESP/MSP `cloudgenix.API` object. Used as-is for its own tenant.
+          - **pool_size:** Optional: Connections kept per regional controller. Default: `DEFAULT_MAX_WORKERS`.
+        """
+        self.api = api
+        self.pool_size = pool_size or DEFAULT_MAX_WORKERS
+
+        # the ESP session's own controller keeps its existing connection pool. It is shared (spawn/clone, client
+        # pool), so only adapters created here are closed by `RegionRouter.close`.
+        self._adapters = {api.controller: api.connection_pool()}
+        self._created = []
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def _controller_adapter(self, controller):
+        """
+        **Returns:** `requests.adapters.HTTPAdapter` for a regional controller, created on first use with the
+                     ESP session's retry settings.
+        """
+        with self._lock:
+            adapter = self._adapters.get(controller)
+            if adapter is None:
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size,
+                                      max_retries=self.api.connection_pool().max_retries)
+                self._adapters[controller] = adapter
+                self._created.append(adapter)
+            return adapter
+
+    def session(self, target=None):
+        """
+        Get the `cloudgenix.API` object to use for a tenant or client.
+
+          - **target:** Client Canonical Name, Client Name, or Client ID. None or the ESP's own tenant ID returns
+            the ESP session.
+
+        **Returns:** `cloudgenix.API` object on the target's regional controller. Raises
+                     `cloudgenix.CloudGenixAPIError` if the client is not found or login fails.
+        """
+        if target is None or target == self.api.tenant_id:
+            client_api = self.api
+        else:
+            client_api = self.api.client_pool().get(target)
+
+        adapter = self._controller_adapter(client_api.controller)
+        if client_api.connection_pool() is not adapter:
+            client_api.expose_session().mount("https://", adapter)
+        with self._lock:
+            self._routes[client_api.tenant_id] = client_api.controller_region or client_api.controller
+        return client_api
+
+    __getitem__ = session
+
+    def call(self, target, func, *args, **kwargs):
+        """
+        Call a function with the `cloudgenix.API` object for a tenant or client.
+
+          - **target:** Client Canonical Name, Client Name, or Client ID (see `RegionRouter.session`).
+          - **func:** Callable, called as `func(api_object, *args, **kwargs)`.
+
+        **Returns:** Result of `func`.
+        """
+        return func(self.session(target), *args, **kwargs)
+
+    def map(self, func, targets, max_workers=None):
+        """
+        Run `func(api_object)` for each tenant/client concurrently, across all regions.
+
+          - **func:** Callable taking the target's `cloudgenix.API` object.
+          - **targets:** Iterable of Client Canonical Names, Client Names, or Client IDs.
+          - **max_workers:** Optional: Maximum concurrent calls. Default: `pool_size`.
+
+        **Returns:** Generator of (target, result, exception) tuples, in completion order.
+        """
+        return map_concurrent(lambda target: func(self.session(target)), targets,
+                              max_workers=max_workers or self.pool_size)
+
+    def regions(self):
+        """
+        Regions the router has dispatched to so far.
+
+        **Returns:** Dict of region (or controller URL, if the region is unknown) to list of tenant/client IDs.
+        """
+        regions = {}
+        with self._lock:
+            for tenant_id, region in self._routes.items():
+                regions.setdefault(region, []).append(tenant_id)
+        return regions
+
+    def close(self):
+        """
+        Close the per-region connection pools created by the router. The ESP session's own connection pool is left
+        open.
+
+        **Returns:** No return.
+        """
+        with self._lock:
+            created, self._created = self._created, []
+            self._adapters = {self.api.controller: self.api.connection_pool()}
+        for adapter in created:
+            adapter.close()
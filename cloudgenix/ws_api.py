@@ -110,3 +110,121 @@ class WebSockets(object):
 
         api_logger.debug("URL = %s", url)
         return self._parent_class.websocket_call(url, **kwargs)
+
+    def toolkit_manager(self, max_sessions=20, queue_size=None, connect_timeout=30, idle_timeout=60,
+                        reconnect_attempts=2, reconnect_delay=1, **kwargs):
+        """
+        Create an asyncio manager for running work over many Toolkit Session WebSockets, with a bounded number of
+        open sessions, a backpressured job queue, reconnects and per-session latency/bytes counters.
+
+          **Parameters:**:
+
+          - **max_sessions**: Optional: Maximum open Toolkit WebSockets (and concurrent jobs). Default 20.
+          - **queue_size**: Optional: Maximum queued jobs before `submit` waits. Default 2 x `max_sessions`.
+          - **connect_timeout**: Optional: Seconds to wait for a WebSocket to open. Default 30.
+          - **idle_timeout**: Optional: Seconds an unused session is kept open. Default 60.
+          - **reconnect_attempts**: Optional: Reconnects per job after a failed or dropped connection. Default 2.
+          - **reconnect_delay**: Optional: Seconds before the first reconnect, doubled on each retry. Default 1.
+          - **&ast;&ast;kwargs**: Optional: Additional Keyword Arguments to pass to `toolkit_session()`
+
+        **Returns:** `cloudgenix.ws_toolkit.ToolkitSessionManager` object.
+        """
+        from .ws_toolkit import ToolkitSessionManager
+        return ToolkitSessionManager(self._parent_class, max_sessions=max_sessions, queue_size=queue_size,
+                                     connect_timeout=connect_timeout, idle_timeout=idle_timeout,
+                                     reconnect_attempts=reconnect_attempts, reconnect_delay=reconnect_delay,
+                                     **kwargs)
+
+    def subscribe(self, subscribe_messages=None, queue_size=1000, overflow='block', batch_size=100, batch_wait=0,
+                  backfill=True, backfill_query=None, since=None, **kwargs):
+        """
+        Create a resumable event subscription on the default Tenant WebSocket, consumed as an async iterator of
+        event batches, with automatic reconnect and backfill of missed events via `events_query`.
+
+          **Parameters:**:
+
+          - **subscribe_messages**: Optional: List of messages (dicts are sent as JSON) to send after each connect.
+          - **queue_size**: Optional: Maximum queued events. Default 1000.
+          - **overflow**: Optional: Policy when the queue is full, `block`, `drop_oldest`, `drop_newest` or
+            `error`. Default `block`.
+          - **batch_size**: Optional: Maximum events per batch. Default 100.
+          - **batch_wait**: Optional: Seconds to wait for more events to fill a batch. Default 0.
+          - **backfill**: Optional: Bool, backfill missed events after reconnects. Default True.
+          - **backfill_query**: Optional: Base `events_query` dict (ex. filters).
+          - **since**: Optional: Event time to backfill from on start, to resume an earlier subscription.
+          - **&ast;&ast;kwargs**: Optional: Additional Keyword Arguments to pass to
+            `cloudgenix.ws_events.EventSubscription` (ex. `reconnect_delay`), and then to `default()`.
+
+        **Returns:** `cloudgenix.ws_events.EventSubscription` object.
+        """
+        from .ws_events import EventSubscription
+        return EventSubscription(self._parent_class, subscribe_messages=subscribe_messages, queue_size=queue_size,
+                                 overflow=overflow, batch_size=batch_size, batch_wait=batch_wait,
+                                 backfill=backfill, backfill_query=backfill_query, since=since, **kwargs)
+
+    def sync_toolkit_session(self, element_id, tenant_id=None, timeout=None, **kwargs):
+        """
+        Open a Toolkit Session WebSocket for use from threaded (non-asyncio) code. Runs on a shared background
+        event loop, see `cloudgenix.ws_sync.BackgroundLoop`.
+
+          **Parameters:**:
+
+          - **element_id**: Element ID
+          - **tenant_id**: Tenant ID
+          - **timeout**: Optional: Default seconds to wait for each operation.
+          - **&ast;&ast;kwargs**: Optional: Additional Keyword Arguments to pass to `toolkit_session()`
+
+        **Returns:** `cloudgenix.ws_sync.SyncWebSocket` object, with blocking `send`/`recv` and `_future` variants.
+        """
+        from .ws_sync import SyncWebSocket
+        return SyncWebSocket(lambda: self.toolkit_session(element_id, tenant_id=tenant_id, **kwargs), timeout=timeout)
+
+    def sync_default(self, tenant_id=None, timeout=None, **kwargs):
+        """
+        Open the default Tenant WebSocket for use from threaded (non-asyncio) code. Runs on a shared background
+        event loop, see `cloudgenix.ws_sync.BackgroundLoop`.
+
+          **Parameters:**:
+
+          - **tenant_id**: Tenant ID
+          - **timeout**: Optional: Default seconds to wait for each operation.
+          - **&ast;&ast;kwargs**: Optional: Additional Keyword Arguments to pass to `default()`
+
+        **Returns:** `cloudgenix.ws_sync.SyncWebSocket` object, with blocking `send`/`recv` and `_future` variants.
+        """
+        from .ws_sync import SyncWebSocket
+        return SyncWebSocket(lambda: self.default(tenant_id=tenant_id, **kwargs), timeout=timeout)
+
+    def sync_run_commands(self, element_ids, commands, max_sessions=20, prompt=None, timeout=60, **kwargs):
+        """
+        Run CLI commands on many elements concurrently from threaded (non-asyncio) code.
+        See `cloudgenix.ws_sync.run_commands`.
+
+          **Parameters:**:
+
+          - **element_ids**: Iterable of Element IDs.
+          - **commands**: CLI command string, or list of commands run in order on each element.
+          - **max_sessions**: Optional: Maximum open Toolkit WebSockets. Default 20.
+          - **prompt**: Optional: Regex for the CLI prompt.
+          - **timeout**: Optional: Seconds to wait for each command. Default 60.
+          - **&ast;&ast;kwargs**: Optional: Arguments for `cloudgenix.ws_toolkit.ToolkitSessionManager`.
+
+        **Returns:** Generator of per-element result dicts, in completion order.
+        """
+        from .ws_sync import run_commands
+        return run_commands(self._parent_class, element_ids, commands, max_sessions=max_sessions, prompt=prompt,
+                            timeout=timeout, **kwargs)
+
+    def sync_subscribe(self, **kwargs):
+        """
+        Event subscription on the default Tenant WebSocket for threaded (non-asyncio) code.
+        See `cloudgenix.ws_sync.subscribe`.
+
+          **Parameters:**:
+
+          - **&ast;&ast;kwargs**: Optional: Arguments for `subscribe()`.
+
+        **Returns:** Generator of event batches.
+        """
+        from .ws_sync import subscribe
+        return subscribe(self._parent_class, **kwargs)
@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+"""
+CloudGenix Python SDK - WebSocket event subscription functions
+
+**Author:** CloudGenix
+
+**Copyright:** (c) 2017-2021 CloudGenix, Inc
+
+**License:** MIT
+"""
+import asyncio
+import datetime
+import json
+import logging
+import random
+import time
+from collections import OrderedDict
+
+from websockets.exceptions import ConnectionClosed
+
+from . import CloudGenixAPIError
+
+__author__ = "CloudGenix Developer Support <developers@cloudgenix.com>"
+__email__ = "developers@cloudgenix.com"
+__copyright__ = "Copyright (c) 2017-2021 CloudGenix, Inc"
+__license__ = """
+    MIT License
+
+    Copyright (c) 2017-2021 CloudGenix, Inc
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+# Set logging to function name
+api_logger = logging.getLogger(__name__)
+"""`logging.getlogger` object to enable debug printing via `cloudgenix.API.set_debug`"""
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_newest', 'error')
+"""Queue overflow policies supported by `EventSubscription`."""
+
+
+def _utc_now():
+    """
+    **Returns:** Current UTC time as an ISO 8601 string with milliseconds, the format of event `time` values.
+    """
+    return datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+class CloudGenixOverflowError(CloudGenixAPIError):
+    """
+    Exception raised by an `EventSubscription` with overflow policy `error` when its queue is full.
+    """
+    pass
+
+
+def _default_extract(message):
+    """
+    Get the list of events in a decoded default WebSocket message.
+    """
+    if isinstance(message, list):
+        return message
+    if isinstance(message, dict):
+        items = message.get('items')
+        if isinstance(items, list):
+            return items
+        return [message]
+    return []
+
+
+class EventSubscription(object):
+    """
+    Resumable subscription to events on the tenant default WebSocket (see `cloudgenix.ws_api.WebSockets.default`),
+    consumed as an async iterator of event batches:
+
+        async with sdk.ws.subscribe() as subscription:
+            async for batch in subscription:
+                ...
+
+    The WebSocket is reconnected automatically with exponential backoff. After each connect, events since the newest
+    one seen (or since `since`, or the subscription start) are backfilled through
+    `cloudgenix.post_api.Post.events_query` before live events, and events seen twice are dropped by ID, so
+    consumers see an ordered stream without gaps. Save `EventSubscription.last_event_time` to resume later.
+
+    Events are queued in a bounded queue. When it is full, the overflow policy decides: `block` (default, stop
+    reading the WebSocket until the consumer catches up), `drop_oldest`, `drop_newest`, or `error` (raise
+    `CloudGenixOverflowError` from the iterator). Dropping policies trade gaps for latency.
+    """
+
+    def __init__(self, api, subscribe_messages=None, queue_size=1000, overflow='block', batch_size=100,
+                 batch_wait=0, backfill=True, backfill_query=None, since=None, reconnect_delay=1,
+                 max_reconnect_delay=60, extract=None, id_key='id', time_key='time', dedup_size=10000, **kwargs):
+        """
+        Create an event subscription. Starts on first iteration, or with `EventSubscription.start`.
+
+          - **api:** Logged in `cloudgenix.API` object.
+          - **subscribe_messages:** Optional: List of messages (dicts are sent as JSON) to send after each connect.
+          - **queue_size:** Optional: Maximum queued events. Default 1000.
+          - **overflow:** Optional: Policy when the queue is full, one of `OVERFLOW_POLICIES`. Default `block`.
+          - **batch_size:** Optional: Maximum events per batch. Default 100.
+          - **batch_wait:** Optional: Seconds to wait for more events to fill a batch. Default 0 (lowest latency).
+          - **backfill:** Optional: Bool, backfill missed events via `events_query` after reconnects. Default True.
+          - **backfill_query:** Optional: Base `events_query` dict (ex. filters). Times, sort and paging are set.
+          - **since:** Optional: Event time to backfill from on start, to resume an earlier subscription.
+          - **reconnect_delay:** Optional: Seconds before the first reconnect, doubled on each failure. Default 1.
+          - **max_reconnect_delay:** Optional: Maximum seconds between reconnects. Default 60.
+          - **extract:** Optional: Callable returning the list of events in a decoded WebSocket message.
+          - **id_key:** Optional: Event field with a unique ID, used to drop duplicates. Default `id`.
+          - **time_key:** Optional: Event field with the event time, used for backfill. Default `time`.
+          - **dedup_size:** Optional: Number of recent event IDs remembered for duplicate detection. Default 10000.
+          - **&ast;&ast;kwargs:** Optional: Arguments for `cloudgenix.ws_api.WebSockets.default`.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError("overflow must be one of {0}.".format(", ".join(OVERFLOW_POLICIES)))
+        self.api = api
+        self.subscribe_messages = list(subscribe_messages or [])
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.backfill = backfill
+        self.backfill_query = dict(backfill_query or {})
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.extract = extract or _default_extract
+        self.id_key = id_key
+        self.time_key = time_key
+        self.dedup_size = dedup_size
+        self.websocket_kwargs = kwargs
+
+        self.last_event_time = since
+        """Time of the newest event queued so far. Set to the start time on start if `since` is not given, so events
+        during an outage before the first live event are still backfilled."""
+        self.connected = False
+        self.counters = {'received': 0, 'backfilled': 0, 'duplicates': 0, 'dropped': 0, 'reconnects': 0}
+        """Event and connection counters."""
+
+        self._seen_ids = OrderedDict()
+        self._queue = None
+        self._task = None
+        self._websocket = None
+        self._error = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def __aiter__(self):
+        self.start()
+        return self
+
+    async def __anext__(self):
+        """
+        **Returns:** List of events (1 to `batch_size`), oldest first.
+        """
+        if self._error is not None:
+            raise self._error
+        if self._task is None:
+            raise StopAsyncIteration
+        getter = asyncio.ensure_future(self._queue.get())
+        await asyncio.wait([getter, self._task], return_when=asyncio.FIRST_COMPLETED)
+        if not getter.done():
+            getter.cancel()
+            # subscription task ended, raise its error (if any) or stop.
+            if self._error is not None:
+                raise self._error
+            raise StopAsyncIteration
+        batch = [getter.result()]
+
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def events(self):
+        """
+        Iterate single events instead of batches.
+
+        **Returns:** Async generator of events.
+        """
+        async for batch in self:
+            for event in batch:
+                yield event
+
+    def start(self):
+        """
+        Start the subscription. Must be called from a running event loop.
+
+        **Returns:** No return.
+        """
+        if self._task is None:
+            if self.last_event_time is None:
+                self.last_event_time = _utc_now()
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._task = asyncio.ensure_future(self._run())
+
+    async def close(self):
+        """
+        Stop the subscription and close the WebSocket.
+
+        **Returns:** No return.
+        """
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        websocket, self._websocket = self._websocket, None
+        if websocket is not None:
+            await websocket.close()
+        self.connected = False
+
+    def _is_duplicate(self, event):
+        """
+        Check (and remember) an event ID.
+
+        **Returns:** Bool, True if the event was already seen.
+        """
+        event_id = event.get(self.id_key) if isinstance(event, dict) else None
+        if event_id is None:
+            return False
+        if event_id in self._seen_ids:
+            return True
+        self._seen_ids[event_id] = None
+        while len(self._seen_ids) > self.dedup_size:
+            self._seen_ids.popitem(last=False)
+        return False
+
+    async def _enqueue(self, event, backfilled=False):
+        """
+        Queue an event, applying duplicate detection and the overflow policy.
+        """
+        if self._is_duplicate(event):
+            self.counters['duplicates'] += 1
+            return
+        event_time = event.get(self.time_key) if isinstance(event, dict) else None
+        if event_time is not None and (self.last_event_time is None or event_time > self.last_event_time):
+            self.last_event_time = event_time
+        self.counters['backfilled' if backfilled else 'received'] += 1
+
+        if not self._queue.full():
+            self._queue.put_nowait(event)
+        elif self.overflow == 'block':
+            await self._queue.put(event)
+        elif self.overflow == 'drop_oldest':
+            self._queue.get_nowait()
+            self._queue.put_nowait(event)
+            self.counters['dropped'] += 1
+        elif self.overflow == 'drop_newest':
+            self.counters['dropped'] += 1
+        else:
+            raise CloudGenixOverflowError("Event subscription queue full ({0} events).".format(self.queue_size))
+
+    def _backfill_query(self, start_time):
+        """
+        **Returns:** `events_query` dict for events from `start_time` until now, oldest first.
+        """
+        query = dict(self.backfill_query)
+        query['start_time'] = start_time
+        query['end_time'] = _utc_now()
+        limit = dict(query.get('limit') or {})
+        limit.update({'sort_on': self.time_key, 'sort_order': 'ascending'})
+        limit.setdefault('count', 500)
+        query['limit'] = limit
+        return query
+
+    async def _backfill(self):
+        """
+        Queue events missed since `last_event_time`. Pages are fetched (in an executor thread) one at a time, as
+        the queue accepts them, so memory stays bounded.
+        """
+        if not self.backfill or self.last_event_time is None:
+            return
+        start_time = self.last_event_time
+        loop = asyncio.get_event_loop()
+        pages = self.api.iter_pages(self.api.post.events_query, self._backfill_query(start_time))
+        backfilled = self.counters['backfilled']
+        while True:
+            resp = await loop.run_in_executor(None, next, pages, None)
+            if resp is None:
+                break
+            if not resp.cgx_status:
+                raise CloudGenixAPIError("Event backfill query failed: {0}"
+                                         "".format(self.api.pull_content_error(resp) or resp.status_code))
+            for event in resp.cgx_content.get('items') or []:
+                await self._enqueue(event, backfilled=True)
+        api_logger.debug("EVENT_SUBSCRIPTION: backfilled %s events since %s", self.counters['backfilled'] - backfilled,
+                         start_time)
+
+    async def _run(self):
+        """
+        Connection task body: connect, backfill, read, and reconnect with backoff.
+        """
+        delay = self.reconnect_delay
+        first = True
+        try:
+            while True:
+                try:
+                    self._websocket = await self.api.ws.default(**self.websocket_kwargs)
+                    self.connected = True
+                    if not first:
+                        self.counters['reconnects'] += 1
+                    first = False
+                    for message in self.subscribe_messages:
+                        await self._websocket.send(message if isinstance(message, str) else json.dumps(message))
+                    # live messages are held by the WebSocket until the backfill is queued, keeping order.
+                    await self._backfill()
+                    delay = self.reconnect_delay
+
+                    async for raw_message in self._websocket:
+                        try:
+                            message = json.loads(raw_message)
+                        except (TypeError, ValueError):
+                            api_logger.debug("EVENT_SUBSCRIPTION: ignoring non-JSON message %r", raw_message)
+                            continue
+                        for event in self.extract(message):
+                            await self._enqueue(event)
+                    api_logger.debug("EVENT_SUBSCRIPTION: WebSocket closed by server, reconnecting.")
+                except CloudGenixOverflowError:
+                    raise
+                except (ConnectionClosed, OSError, asyncio.TimeoutError, CloudGenixAPIError) as e:
+                    # backfill failures are retried too, last_event_time is unchanged so no events are skipped.
+                    api_logger.debug("EVENT_SUBSCRIPTION: connection failed (%s), reconnecting in %ss", e, delay)
+                finally:
+                    self.connected = False
+                    websocket, self._websocket = self._websocket, None
+                    if websocket is not None:
+                        await websocket.close()
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                delay = min(delay * 2, self.max_reconnect_delay)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # overflow error, or an unexpected failure. Surfaced by the iterator.
+            self._error = e
@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+"""
+CloudGenix Python SDK - Synchronous WebSocket functions
+
+**Author:** CloudGenix
+
+**Copyright:** (c) 2017-2021 CloudGenix, Inc
+
+**License:** MIT
+"""
+import asyncio
+import atexit
+import logging
+import os
+import threading
+
+from websockets.exceptions import ConnectionClosed
+
+__author__ = "CloudGenix Developer Support <developers@cloudgenix.com>"
+__email__ = "developers@cloudgenix.com"
+__copyright__ = "Copyright (c) 2017-2021 CloudGenix, Inc"
+__license__ = """
+    MIT License
+
+    Copyright (c) 2017-2021 CloudGenix, Inc
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+# Set logging to function name
+api_logger = logging.getLogger(__name__)
+"""`logging.getlogger` object to enable debug printing via `cloudgenix.API.set_debug`"""
+
+_BACKGROUND_LOOP = None
+_BACKGROUND_LOOP_LOCK = threading.Lock()
+_STOP_REGISTERED = False
+
+
+class BackgroundLoop(object):
+    """
+    An asyncio event loop running in a daemon thread, so threaded (non-asyncio) code can run WebSocket coroutines.
+
+    One loop is shared by the whole process (see `get_background_loop`), and every synchronous WebSocket handle is
+    multiplexed on it.
+    """
+
+    def __init__(self):
+        """
+        Create and start the loop thread.
+        """
+        self.pid = os.getpid()
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="cloudgenix-ws-loop")
+        self._thread.daemon = True
+        self._thread.start()
+        ready.wait()
+
+    def _run(self, ready):
+        """
+        Loop thread body.
+        """
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(ready.set)
+        self.loop.run_forever()
+
+    @property
+    def running(self):
+        """
+        Bool, True if the loop thread is running.
+        """
+        return self._thread.is_alive() and self.loop.is_running()
+
+    def submit(self, awaitable):
+        """
+        Schedule a coroutine (or other awaitable) on the loop. Awaitables that bind to an event loop when created
+        (ex. `websockets.connect`) must be created on the loop thread, inside a coroutine.
+
+          - **awaitable:** Coroutine or awaitable, ex. `websocket.recv()` for a WebSocket opened on this loop.
+
+        **Returns:** `concurrent.futures.Future` for its result.
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Blocking on the background loop from its own thread would deadlock.")
+        return asyncio.run_coroutine_threadsafe(_await(awaitable), self.loop)
+
+    def run(self, awaitable, timeout=None):
+        """
+        Run a coroutine (or other awaitable) on the loop and wait for the result.
+
+          - **awaitable:** Coroutine or awaitable.
+          - **timeout:** Optional: Seconds to wait. Raises `concurrent.futures.TimeoutError` on expiry (the
+            coroutine is cancelled).
+
+        **Returns:** Result of the awaitable.
+        """
+        future = self.submit(awaitable)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def iterate(self, async_iterator, close=None):
+        """
+        Iterate an async iterator from a normal (threaded) for loop.
+
+          - **async_iterator:** Async iterator, or async generator.
+          - **close:** Optional: Coroutine function called when iteration ends or is abandoned. Default: the
+            iterator's `aclose`, if it has one.
+
+        **Returns:** Generator of the iterator's items.
+        """
+        if close is None:
+            close = getattr(async_iterator, 'aclose', None)
+        try:
+            while True:
+                try:
+                    yield self.run(async_iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if close is not None and self.running:
+                self.run(close())
+
+    def stop(self):
+        """
+        Stop the loop and its thread.
+
+        **Returns:** No return.
+        """
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if threading.current_thread() is not self._thread:
+            self._thread.join(5)
+
+
+async def _await(awaitable):
+    """
+    Wrap any awaitable (ex. `websockets.connect`) in a coroutine for `asyncio.run_coroutine_threadsafe`.
+    """
+    return await awaitable
+
+
+async def _call_await(func):
+    """
+    Call a function returning an awaitable on the loop thread, and await it.
+    """
+    return await func()
+
+
+def get_background_loop():
+    """
+    Get the process-wide `BackgroundLoop`, starting it on first use (or after a fork).
+
+    **Returns:** `BackgroundLoop` object.
+    """
+    global _BACKGROUND_LOOP, _STOP_REGISTERED
+    background_loop = _BACKGROUND_LOOP
+    if background_loop is None or background_loop.pid != os.getpid() or not background_loop.running:
+        with _BACKGROUND_LOOP_LOCK:
+            background_loop = _BACKGROUND_LOOP
+            if background_loop is None or background_loop.pid != os.getpid() or not background_loop.running:
+                background_loop = _BACKGROUND_LOOP = BackgroundLoop()
+                if not _STOP_REGISTERED:
+                    atexit.register(_stop_background_loop)
+                    _STOP_REGISTERED = True
+    return background_loop
+
+
+def _stop_background_loop():
+    """
+    Stop the process-wide `BackgroundLoop` at interpreter exit.
+    """
+    background_loop = _BACKGROUND_LOOP
+    if background_loop is not None and background_loop.pid == os.getpid():
+        background_loop.stop()
+
+
+class SyncWebSocket(object):
+    """
+    Blocking handle for a WebSocket (ex. a Toolkit Session) running on the shared `BackgroundLoop`.
+
+    Every method has a `_future` variant returning a `concurrent.futures.Future` instead of blocking.
+    Usable as a context manager, which closes the WebSocket.
+    """
+
+    def __init__(self, connect, timeout=None):
+        """
+        Open a WebSocket on the background loop.
+
+          - **connect:** Callable returning an awaitable that opens the WebSocket, ex.
+            `lambda: sdk.ws.toolkit_session(element_id)`. Called on the loop thread, as `websockets.connect` binds
+            to the event loop it is created on.
+          - **timeout:** Optional: Default seconds to wait for each operation (including this connect).
+        """
+        self.timeout = timeout
+        self.background_loop = get_background_loop()
+        self.websocket = self.background_loop.run(_call_await(connect), timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            try:
+                yield self.recv()
+            except ConnectionClosed:
+                return
+
+    @property
+    def open(self):
+        """
+        Bool, True if the WebSocket is open.
+        """
+        return self.websocket.open
+
+    def send_future(self, data):
+        """
+        Send a message, without waiting.
+
+        **Returns:** `concurrent.futures.Future`.
+        """
+        return self.background_loop.submit(self.websocket.send(data))
+
+    def send(self, data, timeout=None):
+        """
+        Send a message (text or bytes).
+
+          - **data:** str or bytes.
+          - **timeout:** Optional: Seconds to wait. Default: the handle's timeout.
+
+        **Returns:** No return.
+        """
+        return self.send_future(data).result(timeout if timeout is not None else self.timeout)
+
+    def recv_future(self):
+        """
+        Receive a message, without waiting.
+
+        **Returns:** `concurrent.futures.Future` for the message.
+        """
+        return self.background_loop.submit(self.websocket.recv())
+
+    def recv(self, timeout=None):
+        """
+        Receive a message.
+
+          - **timeout:** Optional: Seconds to wait. Default: the handle's timeout.
+
+        **Returns:** str or bytes message.
+        """
+        future = self.recv_future()
+        try:
+            return future.result(timeout if timeout is not None else self.timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def close(self):
+        """
+        Close the WebSocket.
+
+        **Returns:** No return.
+        """
+        if self.background_loop.running:
+            self.background_loop.run(self.websocket.close(), self.timeout)
+
+
+def run_commands(api, element_ids, commands, max_sessions=20, prompt=None, timeout=60, **kwargs):
+    """
+    Blocking version of `cloudgenix.ws_toolkit.ToolkitSessionManager.run_commands`, run on the shared
+    `BackgroundLoop`.
+
+      - **api:** Logged in `cloudgenix.API` object.
+      - **element_ids:** Iterable of Element IDs.
+      - **commands:** CLI command string, or list of commands run in order on each element.
+      - **max_sessions:** Optional: Maximum open Toolkit WebSockets. Default 20.
+      - **prompt:** Optional: Regex for the CLI prompt. Default `cloudgenix.ws_toolkit.DEFAULT_PROMPT`.
+      - **timeout:** Optional: Seconds to wait for each command. Default 60.
+      - **&ast;&ast;kwargs:** Optional: Arguments for `cloudgenix.ws_toolkit.ToolkitSessionManager`.
+
+    **Returns:** Generator of per-element result dicts, in completion order.
+    """
+    from .ws_toolkit import ToolkitSessionManager, DEFAULT_PROMPT
+
+    async def results():
+        async with ToolkitSessionManager(api, max_sessions=max_sessions, **kwargs) as manager:
+            async for result in manager.run_commands(element_ids, commands, prompt=prompt or DEFAULT_PROMPT,
+                                                     timeout=timeout):
+                yield result
+
+    return get_background_loop().iterate(results())
+
+
+def subscribe(api, **kwargs):
+    """
+    Blocking version of `cloudgenix.ws_events.EventSubscription`, run on the shared `BackgroundLoop`.
+
+      - **api:** Logged in `cloudgenix.API` object.
+      - **&ast;&ast;kwargs:** Optional: Arguments for `cloudgenix.ws_events.EventSubscription`.
+
+    **Returns:** Generator of event batches. The subscription is closed when the generator is closed.
+    """
+    from .ws_events import EventSubscription
+
+    async def start():
+        subscription = EventSubscription(api, **kwargs)
+        subscription.start()
+        return subscription
+
+    background_loop = get_background_loop()
+    subscription = background_loop.run(start())
+    return background_loop.iterate(subscription, close=subscription.close)
@@ -0,0 +1,653 @@
+#!/usr/bin/env python
+"""
+CloudGenix Python SDK - WebSocket Toolkit session functions
+
+**Author:** CloudGenix
+
+**Copyright:** (c) 2017-2021 CloudGenix, Inc
+
+**License:** MIT
+"""
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+
+from websockets.exceptions import ConnectionClosed
+
+__author__ = "CloudGenix Developer Support <developers@cloudgenix.com>"
+__email__ = "developers@cloudgenix.com"
+__copyright__ = "Copyright (c) 2017-2021 CloudGenix, Inc"
+__license__ = """
+    MIT License
+
+    Copyright (c) 2017-2021 CloudGenix, Inc
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+# Set logging to function name
+api_logger = logging.getLogger(__name__)
+"""`logging.getlogger` object to enable debug printing via `cloudgenix.API.set_debug`"""
+
+
+DEFAULT_PROMPT = r'[\w.@:()/-]+ ?[#>$] ?\Z'
+"""Default regex for an element CLI prompt, matched only at the end of the output read so far (not at the end of
+any output line that happens to end in `#`, `>` or `$`)."""
+
+DEFAULT_MORE_PROMPT = r'-+ ?\(?[Mm]ore\)? ?-+ *\Z|\(END\) *\Z'
+"""Default regex for a CLI pager prompt, answered with a space by `ToolkitSession.run_command`."""
+
+_ANSI_ESCAPE_RE = re.compile(r'\x1b(?:\[[0-?]*[ -/]*[@-~]|[@-Z\\-_])')
+
+
+def _byte_len(message):
+    """
+    **Returns:** Size of a WebSocket message in bytes (str messages are sent as UTF-8).
+    """
+    return len(message.encode('utf-8')) if isinstance(message, str) else len(message)
+
+
+def strip_ansi(text):
+    """
+    Remove ANSI terminal escape sequences (colors, cursor movement) from text.
+
+      - **text:** Terminal output string.
+
+    **Returns:** String.
+    """
+    return _ANSI_ESCAPE_RE.sub('', text)
+
+
+class ToolkitSession(object):
+    """
+    One open Toolkit Session WebSocket to an element, with traffic and latency counters.
+
+    Handed to job functions by `ToolkitSessionManager`.
+    """
+
+    def __init__(self, element_id, websocket):
+        """
+        Wrap an open toolkit WebSocket.
+
+          - **element_id:** Element ID.
+          - **websocket:** Open `websockets` client protocol object.
+        """
+        self.element_id = element_id
+        self.websocket = websocket
+        self.opened_at = time.time()
+        self.last_used = self.opened_at
+        self.connects = 1
+        self.jobs = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.messages_sent = 0
+        self.messages_received = 0
+        self.connect_latency = None
+        self.last_latency = None
+        self._latency_total = 0.0
+        self._latency_count = 0
+        self.buffer = ''
+        """Output received but not yet consumed by `ToolkitSession.expect`."""
+        self.at_prompt = False
+        """True when the CLI is known to be waiting at a prompt (ex. after `ToolkitSession.run_command`)."""
+
+    def reset(self, websocket):
+        """
+        Use a new WebSocket for this session (after a reconnect), clearing the output buffer.
+
+          - **websocket:** Open `websockets` client protocol object.
+
+        **Returns:** No return.
+        """
+        self.websocket = websocket
+        self.connects += 1
+        self.buffer = ''
+        self.at_prompt = False
+
+    @property
+    def open(self):
+        """
+        Bool, True if the WebSocket is open.
+        """
+        return self.websocket is not None and self.websocket.open
+
+    def record_latency(self, seconds):
+        """
+        Record a round-trip latency sample.
+
+          - **seconds:** Latency in seconds.
+
+        **Returns:** No return.
+        """
+        self.last_latency = seconds
+        self._latency_total += seconds
+        self._latency_count += 1
+
+    async def send(self, data):
+        """
+        Send a message (text or bytes) on the session.
+
+          - **data:** str or bytes.
+
+        **Returns:** No return.
+        """
+        await self.websocket.send(data)
+        self.bytes_sent += _byte_len(data)
+        self.messages_sent += 1
+        self.last_used = time.time()
+
+    async def recv(self, timeout=None):
+        """
+        Receive a message from the session.
+
+          - **timeout:** Optional: Seconds to wait. Raises `asyncio.TimeoutError` on expiry.
+
+        **Returns:** str or bytes message.
+        """
+        if timeout is None:
+            message = await self.websocket.recv()
+        else:
+            message = await asyncio.wait_for(self.websocket.recv(), timeout)
+        self.bytes_received += _byte_len(message)
+        self.messages_received += 1
+        self.last_used = time.time()
+        return message
+
+    async def expect(self, patterns, timeout=30):
+        """
+        Read output until one of the patterns matches, expect-style. Output up to the end of the match is consumed
+        from `ToolkitSession.buffer`, anything after it is kept for the next call.
+
+          - **patterns:** Regex string or compiled regex, or a list of them. Matched with `re.MULTILINE`.
+          - **timeout:** Optional: Seconds to wait for a match in total. Raises `asyncio.TimeoutError` on expiry.
+
+        **Returns:** Tuple of (index of the matched pattern, `re.Match` object, output before the match).
+        """
+        if not isinstance(patterns, (list, tuple)):
+            patterns = [patterns]
+        compiled = [re.compile(pattern, re.MULTILINE) if isinstance(pattern, str) else pattern
+                    for pattern in patterns]
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            # earliest match in the buffer wins.
+            best = None
+            for index, pattern in enumerate(compiled):
+                match = pattern.search(self.buffer)
+                if match is not None and (best is None or match.start() < best[1].start()):
+                    best = (index, match)
+            if best is not None:
+                index, match = best
+                before = self.buffer[:match.start()]
+                self.buffer = self.buffer[match.end():]
+                return index, match, before
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise asyncio.TimeoutError("Timed out waiting for {0} on {1}."
+                                           "".format([pattern.pattern for pattern in compiled], self.element_id))
+            message = await self.recv(timeout=remaining)
+            if isinstance(message, bytes):
+                message = message.decode('utf-8', 'replace')
+            self.buffer += strip_ansi(message).replace('\r\n', '\n').replace('\r', '')
+
+    async def run_command(self, command, prompt=DEFAULT_PROMPT, timeout=60, more_prompt=DEFAULT_MORE_PROMPT,
+                          line_ending='\n'):
+        """
+        Run a CLI command and return its output, reading until the CLI prompt comes back (no fixed sleeps).
+        Pager prompts are answered automatically.
+
+          - **command:** CLI command string.
+          - **prompt:** Optional: Regex for the CLI prompt. Default `DEFAULT_PROMPT`.
+          - **timeout:** Optional: Seconds to wait for the command to finish. Default 60.
+          - **more_prompt:** Optional: Regex for a pager prompt, answered with a space. None disables.
+          - **line_ending:** Optional: String sent after the command. Default newline.
+
+        **Returns:** Command output string, without the command echo and the trailing prompt.
+        """
+        started = time.monotonic()
+        if not self.at_prompt:
+            # new session, wait for the first prompt. Nudge with a newline if it doesn't show up quickly.
+            try:
+                await self.expect(prompt, timeout=min(timeout, 5))
+            except asyncio.TimeoutError:
+                await self.send(line_ending)
+                await self.expect(prompt, timeout=timeout)
+            self.buffer = ''
+
+        await self.send(command + line_ending)
+        self.at_prompt = False
+        patterns = [prompt] if more_prompt is None else [prompt, more_prompt]
+        output = []
+        while True:
+            remaining = timeout - (time.monotonic() - started)
+            index, _, before = await self.expect(patterns, timeout=max(remaining, 0))
+            output.append(before)
+            if index == 0:
+                break
+            await self.send(' ')
+        self.at_prompt = True
+        self.record_latency(time.monotonic() - started)
+
+        text = ''.join(output)
+        # drop the echoed command line.
+        first_line, _, rest = text.partition('\n')
+        if first_line.strip() == command.strip():
+            text = rest
+        return text.rstrip('\n')
+
+    async def ping(self, timeout=None):
+        """
+        Measure WebSocket round-trip latency with a ping/pong.
+
+          - **timeout:** Optional: Seconds to wait for the pong.
+
+        **Returns:** Latency in seconds.
+        """
+        started = time.monotonic()
+        pong_waiter = await self.websocket.ping()
+        await asyncio.wait_for(pong_waiter, timeout)
+        latency = time.monotonic() - started
+        self.record_latency(latency)
+        return latency
+
+    def stats(self):
+        """
+        Session counters.
+
+        **Returns:** Dict of connects, jobs, bytes/messages sent and received, connect_latency, last_latency and
+                     avg_latency (seconds).
+        """
+        return {
+            'connects': self.connects,
+            'jobs': self.jobs,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'messages_sent': self.messages_sent,
+            'messages_received': self.messages_received,
+            'connect_latency': self.connect_latency,
+            'last_latency': self.last_latency,
+            'avg_latency': self._latency_total / self._latency_count if self._latency_count else None,
+        }
+
+
+class ToolkitSessionManager(object):
+    """
+    asyncio manager for running work over many element Toolkit Session WebSockets.
+
+    Work is queued per element with `ToolkitSessionManager.submit` (which waits when the queue is full, so
+    producers can't outrun the sessions), and run by `max_sessions` workers. At most `max_sessions` WebSockets are
+    open at once. Sessions are reused for later work on the same element and closed after `idle_timeout`, or
+    earlier when a new element needs the slot. Failed connects, and connections dropped during a job, are retried
+    with a new WebSocket up to `reconnect_attempts` times.
+
+    Use as an async context manager, or call `ToolkitSessionManager.start` and `ToolkitSessionManager.close`:
+
+        async with sdk.ws.toolkit_manager(max_sessions=50) as manager:
+            async for element_id, result, exception in manager.map(job, element_ids):
+                ...
+
+    where `job` is a coroutine function taking a `ToolkitSession`.
+    """
+
+    def __init__(self, api, max_sessions=20, queue_size=None, connect_timeout=30, idle_timeout=60,
+                 reconnect_attempts=2, reconnect_delay=1, **kwargs):
+        """
+        Create a Toolkit session manager.
+
+          - **api:** Logged in `cloudgenix.API` object.
+          - **max_sessions:** Optional: Maximum open Toolkit WebSockets (and concurrent jobs). Default 20.
+          - **queue_size:** Optional: Maximum queued jobs before `submit` waits. Default 2 x `max_sessions`.
+          - **connect_timeout:** Optional: Seconds to wait for a WebSocket to open. Default 30.
+          - **idle_timeout:** Optional: Seconds an unused session is kept open. Default 60.
+          - **reconnect_attempts:** Optional: Reconnects per job after a failed or dropped connection. Default 2.
+          - **reconnect_delay:** Optional: Seconds before the first reconnect, doubled on each retry. Default 1.
+          - **&ast;&ast;kwargs:** Optional: Arguments for `cloudgenix.ws_api.WebSockets.toolkit_session`.
+        """
+        self.api = api
+        self.max_sessions = max_sessions
+        self.queue_size = queue_size if queue_size is not None else 2 * max_sessions
+        self.connect_timeout = connect_timeout
+        self.idle_timeout = idle_timeout
+        self.reconnect_attempts = reconnect_attempts
+        self.reconnect_delay = reconnect_delay
+        self.session_kwargs = kwargs
+
+        self.sessions = {}
+        """Dict of element ID to `ToolkitSession`, for all elements used (open or closed)."""
+
+        self._idle = OrderedDict()
+        self._busy = set()
+        self._connecting = 0
+        self._element_locks = {}
+        self._queue = None
+        self._workers = []
+        self._reaper = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @property
+    def open_sessions(self):
+        """
+        Number of open Toolkit WebSockets.
+        """
+        return len(self._idle) + len(self._busy) + self._connecting
+
+    def start(self):
+        """
+        Start the workers. Must be called from a running event loop.
+
+        **Returns:** No return.
+        """
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self.max_sessions)]
+        self._reaper = asyncio.ensure_future(self._reap_idle())
+
+    async def submit(self, element_id, func):
+        """
+        Queue a job for an element, waiting if the queue is full.
+
+          - **element_id:** Element ID.
+          - **func:** Coroutine function taking a `ToolkitSession`.
+
+        **Returns:** `asyncio.Future` for the result of `func`.
+        """
+        self.start()
+        future = asyncio.get_event_loop().create_future()
+        await self._queue.put((element_id, func, future))
+        return future
+
+    async def map(self, func, element_ids):
+        """
+        Run a job for each element, yielding results as they complete.
+
+          - **func:** Coroutine function taking a `ToolkitSession`.
+          - **element_ids:** Iterable of Element IDs.
+
+        **Returns:** Async generator of (element_id, result, exception) tuples, in completion order. One of
+                     result/exception is None.
+        """
+        results = asyncio.Queue()
+
+        def job_done(element_id, future):
+            if future.cancelled():
+                results.put_nowait((element_id, None, asyncio.CancelledError()))
+            else:
+                results.put_nowait((element_id, None, future.exception()) if future.exception() else
+                                   (element_id, future.result(), None))
+
+        async def produce():
+            count = 0
+            for element_id in element_ids:
+                future = await self.submit(element_id, func)
+                future.add_done_callback(lambda done, eid=element_id: job_done(eid, done))
+                count += 1
+            return count
+
+        producer = asyncio.ensure_future(produce())
+        received = 0
+        try:
+            while not producer.done() or received < producer.result():
+                if producer.done():
+                    result = await results.get()
+                else:
+                    getter = asyncio.ensure_future(results.get())
+                    await asyncio.wait([getter, producer], return_when=asyncio.FIRST_COMPLETED)
+                    if not getter.done():
+                        # producer finished (or failed) first, re-check the count.
+                        getter.cancel()
+                        continue
+                    result = getter.result()
+                received += 1
+                yield result
+        finally:
+            producer.cancel()
+
+    async def run_commands(self, element_ids, commands, prompt=DEFAULT_PROMPT, timeout=60,
+                           more_prompt=DEFAULT_MORE_PROMPT):
+        """
+        Run CLI commands on many elements concurrently, yielding each element's results as soon as it finishes.
+        See `ToolkitSession.run_command`.
+
+          - **element_ids:** Iterable of Element IDs.
+          - **commands:** CLI command string, or list of commands run in order on each element.
+          - **prompt:** Optional: Regex for the CLI prompt. Default `DEFAULT_PROMPT`.
+          - **timeout:** Optional: Seconds to wait for each command. Default 60.
+          - **more_prompt:** Optional: Regex for a pager prompt, answered with a space. None disables.
+
+        **Returns:** Async generator of result dicts, in completion order, with keys:
+
+          - **element_id**: Element ID.
+          - **outputs**: List of (command, output) tuples, for the commands that completed.
+          - **error**: None, or the exception that stopped the element's commands.
+          - **elapsed**: Seconds spent on the element.
+        """
+        if isinstance(commands, str):
+            commands = [commands]
+
+        async def run_element(session):
+            started = time.monotonic()
+            outputs = []
+            error = None
+            try:
+                for command in commands:
+                    outputs.append((command, await session.run_command(command, prompt=prompt, timeout=timeout,
+                                                                       more_prompt=more_prompt)))
+            except asyncio.TimeoutError as e:
+                # CLI state is unknown after a timeout, don't reuse the session.
+                error = e
+                await self._close_session(session)
+            return outputs, error, time.monotonic() - started
+
+        async for element_id, result, exception in self.map(run_element, element_ids):
+            if exception is not None:
+                yield {'element_id': element_id, 'outputs': [], 'error': exception, 'elapsed': None}
+            else:
+                outputs, error, elapsed = result
+                yield {'element_id': element_id, 'outputs': outputs, 'error': error, 'elapsed': elapsed}
+
+    async def _connect(self, element_id):
+        """
+        Open a WebSocket to an element, closing idle sessions if at `max_sessions`.
+
+        **Returns:** Open websockets client protocol object.
+        """
+        # reserve the slot first, so concurrent connects can't exceed max_sessions.
+        self._connecting += 1
+        try:
+            while self.open_sessions > self.max_sessions and self._idle:
+                idle_element_id, idle_session = self._idle.popitem(last=False)
+                api_logger.debug("TOOLKIT: closing idle session for %s to free a slot", idle_element_id)
+                await self._close_session(idle_session)
+
+            started = time.monotonic()
+            websocket = await asyncio.wait_for(self.api.ws.toolkit_session(element_id, **self.session_kwargs),
+                                               self.connect_timeout)
+        finally:
+            self._connecting -= 1
+        connect_latency = time.monotonic() - started
+        api_logger.debug("TOOLKIT: connected to %s in %.3fs", element_id, connect_latency)
+        return websocket, connect_latency
+
+    async def _acquire(self, element_id):
+        """
+        Get an open session for an element, reusing an idle one if possible. Jobs for the same element wait for
+        each other, only one holds the element's session at a time (released by `_release`).
+
+        **Returns:** `ToolkitSession`.
+        """
+        element_lock = self._element_locks.get(element_id)
+        if element_lock is None:
+            element_lock = self._element_locks[element_id] = asyncio.Lock()
+        await element_lock.acquire()
+        try:
+            session = self._idle.pop(element_id, None)
+            if session is not None and not session.open:
+                session = None
+            if session is None:
+                websocket, connect_latency = await self._connect(element_id)
+                session = self.sessions.get(element_id)
+                if session is None:
+                    session = self.sessions[element_id] = ToolkitSession(element_id, websocket)
+                else:
+                    if session.websocket is not None and not session.websocket.closed:
+                        # don't leak the socket being replaced.
+                        await self._close_session(session)
+                    session.reset(websocket)
+                session.connect_latency = connect_latency
+        except BaseException:
+            element_lock.release()
+            raise
+        self._busy.add(session)
+        return session
+
+    def _release(self, session):
+        """
+        Return a session to the idle set (or drop it if closed).
+        """
+        self._busy.discard(session)
+        if session.open:
+            session.last_used = time.time()
+            self._idle[session.element_id] = session
+        self._element_locks[session.element_id].release()
+
+    @staticmethod
+    async def _close_session(session):
+        """
+        Close a session's WebSocket, ignoring errors.
+        """
+        try:
+            await session.websocket.close()
+        except Exception as e:
+            api_logger.debug("TOOLKIT: error closing session for %s: %s", session.element_id, e)
+
+    async def _run_job(self, element_id, func):
+        """
+        Run one job, reconnecting on connection failures.
+
+        **Returns:** Result of `func`.
+        """
+        delay = self.reconnect_delay
+        for attempt in range(self.reconnect_attempts + 1):
+            session = None
+            try:
+                session = await self._acquire(element_id)
+                session.jobs += 1
+                return await func(session)
+            except (ConnectionClosed, OSError, asyncio.TimeoutError) as e:
+                # errors with the session still open came from the job itself (ex. a recv timeout), don't retry.
+                if session is not None and session.open:
+                    raise
+                if attempt >= self.reconnect_attempts:
+                    raise
+                api_logger.debug("TOOLKIT: %s connection failed (%s), reconnecting in %ss", element_id, e, delay)
+                await asyncio.sleep(delay)
+                delay *= 2
+            finally:
+                if session is not None:
+                    self._release(session)
+
+    async def _worker(self):
+        """
+        Worker task body.
+        """
+        while True:
+            element_id, func, future = await self._queue.get()
+            try:
+                if not future.cancelled():
+                    result = await self._run_job(element_id, func)
+                    if not future.cancelled():
+                        future.set_result(result)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    async def _reap_idle(self):
+        """
+        Close sessions idle for longer than `idle_timeout`.
+        """
+        while True:
+            await asyncio.sleep(max(min(self.idle_timeout, 30), 1))
+            now = time.time()
+            for element_id, session in list(self._idle.items()):
+                if now - session.last_used >= self.idle_timeout:
+                    del self._idle[element_id]
+                    api_logger.debug("TOOLKIT: closing session for %s after idle timeout", element_id)
+                    await self._close_session(session)
+
+    async def join(self):
+        """
+        Wait until all queued jobs are done.
+
+        **Returns:** No return.
+        """
+        if self._queue is not None:
+            await self._queue.join()
+
+    def stats(self):
+        """
+        Per-element session counters, see `ToolkitSession.stats`.
+
+        **Returns:** Dict of element ID to stats dict. Each also has `open` (Bool).
+        """
+        stats = {}
+        for element_id, session in self.sessions.items():
+            stats[element_id] = session.stats()
+            stats[element_id]['open'] = session.open
+        return stats
+
+    async def close(self):
+        """
+        Stop the workers (cancelling queued jobs) and close all sessions.
+
+        **Returns:** No return.
+        """
+        tasks = self._workers + ([self._reaper] if self._reaper is not None else [])
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._reaper = None
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, _, future = self._queue.get_nowait()
+                future.cancel()
+
+        sessions = list(self._idle.values()) + list(self._busy)
+        self._idle.clear()
+        self._busy.clear()
+        for session in sessions:
+            await self._close_session(session)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Tests for cloudgenix.monitor. No controller access is needed.
+"""
+import unittest
+
+import cloudgenix
+from cloudgenix.monitor import format_monitor_time, parse_monitor_time
+
+START = parse_monitor_time("2021-01-01T00:00:00.000Z")
+END = START + 86400
+
+
+class SplitQueryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sdk = cloudgenix.API(update_check=False)
+        self.sdk.tenant_id = 'tenant'
+        self.sdk.monitor.max_points = 1000
+        self.calls = []
+        self.sdk.post.monitor_metrics = self._monitor_metrics
+
+    def _monitor_metrics(self, data, tenant_id=None, api_version=None):
+        """
+        Stand-in for `post.monitor_metrics`: one datapoint per minute, valued by metric position.
+        """
+        range_start = parse_monitor_time(data['start_time'])
+        range_end = parse_monitor_time(data['end_time'])
+        self.calls.append((range_start, range_end))
+        metrics = []
+        for position, metric in enumerate(data['metrics']):
+            datapoints = [{"time": format_monitor_time(point_time), "value": position}
+                          for point_time in range(range_start, range_end, 60)]
+            metrics.append({"series": [{"name": metric['name'], "interval": "1min",
+                                        "data": [{"statistics": "average", "datapoints": datapoints}]}]})
+        return self.sdk._build_cgx_response({"metrics": metrics})
+
+    def test_two_metrics(self):
+        query = {"start_time": format_monitor_time(START), "end_time": format_monitor_time(END), "interval": "1min",
+                 "metrics": [{"name": "BandwidthUsage", "statistics": ["average"]},
+                             {"name": "LinkUsage", "statistics": ["average"]}],
+                 "filter": {"site": ["site1"]}}
+        response = self.sdk.monitor.split_query(self.sdk.post.monitor_metrics, query)
+        self.assertTrue(response.cgx_status)
+        self.assertGreater(len(self.calls), 1)
+
+        metrics = response.cgx_content['metrics']
+        self.assertEqual([[series['name'] for series in entry['series']] for entry in metrics],
+                         [["BandwidthUsage"], ["LinkUsage"]])
+        for position, entry in enumerate(metrics):
+            datapoints = entry['series'][0]['data'][0]['datapoints']
+            self.assertEqual(len(datapoints), 1440)
+            self.assertEqual(set(datapoint['value'] for datapoint in datapoints), set([position]))
+
+
+if __name__ == '__main__':
+    unittest.main()
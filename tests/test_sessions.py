@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Tests for cloudgenix.sessions. No controller access is needed.
+"""
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+
+import cloudgenix
+
+
+def _unreachable_controller():
+    """
+    **Returns:** https URL for a local port nothing listens on.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return "https://127.0.0.1:{0}".format(port)
+
+
+class SessionKeeperTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sdk = cloudgenix.API(controller=_unreachable_controller(), update_check=False)
+        self.sdk.modify_rest_retry(total=0)
+        self.sdk.tenant_id = 'tenant'
+        self.reauth_calls = []
+        self.keeper = self.sdk.keep_session(lambda sdk: self.reauth_calls.append(sdk) or True)
+
+    def tearDown(self):
+        self.keeper.stop()
+
+    def test_network_error(self):
+        response = self.sdk.get.sites()
+        self.assertFalse(response.cgx_status)
+        self.assertEqual(self.reauth_calls, [])
+        self.assertEqual(self.keeper.replay_count, 0)
+
+
+class TokenPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sdk = cloudgenix.API(controller=_unreachable_controller(), update_check=False)
+        self.sdk.modify_rest_retry(total=0)
+        self.sdk.tenant_id = 'tenant'
+        self.original_adapter = self.sdk.connection_pool()
+        self.pool = self.sdk.token_pool()
+
+    def test_network_error(self):
+        response = self.sdk.get.sites()
+        self.assertFalse(response.cgx_status)
+
+    def test_no_in_place_429_retry(self):
+        retry = self.sdk.connection_pool().max_retries
+        self.assertNotIn(429, retry.status_forcelist)
+        self.assertFalse(retry.is_retry('GET', 429, has_retry_after=True))
+        self.sdk.remove_token_pool()
+        self.assertIs(self.sdk.connection_pool(), self.original_adapter)
+
+
+class SessionStateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'session.json')
+        self.sdk = cloudgenix.API(controller=_unreachable_controller(), update_check=False)
+        self.sdk.modify_rest_retry(total=0)
+        self.sdk.tenant_id = 'tenant'
+        self.sdk.save_session(self.filename, key=b'key')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_network_error_keeps_validator(self):
+        self.assertTrue(self.sdk.load_session(self.filename, key=b'key'))
+        response = self.sdk.get.sites()
+        self.assertFalse(response.cgx_status)
+        self.assertIsNotNone(self.sdk._session_validator)
+
+
+if __name__ == '__main__':
+    unittest.main()